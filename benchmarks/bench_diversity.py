@@ -0,0 +1,76 @@
+"""
+Benchmark the diversity optimizer: generate a batch of synthetic sheets,
+count the facts shared by every pair of sheets and swap generic facts until
+the sheets share as few facts as possible
+
+Usage:
+    python benchmarks/bench_diversity.py --participants 2000 --generic-facts 60
+"""
+
+import argparse
+import sys
+import time
+
+from coworker_bingo import BingoSheetGenerator, FactTable
+from coworker_bingo.diversity import DiversityOptimizer
+from coworker_bingo.validation import Validator
+from synthetic import make_config, make_data
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=2000)
+    parser.add_argument("--generic-facts", type=int, default=60)
+    parser.add_argument("--sets", type=int, default=1)
+    parser.add_argument("--max-passes", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    data = make_data(
+        num_participants=args.participants,
+        num_generic_facts=args.generic_facts,
+        facts_per_participant=3,
+    )
+    config = make_config(num_participants=args.participants)
+    fact_table = FactTable.from_input_files(
+        generic_facts=data.generic_facts, specific_facts=data.specific_facts
+    )
+    batch = BingoSheetGenerator.generate_batch(
+        participants=sorted(data.specific_facts),
+        config=config,
+        data=fact_table,
+        num_sets=args.sets,
+    )
+    assert batch is not None
+
+    start = time.perf_counter()
+    stats = DiversityOptimizer.overlap_stats(batch.fact_ids)
+    elapsed = time.perf_counter() - start
+    print(
+        f"overlap_stats: {stats.num_pairs:,} pairs in {elapsed:.3f}s "
+        f"({stats.num_pairs / elapsed:,.0f} pairs/s)"
+    )
+
+    start = time.perf_counter()
+    result = DiversityOptimizer.optimize(
+        batch=batch,
+        config=config,
+        fact_table=fact_table,
+        optimizer_config=DiversityOptimizer.Config(max_passes=args.max_passes),
+    )
+    elapsed = time.perf_counter() - start
+    num_sheets = args.participants * args.sets
+    print(
+        f"optimize: {num_sheets} sheets in {elapsed:.3f}s, "
+        f"{result.num_swaps} swaps in {result.num_passes} passes"
+    )
+    print(f"Before: {result.before.summary()}")
+    print(f"After:  {result.after.summary()}")
+    assert Validator.verify_batch(
+        batch=batch, config=config, fact_table=fact_table
+    ).is_valid
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Benchmark the SheetDrawer backends by drawing the bingo sheets of the example
+input_files with each of them
+
+Usage:
+    python benchmarks/bench_drawer_backends.py --sheets 10
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+from coworker_bingo import BingoSheetGenerator, InputFilesReader, SheetDrawer
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional
+
+import coworker_bingo.scripts.config as cfg
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sheets",
+        type=int,
+        default=None,
+        help="Number of sheets to draw per backend (default: one per "
+        "participant)",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=sorted(SheetDrawer.SUPPORTED_BACKENDS),
+        choices=sorted(SheetDrawer.SUPPORTED_BACKENDS),
+    )
+    args = parser.parse_args(argv)
+
+    generic_facts = InputFilesReader.read_generic_facts(
+        txt_file_path=cfg.GENERIC_FACTS_FILE_PATH
+    )
+    read_result = InputFilesReader.read_participant_names_and_specific_facts(
+        csv_file_path=cfg.SPECIFIC_FACTS_FILE_PATH, name_col=cfg.NAME_COL
+    )
+    assert generic_facts is not None and read_result is not None
+    participants, specific_facts = read_result
+    participants_list = sorted(participants)
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants_list,
+        config=cfg.BINGO_SHEET_CONFIG,
+        data=BingoSheetGenerator.Data(
+            generic_facts=generic_facts, specific_facts=specific_facts
+        ),
+        num_sets=1,
+    )
+    assert batch is not None
+    num_sheets = args.sheets or len(participants_list)
+    sheets = [
+        batch.sheet(participant_idx=i % len(participants_list), set_idx=0)
+        for i in range(num_sheets)
+    ]
+
+    for backend in args.backends:
+        config = replace(cfg.SHEET_DRAWER_CONFIG, backend=backend)
+        with tempfile.TemporaryDirectory() as folder:
+            start = time.perf_counter()
+            with SheetDrawer.Session(config) as session:
+                for i, sheet in enumerate(sheets):
+                    assert session.draw(
+                        sheet=sheet,
+                        title=f"Sheet {i}",
+                        path=Path(folder) / f"sheet_{i}.pdf",
+                    )
+            elapsed = time.perf_counter() - start
+            total_bytes = sum(f.stat().st_size for f in Path(folder).iterdir())
+        print(
+            f"{backend:>8}: {num_sheets} sheets in {elapsed:.3f}s "
+            f"({num_sheets / elapsed:,.1f} sheets/s, "
+            f"{total_bytes / num_sheets / 1024:.1f} KiB/sheet)"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Benchmark BingoSheetGenerator.generate_batch against the per-sheet
+BingoSheetGenerator.generate loop previously used by generate_sheets.main
+
+Usage:
+    python benchmarks/bench_generate_batch.py --participants 5000 --sets 3
+"""
+
+import argparse
+import sys
+import time
+
+from coworker_bingo import BingoSheetGenerator
+from synthetic import make_data
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=2000)
+    parser.add_argument("--sets", type=int, default=2)
+    parser.add_argument("--generic-facts", type=int, default=40)
+    parser.add_argument("--facts-per-participant", type=int, default=3)
+    parser.add_argument(
+        "--assignment",
+        default="random",
+        choices=BingoSheetGenerator.Config.SUPPORTED_ASSIGNMENTS,
+    )
+    parser.add_argument(
+        "--skip-loop",
+        action="store_true",
+        help="Only benchmark generate_batch",
+    )
+    args = parser.parse_args(argv)
+
+    config = BingoSheetGenerator.Config(
+        sheet_size=6,
+        specific_fact_indexes={
+            0, 2, 5, 7, 9, 10, 13, 14, 15, 17,
+            18, 20, 21, 22, 25, 26, 28, 30, 33, 35,
+        },
+        random_seed=1,
+        assignment=args.assignment,
+    )  # fmt: skip
+    data = make_data(
+        num_participants=args.participants,
+        num_generic_facts=args.generic_facts,
+        facts_per_participant=args.facts_per_participant,
+    )
+    participants = sorted(data.specific_facts.keys())
+    num_sheets = len(participants) * args.sets
+
+    start = time.perf_counter()
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants, config=config, data=data, num_sets=args.sets
+    )
+    batch_time = time.perf_counter() - start
+    assert batch is not None
+    print(
+        f"generate_batch: {num_sheets} sheets in {batch_time:.3f}s "
+        f"({num_sheets / batch_time:,.0f} sheets/s)"
+    )
+    stats = batch.appearance_stats()
+    print(
+        f"Appearances per participant: min {stats.min}, max {stats.max}, "
+        f"stddev {stats.stddev:.2f}"
+    )
+
+    if args.skip_loop:
+        return 0
+
+    start = time.perf_counter()
+    for _ in range(args.sets):
+        for participant_name in participants:
+            BingoSheetGenerator.generate(
+                participant_name=participant_name, config=config, data=data
+            )
+    loop_time = time.perf_counter() - start
+    print(
+        f"generate loop:  {num_sheets} sheets in {loop_time:.3f}s "
+        f"({num_sheets / loop_time:,.0f} sheets/s)"
+    )
+    print(f"Speedup: {loop_time / batch_time:.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
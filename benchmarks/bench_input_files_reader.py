@@ -0,0 +1,60 @@
+"""
+Benchmark reading a synthetic specific facts csv file with the Pandas and
+the streaming InputFilesReader paths
+
+Usage:
+    python benchmarks/bench_input_files_reader.py --participants 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from coworker_bingo import InputFilesReader
+from pathlib import Path
+from synthetic import write_specific_facts_csv
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=100_000)
+    parser.add_argument("--max-facts", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_file_path = Path(folder) / "specific_facts.csv"
+        write_specific_facts_csv(
+            path=csv_file_path,
+            num_participants=args.participants,
+            max_facts=args.max_facts,
+        )
+
+        results = {}
+        for streaming in (False, True):
+            tracemalloc.start()
+            start = time.perf_counter()
+            results[streaming] = (
+                InputFilesReader.read_participant_names_and_specific_facts(
+                    csv_file_path=csv_file_path,
+                    name_col="Name",
+                    streaming=streaming,
+                )
+            )
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            label = "streaming" if streaming else "pandas"
+            print(
+                f"{label:>9}: {args.participants} participants in "
+                f"{elapsed:.3f}s (peak traced memory {peak / 2**20:.1f} MiB)"
+            )
+
+    assert results[False] == results[True]
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Benchmark the live scoring of bingo games: mark random cells of many
+players' sheets and read the leaderboard after every mark
+
+Usage:
+    python benchmarks/bench_scoring.py --players 5000 --marks 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from coworker_bingo import BingoSheetGenerator, Scoreboard
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--marks", type=int, default=1_000_000)
+    parser.add_argument("--sheet-size", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of players read from the leaderboard after every mark",
+    )
+    args = parser.parse_args(argv)
+
+    config = BingoSheetGenerator.Config(
+        sheet_size=args.sheet_size, specific_fact_indexes=set(), random_seed=0
+    )
+    scoreboard = Scoreboard(config)
+    players = [f"Player {i}" for i in range(args.players)]
+    for player in players:
+        scoreboard.add_player(player)
+
+    rng = random.Random(0)
+    submissions = [
+        (rng.choice(players), rng.randrange(config.num_cells))
+        for _ in range(args.marks)
+    ]
+
+    start = time.perf_counter()
+    for player, cell in submissions:
+        scoreboard.mark(player, cell)
+    elapsed = time.perf_counter() - start
+    print(
+        f"mark: {args.marks} marks in {elapsed:.3f}s "
+        f"({args.marks / elapsed:,.0f} marks/s)"
+    )
+
+    for player in players:
+        scoreboard.add_player(player)
+    start = time.perf_counter()
+    for player, cell in submissions:
+        scoreboard.mark(player, cell)
+        scoreboard.leaderboard(top=args.top)
+    elapsed = time.perf_counter() - start
+    print(
+        f"mark + leaderboard(top={args.top}): {args.marks} marks in "
+        f"{elapsed:.3f}s ({args.marks / elapsed:,.0f} marks/s)"
+    )
+    print(f"Leaders: {scoreboard.leaderboard(top=3)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Load test the sheet server: serve synthetic inputs on a local port and fetch
+sheets from many client threads, some of them revalidating a sheet they
+already have with its ETag. The clients run in the same process as the
+server and compete with it for the GIL, so the numbers are a lower bound
+
+Usage:
+    python benchmarks/bench_server.py --participants 10000 --clients 16
+"""
+
+import argparse
+import http.client
+import random
+import statistics
+import sys
+import threading
+import time
+
+from coworker_bingo import FactTable, SheetDrawer
+from coworker_bingo.server import SheetServer
+from synthetic import make_config, make_data
+from typing import Dict, List, Optional
+from urllib.parse import quote, urlsplit
+
+
+def run_client(
+    server: SheetServer,
+    paths: List[str],
+    num_requests: int,
+    revalidate: float,
+    seed: int,
+    latencies: List[float],
+) -> None:
+    """
+    Fetch sheets over one keep-alive connection
+
+    Arguments:
+        server -- Server to load
+        paths -- URL paths of the sheets, the first ones the most popular
+        num_requests -- Number of requests sent by the client
+        revalidate -- Fraction of requests for a sheet the client already has
+        that are sent with its ETag
+        seed -- Random seed of the client
+        latencies -- List the latency of every request is appended to
+    """
+    rng = random.Random(seed)
+    address = urlsplit(server.url)
+    connection = http.client.HTTPConnection(address.hostname, address.port)
+    etags: Dict[str, str] = {}
+    for _ in range(num_requests):
+        # Zipf-like popularity: a few sheets are requested over and over
+        path = paths[min(int(rng.paretovariate(1.2)) - 1, len(paths) - 1)]
+        headers = {}
+        if path in etags and rng.random() < revalidate:
+            headers["If-None-Match"] = etags[path]
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        assert response.status in (200, 304), response.status
+        etags[path] = response.headers["ETag"]
+    connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=10_000)
+    parser.add_argument("--sets", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument(
+        "--requests", type=int, default=500, help="Requests per client"
+    )
+    parser.add_argument("--revalidate", type=float, default=0.5)
+    parser.add_argument("--cache-mb", type=float, default=8)
+    parser.add_argument(
+        "--backend",
+        default="pdf",
+        choices=sorted(SheetDrawer.SUPPORTED_BACKENDS),
+    )
+    args = parser.parse_args(argv)
+
+    data = make_data(
+        num_participants=args.participants,
+        num_generic_facts=60,
+        facts_per_participant=3,
+    )
+    participants = sorted(data.specific_facts)
+    server = SheetServer(
+        config=SheetServer.Config(
+            port=0,
+            cache_bytes=int(args.cache_mb * 2**20),
+            num_sets=args.sets,
+            extension="pdf",
+        ),
+        bingo_config=make_config(num_participants=args.participants),
+        drawer_config=SheetDrawer.Config(
+            backend=args.backend, fig_size=(750, 750), cell_height=100
+        ),
+        participants=participants,
+        fact_table=FactTable.from_input_files(
+            generic_facts=data.generic_facts,
+            specific_facts=data.specific_facts,
+        ),
+    )
+    paths = [
+        f"/sheets/{quote(participant, safe='')}/{set_number}"
+        for participant in participants
+        for set_number in range(1, args.sets + 1)
+    ]
+    random.Random(0).shuffle(paths)
+
+    latencies: List[float] = []
+    with server:
+        threads = [
+            threading.Thread(
+                target=run_client,
+                args=(
+                    server,
+                    paths,
+                    args.requests,
+                    args.revalidate,
+                    seed,
+                    latencies,
+                ),
+            )
+            for seed in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stats = server.stats_dict()
+
+    latencies.sort()
+    num_requests = len(latencies)
+    print(
+        f"{num_requests} requests from {args.clients} clients in "
+        f"{elapsed:.2f}s ({num_requests / elapsed:,.0f} requests/s)"
+    )
+    print(
+        f"latency p50 {statistics.median(latencies) * 1000:.2f} ms, "
+        f"p99 {latencies[int(0.99 * (num_requests - 1))] * 1000:.2f} ms"
+    )
+    print(f"server: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
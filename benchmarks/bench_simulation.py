@@ -0,0 +1,61 @@
+"""
+Benchmark the game simulator: generate the sheets of synthetic participants
+and simulate many games played with them
+
+Usage:
+    python benchmarks/bench_simulation.py --participants 1000 --games 10000
+"""
+
+import argparse
+import sys
+import time
+
+from coworker_bingo import BingoSheetGenerator, FactTable
+from coworker_bingo.simulation import GameSimulator
+from synthetic import make_config, make_data
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--sets", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    data = make_data(
+        num_participants=args.participants,
+        num_generic_facts=60,
+        facts_per_participant=3,
+    )
+    config = make_config(num_participants=args.participants)
+    fact_table = FactTable.from_input_files(
+        generic_facts=data.generic_facts, specific_facts=data.specific_facts
+    )
+    batch = BingoSheetGenerator.generate_batch(
+        participants=sorted(data.specific_facts),
+        config=config,
+        data=fact_table,
+        num_sets=args.sets,
+    )
+    assert batch is not None
+
+    start = time.perf_counter()
+    result = GameSimulator.simulate(
+        batch=batch,
+        config=config,
+        simulation_config=GameSimulator.Config(num_games=args.games),
+    )
+    elapsed = time.perf_counter() - start
+    sheets = args.games * args.participants
+    print(
+        f"simulate: {args.games} games of {args.participants} players in "
+        f"{elapsed:.3f}s ({sheets / elapsed:,.0f} sheets/s)"
+    )
+    for line in result.summary():
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
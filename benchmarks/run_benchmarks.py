@@ -0,0 +1,314 @@
+"""
+Benchmark suite: time reading the input files, checking the config and data,
+generating sheets and drawing them with every backend on synthetic inputs of
+several sizes, and store the results as JSON to compare them across commits
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --sizes 10 1000 --compare results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from coworker_bingo import (
+    BingoSheetGenerator,
+    FactTable,
+    InputFilesReader,
+    SheetDrawer,
+)
+from coworker_bingo.validation import Validator
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from synthetic import (
+    make_config,
+    make_data,
+    write_generic_facts,
+    write_specific_facts,
+)
+from typing import Any, Callable, Dict, List, Optional
+
+import coworker_bingo.scripts.config as cfg
+
+# Number of sheets drawn per backend and size. Drawing a sheet does not
+# depend on the number of participants, so a small sample is enough
+DRAW_SHEETS: Dict[str, int] = {"pdf": 200, "df2img": 3}
+
+
+def time_it(
+    func: Callable[[], Any], repeat: int, items: int
+) -> Dict[str, Any]:
+    """
+    Time a benchmark. It is run once before timing it, so that imports and
+    export engines started on first use are not included
+
+    Arguments:
+        func -- Benchmark to time
+        repeat -- Number of times the benchmark is run
+        items -- Number of items (participants, sheets, ...) processed by one
+        run of the benchmark
+
+    Returns:
+        Duration of every run, the min and median duration, and the number of
+        items per second of the median run
+    """
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        "items": items,
+        "times_s": times,
+        "min_s": min(times),
+        "median_s": median,
+        "items_per_s": items / median if median > 0 else None,
+    }
+
+
+def run_size(
+    num_participants: int,
+    repeat: int,
+    sets: int,
+    generate_sheets: int,
+    backends: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every benchmark on synthetic inputs with a number of participants
+
+    Arguments:
+        num_participants -- Number of participants of the synthetic inputs
+        repeat -- Number of times every benchmark is run
+        sets -- Number of sheets per participant generated by generate_batch
+        generate_sheets -- Max number of sheets generated one at a time
+        backends -- Drawer backends to benchmark
+
+    Returns:
+        Dictionary where the key is the name of the benchmark and the value
+        its timings
+    """
+    data = make_data(
+        num_participants=num_participants,
+        num_generic_facts=60,
+        facts_per_participant=3,
+    )
+    config = make_config(num_participants=num_participants)
+    participants = sorted(data.specific_facts)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    with tempfile.TemporaryDirectory() as folder:
+        generic_path = Path(folder) / "generic_facts.txt"
+        specific_path = Path(folder) / "specific_facts.csv"
+        write_generic_facts(generic_path, data.generic_facts)
+        write_specific_facts(specific_path, data.specific_facts)
+
+        results["read_generic_facts"] = time_it(
+            lambda: InputFilesReader.read_generic_facts(generic_path),
+            repeat=repeat,
+            items=len(data.generic_facts),
+        )
+        for streaming in (False, True):
+            name = "streaming" if streaming else "pandas"
+            results[f"read_specific_facts_{name}"] = time_it(
+                lambda: (
+                    InputFilesReader.read_participant_names_and_specific_facts(
+                        csv_file_path=specific_path,
+                        name_col="Name",
+                        streaming=streaming,
+                    )
+                ),
+                repeat=repeat,
+                items=num_participants,
+            )
+
+    results["check_config_and_data"] = time_it(
+        lambda: BingoSheetGenerator.check_config_and_data(config, data),
+        repeat=repeat,
+        items=num_participants,
+    )
+
+    sample = participants[: min(generate_sheets, num_participants)]
+    results["generate"] = time_it(
+        lambda: [
+            BingoSheetGenerator.generate(name, config=config, data=data)
+            for name in sample
+        ],
+        repeat=repeat,
+        items=len(sample),
+    )
+    results["generate_batch"] = time_it(
+        lambda: BingoSheetGenerator.generate_batch(
+            participants=participants, config=config, data=data, num_sets=sets
+        ),
+        repeat=repeat,
+        items=num_participants * sets,
+    )
+
+    fact_table = FactTable.from_input_files(
+        generic_facts=data.generic_facts, specific_facts=data.specific_facts
+    )
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants, config=config, data=fact_table, num_sets=1
+    )
+    assert batch is not None
+    results["verify_batch"] = time_it(
+        lambda: Validator.verify_batch(
+            batch=batch, config=config, fact_table=fact_table
+        ),
+        repeat=repeat,
+        items=num_participants,
+    )
+    for backend in backends:
+        drawer_config = replace(cfg.SHEET_DRAWER_CONFIG, backend=backend)
+        sheets = [
+            batch.sheet(participant_idx=i % num_participants, set_idx=0)
+            for i in range(DRAW_SHEETS.get(backend, 10))
+        ]
+        with tempfile.TemporaryDirectory() as folder:
+
+            def draw() -> None:
+                for i, sheet in enumerate(sheets):
+                    assert SheetDrawer.draw_table(
+                        sheet=sheet,
+                        config=drawer_config,
+                        export_path=Path(folder) / f"sheet_{i}.pdf",
+                        title=f"Sheet {i}",
+                    )
+
+            def draw_session() -> None:
+                with SheetDrawer.Session(drawer_config) as session:
+                    for i, sheet in enumerate(sheets):
+                        assert session.draw(
+                            sheet=sheet,
+                            title=f"Sheet {i}",
+                            path=Path(folder) / f"sheet_{i}.pdf",
+                        )
+
+            results[f"draw_{backend}"] = time_it(
+                draw, repeat=repeat, items=len(sheets)
+            )
+            results[f"draw_{backend}_session"] = time_it(
+                draw_session, repeat=repeat, items=len(sheets)
+            )
+
+    return results
+
+
+def metadata() -> Dict[str, Any]:
+    """
+    Information about the environment of a benchmark run
+
+    Returns:
+        Git commit, Python version, platform and time of the run
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """
+    Print the speedup of every benchmark over a baseline run
+
+    Arguments:
+        results -- Results of this run
+        baseline -- Results of the baseline run, as written by main
+    """
+    print(
+        f"\nCompared to {baseline['metadata'].get('commit')} "
+        "(>1 is faster than the baseline):"
+    )
+    for size, benchmarks in results["results"].items():
+        for name, timing in benchmarks.items():
+            base = baseline["results"].get(size, {}).get(name)
+            if base is None:
+                continue
+            speedup = base["median_s"] / timing["median_s"]
+            print(f"{size:>8} {name:<30} {speedup:6.2f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1_000, 10_000, 100_000],
+        help="Numbers of participants of the synthetic inputs",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sets", type=int, default=2)
+    parser.add_argument(
+        "--generate-sheets",
+        type=int,
+        default=20,
+        help="Max number of sheets generated one at a time per size (slow "
+        "for many participants since generate copies the data per sheet)",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="*",
+        default=sorted(SheetDrawer.SUPPORTED_BACKENDS),
+        choices=sorted(SheetDrawer.SUPPORTED_BACKENDS),
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Location to save the JSON results to"
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="JSON results of a baseline run"
+    )
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {"metadata": metadata(), "results": {}}
+    for size in args.sizes:
+        benchmarks = run_size(
+            num_participants=size,
+            repeat=args.repeat,
+            sets=args.sets,
+            generate_sheets=args.generate_sheets,
+            backends=args.backends,
+        )
+        results["results"][str(size)] = benchmarks
+        for name, timing in benchmarks.items():
+            print(
+                f"{size:>8} {name:<30} {timing['median_s']:9.4f}s "
+                f"({timing['items_per_s']:,.0f} items/s)"
+            )
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, "r") as file:
+            compare(results, json.load(file))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
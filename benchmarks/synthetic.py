@@ -0,0 +1,191 @@
+"""
+Synthetic input data for the benchmarks: generic facts, participants with
+specific facts, and the input files read by InputFilesReader
+"""
+
+import csv
+import random
+
+from coworker_bingo import BingoSheetGenerator
+from pathlib import Path
+from typing import Dict, List
+
+# Words the synthetic facts are made of. Facts have a varying number of
+# words so that the drawn cells need a varying number of lines
+_WORDS = [
+    "has", "visited", "every", "continent", "speaks", "three", "languages",
+    "once", "met", "a", "famous", "chef", "plays", "the", "cello", "ran",
+    "marathon", "owns", "two", "cats", "grew", "up", "on", "farm", "can",
+    "juggle", "knows", "how", "to", "sail", "boat", "collects", "stamps",
+]  # fmt: skip
+
+# Specific fact cells of the 6x6 bingo sheet in scripts/config.py
+SPECIFIC_FACT_INDEXES = [
+    0, 2, 5, 7, 9, 10, 13, 14, 15, 17,
+    18, 20, 21, 22, 25, 26, 28, 30, 33, 35,
+]  # fmt: skip
+
+
+def make_fact(rng: random.Random, prefix: str) -> str:
+    """
+    Create a synthetic fact of 3 to 12 words
+
+    Arguments:
+        rng -- Random number generator
+        prefix -- Start of the fact that makes it unique
+
+    Returns:
+        Synthetic fact
+    """
+    return " ".join([prefix] + rng.choices(_WORDS, k=rng.randint(2, 11)))
+
+
+def make_generic_facts(num_generic_facts: int, seed: int = 0) -> List[str]:
+    """
+    Create unique synthetic generic facts
+
+    Arguments:
+        num_generic_facts -- Number of generic facts
+        seed -- Random seed
+
+    Returns:
+        Synthetic generic facts
+    """
+    rng = random.Random(seed)
+    return [
+        make_fact(rng, prefix=f"Generic {i}") for i in range(num_generic_facts)
+    ]
+
+
+def make_specific_facts(
+    num_participants: int, facts_per_participant: int, seed: int = 0
+) -> Dict[str, List[str]]:
+    """
+    Create synthetic participants and their specific facts
+
+    Arguments:
+        num_participants -- Number of participants
+        facts_per_participant -- Number of specific facts per participant
+        seed -- Random seed
+
+    Returns:
+        Dictionary where the key is the name of the participant and the value
+        is a list of the participant's facts
+    """
+    rng = random.Random(seed + 1)
+    return {
+        f"Participant {i}": [
+            make_fact(rng, prefix=f"P{i}.{j}")
+            for j in range(facts_per_participant)
+        ]
+        for i in range(num_participants)
+    }
+
+
+def make_data(
+    num_participants: int,
+    num_generic_facts: int,
+    facts_per_participant: int,
+    seed: int = 0,
+) -> BingoSheetGenerator.Data:
+    """
+    Create synthetic bingo sheet data
+
+    Arguments:
+        num_participants -- Number of participants that provide specific facts
+        num_generic_facts -- Number of generic facts
+        facts_per_participant -- Number of specific facts per participant
+        seed -- Random seed
+
+    Returns:
+        Synthetic bingo sheet data
+    """
+    return BingoSheetGenerator.Data(
+        generic_facts=make_generic_facts(num_generic_facts, seed=seed),
+        specific_facts=make_specific_facts(
+            num_participants, facts_per_participant, seed=seed
+        ),
+    )
+
+
+def make_config(
+    num_participants: int, assignment: str = "random", seed: int = 1
+) -> BingoSheetGenerator.Config:
+    """
+    Config of a 6x6 bingo sheet with as many of the specific fact cells of
+    scripts/config.py as the number of participants allows
+
+    Arguments:
+        num_participants -- Number of participants that provide specific facts
+        assignment -- Assignment of participants to sheets
+        seed -- Random seed
+
+    Returns:
+        Bingo sheet config
+    """
+    num_specific = min(len(SPECIFIC_FACT_INDEXES), num_participants - 1)
+    return BingoSheetGenerator.Config(
+        sheet_size=6,
+        specific_fact_indexes=set(SPECIFIC_FACT_INDEXES[:num_specific]),
+        random_seed=seed,
+        assignment=assignment,
+    )
+
+
+def write_generic_facts(path: Path, generic_facts: List[str]) -> None:
+    """
+    Write a generic facts txt file
+
+    Arguments:
+        path -- Location of the txt file
+        generic_facts -- Generic facts, one per line
+    """
+    with open(path, "w") as file:
+        file.write("\n".join(generic_facts))
+
+
+def write_specific_facts(
+    path: Path, specific_facts: Dict[str, List[str]], name_col: str = "Name"
+) -> None:
+    """
+    Write a specific facts csv file
+
+    Arguments:
+        path -- Location of the csv file
+        specific_facts -- Dictionary where the key is the name of the
+        participant and the value is a list of the participant's facts
+        name_col -- Label of the column with the names of the participants
+    """
+    max_facts = max([len(facts) for facts in specific_facts.values()] + [0])
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            [name_col] + [f"Fact{i + 1}" for i in range(max_facts)]
+        )
+        for name, facts in specific_facts.items():
+            writer.writerow([name] + facts + [""] * (max_facts - len(facts)))
+
+
+def write_specific_facts_csv(
+    path: Path, num_participants: int, max_facts: int
+) -> None:
+    """
+    Write a synthetic specific facts csv file where participants provide a
+    varying number of facts
+
+    Arguments:
+        path -- Location of the csv file
+        num_participants -- Number of participants (rows)
+        max_facts -- Number of fact columns. Participant i provides
+        i % (max_facts + 1) facts
+    """
+    write_specific_facts(
+        path=path,
+        specific_facts={
+            f"Participant {i}": [
+                f"Fact {j} of participant {i}"
+                for j in range(i % (max_facts + 1))
+            ]
+            for i in range(num_participants)
+        },
+    )
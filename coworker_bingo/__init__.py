@@ -1,3 +1,40 @@
-from .input_files_reader import InputFilesReader  # noqa: F401
-from .bingo_sheet_generator import BingoSheetGenerator  # noqa: F401
-from .sheet_drawer import SheetDrawer  # noqa: F401
+import importlib
+
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .bingo_sheet_generator import BingoSheetGenerator  # noqa: F401
+    from .fact_table import FactTable  # noqa: F401
+    from .input_files_reader import InputFilesReader  # noqa: F401
+    from .scoring import Scoreboard  # noqa: F401
+    from .sheet import Sheet  # noqa: F401
+    from .sheet_drawer import SheetDrawer  # noqa: F401
+    from .layout import SpecificLayout  # noqa: F401
+
+# Public classes and the submodule they are defined in. Submodules are only
+# imported when one of their classes is first accessed, so importing the
+# package (e.g. to only use the generator) does not pay for the others
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "InputFilesReader": ".input_files_reader",
+    "BingoSheetGenerator": ".bingo_sheet_generator",
+    "SheetDrawer": ".sheet_drawer",
+    "FactTable": ".fact_table",
+    "Sheet": ".sheet",
+    "Scoreboard": ".scoring",
+    "SpecificLayout": ".layout",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
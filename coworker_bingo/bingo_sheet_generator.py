@@ -1,15 +1,34 @@
+import itertools
 import logging
-import random
-import pandas as pd
+import numpy as np
 
-from copy import deepcopy
+from .fact_table import FactTable
+from .sheet import Sheet
+from .sheet_random import SheetRandom
+from .validation import Validator
 from dataclasses import dataclass
-from typing import Dict, List, Set
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class BingoSheetGenerator:
     """
-    Methods and dataclasses to generate a bingo sheet as a Pandas Dataframe
+    Methods and dataclasses to generate bingo sheets, either one at a time as
+    a Pandas Dataframe or in batches of lightweight Sheets
     """
 
     @dataclass
@@ -34,13 +53,25 @@ class BingoSheetGenerator:
             specific_fact_indexes: Indexes where a specific fact will be
             inserted into the sheet. Other cells will be filled with generic
             facts
-            random_seed: Random seed to initialise the pseudorandom number
-            generator
+            random_seed: Random seed. Every sheet derives its own
+            pseudorandom number streams from the seed, the participant's name
+            and the set index
+            assignment: How generate_batch picks the participants whose
+            specific facts are placed on a sheet, one of
+            SUPPORTED_ASSIGNMENTS. "random" samples them independently for
+            every sheet, "balanced" spreads every participant's facts as
+            evenly as possible over all other participants' sheets
         """
 
+        SUPPORTED_ASSIGNMENTS: ClassVar[Tuple[str, ...]] = (
+            "random",
+            "balanced",
+        )
+
         sheet_size: int
         specific_fact_indexes: Set[int]
         random_seed: int
+        assignment: str = "random"
 
         @property
         def num_cells(self) -> int:
@@ -59,15 +90,9 @@ class BingoSheetGenerator:
             Returns:
                 Aforementioned quantity
             """
-            specific_fact_indexes_valid = all(
-                [idx < self.num_cells for idx in self.specific_fact_indexes]
-            )
-            if not specific_fact_indexes_valid:
-                logging.error(
-                    "Invalid specific fact indexes - Values should be >= 0 "
-                    f"and < total number of bingo cells ({self.num_cells})."
-                )
-            return specific_fact_indexes_valid
+            report = Validator.check_config(self)
+            report.log()
+            return report.is_valid
 
     @dataclass
     class Data:
@@ -84,119 +109,879 @@ class BingoSheetGenerator:
         generic_facts: Set[str]
         specific_facts: Dict[str, List[str]]
 
+    @dataclass
+    class Batch:
+        """
+        A batch of bingo sheets where each cell is stored as a fact ID
+
+        Attributes:
+            participants: Names of the participants, in the same order as the
+            first axis of fact_ids
+            facts: Lookup table to convert a fact ID to the fact itself
+            (shared with the FactTable the batch was generated from)
+            fact_ids: Array of shape (number of participants, number of sets,
+            number of cells) holding the fact ID of every cell in row major
+            order
+            sheet_size: Number of cells in a rol/col the bingo sheet
+            owners: Names of the participants that provided specific facts
+            owner_appearances: Number of sheets the specific facts of every
+            owner appear on, in the same order as owners
+        """
+
+        participants: List[str]
+        facts: List[str]
+        fact_ids: np.ndarray
+        sheet_size: int
+        owners: List[str]
+        owner_appearances: np.ndarray
+
+        def appearance_stats(self) -> "BingoSheetGenerator.AppearanceStats":
+            """
+            Statistics of how often the participants that provided specific
+            facts appear on the sheets of the batch
+
+            Returns:
+                Aforementioned quantity
+            """
+            appearances = self.owner_appearances
+            if len(appearances) == 0:
+                return BingoSheetGenerator.AppearanceStats(0, 0, 0.0, 0.0)
+            return BingoSheetGenerator.AppearanceStats(
+                min=int(appearances.min()),
+                max=int(appearances.max()),
+                mean=float(appearances.mean()),
+                stddev=float(appearances.std()),
+            )
+
+        def sheet(self, participant_idx: int, set_idx: int) -> Sheet:
+            """
+            Get a single bingo sheet of the batch
+
+            Arguments:
+                participant_idx -- Index of the participant in participants
+                set_idx -- Index of the set (starting from 0)
+
+            Returns:
+                Bingo sheet that refers to the facts of the batch
+            """
+            return Sheet(
+                fact_ids=tuple(
+                    self.fact_ids[participant_idx, set_idx].tolist()
+                ),
+                sheet_size=self.sheet_size,
+                facts=self.facts,
+            )
+
+    @dataclass
+    class AppearanceStats:
+        """
+        Statistics of the number of sheets every participant's specific facts
+        appear on
+
+        Attributes:
+            min: Fewest appearances of a participant
+            max: Most appearances of a participant
+            mean: Mean number of appearances
+            stddev: Standard deviation of the number of appearances
+        """
+
+        min: int
+        max: int
+        mean: float
+        stddev: float
+
+    @dataclass
+    class Participants:
+        """
+        Names of all participants of a batch, prepared once so that single
+        sheets of the batch can be generated without going through the
+        names for every sheet (see generate_sheet)
+
+        Attributes:
+            non_owner_ranks: Index of every participant among the
+            participants without specific facts, by name. 0 for the
+            participants that provided specific facts
+            num_non_owners: Number of participants without specific facts
+            (at least 1)
+        """
+
+        non_owner_ranks: Dict[str, int]
+        num_non_owners: int
+
+        @staticmethod
+        def from_names(
+            names: Iterable[str], fact_table: FactTable
+        ) -> "BingoSheetGenerator.Participants":
+            """
+            Rank the participants without specific facts in the order of the
+            batch
+
+            Arguments:
+                names -- Names of all participants, in the order of the batch
+                fact_table -- Interned bingo sheet data
+
+            Returns:
+                Aforementioned quantity
+            """
+            non_owner_ranks: Dict[str, int] = {}
+            num_non_owners = 0
+            for name in names:
+                if name in non_owner_ranks:
+                    continue
+                if name in fact_table.owner_index:
+                    non_owner_ranks[name] = 0
+                else:
+                    non_owner_ranks[name] = num_non_owners
+                    num_non_owners += 1
+            return BingoSheetGenerator.Participants(
+                non_owner_ranks=non_owner_ranks,
+                num_non_owners=max(num_non_owners, 1),
+            )
+
+    # Upper bound on the number of random keys drawn at once by generate_batch
+    _BATCH_MAX_KEYS: int = 1 << 22
+    # Pools up to this many times the sample size are sampled by sorting
+    # random keys, larger pools by rejection sampling
+    _DENSE_SAMPLING_FACTOR: int = 4
+
     @staticmethod
-    def check_config_and_data(config: Config, data: Data) -> bool:
+    def check_config_and_data(
+        config: Config,
+        data: Data,
+        participants: Optional[Iterable[str]] = None,
+        fact_table: Optional[FactTable] = None,
+    ) -> bool:
         """
         Check that config and data is valid to successfully generate a bingo
-        sheet
+        sheet. Every violation is logged, see Validator.check_input
 
         Arguments:
             config -- Bingo sheet config
             data -- Bingo sheet data
+            participants -- Names of all participants. None for only the
+            participants that provided specific facts
+            fact_table -- The data already interned, None to intern it
 
         Returns:
             boolean on whether the config-data pair has passed the check
         """
+        report = Validator.check_input(
+            config=config,
+            data=data,
+            participants=participants,
+            fact_table=fact_table,
+        )
+        report.log()
+        return report.is_valid
 
-        if not config.is_valid():
-            return False
+    @staticmethod
+    def generate(
+        participant_name: str, config: Config, data: Data, set_idx: int = 0
+    ) -> "pd.DataFrame":
+        """
+        Generate a bingo sheet for a single participant to the specified
+        config, using the data provided
 
-        # Number of specific facts check
-        num_specific_fact_cells = len(config.specific_fact_indexes)
-        num_participants_with_specific_facts = len(data.specific_facts)
-        if num_participants_with_specific_facts < num_specific_fact_cells:
-            logging.error(
-                "Number of participants that provided specific facts "
-                f"({num_participants_with_specific_facts}) "
-                "is less than the required number of specific facts per "
-                f"bingo sheet ({num_specific_fact_cells})."
+        Arguments:
+            participant_name -- Name of the participant
+            config -- Bingo sheet config
+            data -- Bingo sheet data
+            set_idx -- Index of the set (starting from 0)
+
+        Returns:
+            Generated bingo sheet with sheet_size number rows and sheet_size
+            number cols
+        """
+        sheet = BingoSheetGenerator.generate_sheet(
+            participant_name=participant_name,
+            set_idx=set_idx,
+            config=config,
+            data=data,
+        )
+        if sheet is None:
+            raise ValueError(
+                f"Failed to generate a bingo sheet for {participant_name}."
             )
-            return False
+        return sheet.to_dataframe()
+
+    @staticmethod
+    def generate_sheet(
+        participant_name: str,
+        set_idx: int,
+        config: Config,
+        data: Union[Data, FactTable],
+        participants: Optional[Union[Sequence[str], Participants]] = None,
+    ) -> Optional[Sheet]:
+        """
+        Generate a single bingo sheet, identical to the same sheet of a batch
+        generated by generate_batch, without generating any other sheet
+
+        Arguments:
+            participant_name -- Name of the participant
+            set_idx -- Index of the set (starting from 0)
+            config -- Bingo sheet config
+            data -- Bingo sheet data, or the same data already interned in a
+            FactTable (avoids interning the data on every call)
+            participants -- Names of all participants the batch is generated
+            for, or the same names already prepared as Participants (avoids
+            going through the names on every call). The sheets of
+            participants without specific facts depend on their order in the
+            balanced assignment. None for only participant_name
 
-        # Ensure no empty list in specific facts
-        for name, facts in data.specific_facts.items():
-            if len(facts) == 0:
-                logging.error(
-                    f"The list of specific facts for participant {name} "
-                    "is empty. "
-                    "Remove all entry or populate list with a least one fact."
+        Returns:
+            Generated bingo sheet. None if the participant is not one of the
+            participants or the data is not sufficient, see generate_batch
+        """
+        fact_table = BingoSheetGenerator._fact_table(data)
+        if not isinstance(participants, BingoSheetGenerator.Participants):
+            participants = BingoSheetGenerator.Participants.from_names(
+                names=(
+                    [participant_name]
+                    if participants is None
+                    else participants
+                ),
+                fact_table=fact_table,
+            )
+        rank = participants.non_owner_ranks.get(participant_name)
+        if rank is None:
+            logging.error(f"Unknown participant {participant_name}.")
+            return None
+        owner = np.array(
+            [fact_table.owner_index.get(participant_name, -1)], np.int64
+        )
+        if not BingoSheetGenerator._has_enough_facts(
+            config, fact_table, owner
+        ):
+            return None
+
+        fact_ids, _ = BingoSheetGenerator._generate_set(
+            config=config,
+            fact_table=fact_table,
+            set_idx=set_idx,
+            name_keys=SheetRandom.name_keys([participant_name]),
+            owners=owner,
+            non_owner_ranks=np.array([rank], dtype=np.int64),
+            num_non_owners=participants.num_non_owners,
+        )
+        return Sheet(
+            fact_ids=tuple(fact_ids[0].tolist()),
+            sheet_size=config.sheet_size,
+            facts=fact_table.facts,
+        )
+
+    @staticmethod
+    def generate_batch(
+        participants: List[str],
+        config: Config,
+        data: Union[Data, FactTable],
+        num_sets: int,
+        participant_indexes: Optional[Sequence[int]] = None,
+    ) -> Optional[Batch]:
+        """
+        Generate num_sets bingo sheets for every participant in one go
+
+        The cell layout and fact pools are computed once and the sheets are
+        drawn with vectorised operations, which is much faster than calling
+        generate once per sheet. Every sheet only depends on the seed, the
+        participant's name and the set index (see SheetRandom), so any
+        subset of the sheets can be regenerated on its own, in any order and
+        in any process, with bit-identical results.
+
+        Arguments:
+            participants -- Names of the participants to generate sheets for
+            config -- Bingo sheet config
+            data -- Bingo sheet data, or the same data already interned in a
+            FactTable
+            num_sets -- Number of sheets generated per participant
+            participant_indexes -- Only generate the sheets of the
+            participants at these indexes of participants, e.g. for one
+            shard of a run. Their sheets are identical to the ones in the
+            batch of all participants. None for all participants
+
+        Returns:
+            Generated batch of bingo sheets. None if the data does not have
+            enough unique generic facts, or enough specific facts to exclude
+            a participant's own facts
+        """
+        fact_table = BingoSheetGenerator._fact_table(data)
+        participant_owner = np.array(
+            [fact_table.owner_index.get(name, -1) for name in participants],
+            dtype=np.int64,
+        )
+        if not BingoSheetGenerator._has_enough_facts(
+            config, fact_table, participant_owner
+        ):
+            return None
+
+        is_non_owner = participant_owner < 0
+        non_owner_ranks = np.cumsum(is_non_owner) - is_non_owner
+        num_non_owners = max(int(is_non_owner.sum()), 1)
+        if participant_indexes is not None:
+            selected = np.asarray(participant_indexes, dtype=np.int64)
+            participants = [participants[idx] for idx in selected]
+            participant_owner = participant_owner[selected]
+            non_owner_ranks = non_owner_ranks[selected]
+        num_participants = len(participants)
+        name_keys = SheetRandom.name_keys(participants)
+        fact_ids = np.empty(
+            (num_participants, num_sets, config.num_cells), dtype=np.uint32
+        )
+        owner_appearances = np.zeros(fact_table.num_owners, dtype=np.int64)
+        chunk_size = max(
+            1,
+            BingoSheetGenerator._BATCH_MAX_KEYS
+            // max(len(fact_table.generic_fact_ids), config.num_cells, 1),
+        )
+
+        for set_idx in range(num_sets):
+            for start in range(0, num_participants, chunk_size):
+                rows = slice(start, min(start + chunk_size, num_participants))
+                fact_ids[rows, set_idx], picked = (
+                    BingoSheetGenerator._generate_set(
+                        config=config,
+                        fact_table=fact_table,
+                        set_idx=set_idx,
+                        name_keys=name_keys[rows],
+                        owners=participant_owner[rows],
+                        non_owner_ranks=non_owner_ranks[rows],
+                        num_non_owners=num_non_owners,
+                    )
+                )
+                owner_appearances += np.bincount(
+                    picked.ravel(), minlength=fact_table.num_owners
                 )
-                return False
 
-        # Number of generic facts check
-        num_generic_facts = len(data.generic_facts)
+        return BingoSheetGenerator.Batch(
+            participants=list(participants),
+            facts=fact_table.facts,
+            fact_ids=fact_ids,
+            sheet_size=config.sheet_size,
+            owners=fact_table.owners,
+            owner_appearances=owner_appearances,
+        )
+
+    @staticmethod
+    def _fact_table(data: Union[Data, FactTable]) -> FactTable:
+        """
+        Intern the data into a FactTable, unless it already is one
+
+        Arguments:
+            data -- Bingo sheet data or fact table
+
+        Returns:
+            Fact table of the data
+        """
+        if isinstance(data, FactTable):
+            return data
+        return FactTable.from_input_files(
+            generic_facts=data.generic_facts,
+            specific_facts=data.specific_facts,
+        )
+
+    @staticmethod
+    def _has_enough_facts(
+        config: Config, fact_table: FactTable, participant_owner: np.ndarray
+    ) -> bool:
+        """
+        Check that the fact table has enough facts to fill the sheets of the
+        participants
+
+        Arguments:
+            config -- Bingo sheet config
+            fact_table -- Interned bingo sheet data
+            participant_owner -- Owner index of every participant, -1 for
+            participants without specific facts
+
+        Returns:
+            Boolean on whether there are enough facts
+        """
+        num_specific_fact_cells = len(config.specific_fact_indexes)
         num_generic_fact_cells = config.num_cells - num_specific_fact_cells
+        # Generic facts that are also specific facts are left out of the
+        # sheets that hold them in a specific cell
+        num_generic_facts = len(fact_table.generic_fact_ids) - min(
+            len(fact_table.shared_generic_index), num_specific_fact_cells
+        )
+        num_owners = fact_table.num_owners
+
         if num_generic_facts < num_generic_fact_cells:
             logging.error(
-                f"Number of generic facts provided ({num_generic_facts}) "
-                "is less than the required number of generic facts per "
-                f"bingo sheet ({num_generic_fact_cells})."
+                "Number of unique generic facts that can be placed on every "
+                f"sheet ({num_generic_facts}) is less than the required "
+                "number of generic facts per bingo sheet "
+                f"({num_generic_fact_cells})."
+            )
+            return False
+
+        # Owners left once the participant and the owners sharing one of
+        # the participant's facts are excluded
+        num_excluded = max(
+            (
+                1 + len(fact_table.shared_owners.get(owner, ()))
+                for owner in participant_owner.tolist()
+                if owner >= 0
+            ),
+            default=0,
+        )
+        if num_owners - num_excluded < num_specific_fact_cells:
+            logging.error(
+                "Number of participants that provided specific facts "
+                f"({num_owners}) is too small to fill "
+                f"{num_specific_fact_cells} specific fact cells without "
+                "using a participant's own facts."
             )
             return False
 
         return True
 
     @staticmethod
-    def generate(
-        participant_name: str, config: Config, data: Data
-    ) -> pd.DataFrame:
+    def _generate_set(
+        config: Config,
+        fact_table: FactTable,
+        set_idx: int,
+        name_keys: np.ndarray,
+        owners: np.ndarray,
+        non_owner_ranks: np.ndarray,
+        num_non_owners: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Generate a bingo sheet for a single participant to the specified
-        config, using the data provided
+        Generate the sheets of one set for some of the participants
 
         Arguments:
-            participant_name -- Name of the participant
             config -- Bingo sheet config
-            data -- Bingo sheet data
+            fact_table -- Interned bingo sheet data
+            set_idx -- Index of the set
+            name_keys -- Name key of every participant (see SheetRandom)
+            owners -- Owner index of every participant, -1 for participants
+            without specific facts
+            non_owner_ranks -- Index of every participant among the
+            participants without specific facts (balanced assignment only)
+            num_non_owners -- Number of participants without specific facts
+            (balanced assignment only)
 
         Returns:
-            Generated bingo sheet with sheet_size number rows and sheet_size
-            number cols
+            Tuple of the fact IDs of every sheet, of shape (number of
+            participants, number of cells), and the owners picked for every
+            sheet, of shape (number of participants, number of specific fact
+            cells)
         """
+        seed = config.random_seed
+        specific_cells = np.array(
+            sorted(config.specific_fact_indexes), dtype=np.int64
+        )
+        generic_cells = np.setdiff1d(
+            np.arange(config.num_cells, dtype=np.int64), specific_cells
+        )
+        num_sheets = len(name_keys)
+        fact_ids = np.empty((num_sheets, config.num_cells), dtype=np.uint32)
+
+        def keys(stream: int) -> np.ndarray:
+            return SheetRandom.stream_keys(seed, name_keys, set_idx, stream)
+
+        k = len(specific_cells)
+        picked = np.empty((num_sheets, 0), dtype=np.int64)
+        if k > 0:
+            picked, specific_ids = BingoSheetGenerator._pick_specific_facts(
+                config=config,
+                fact_table=fact_table,
+                set_idx=set_idx,
+                keys=keys,
+                owners=owners,
+                non_owner_ranks=non_owner_ranks,
+                num_non_owners=num_non_owners,
+                k=k,
+            )
+            fact_ids[:, specific_cells] = specific_ids
+
+        if len(generic_cells) > 0:
+            # Generic facts that are already in a specific cell of the sheet
+            generic_index = fact_table.shared_generic_index
+            exclude = np.full((num_sheets, 1), -1, dtype=np.int64)
+            if k > 0 and len(generic_index) > 0:
+                exclude = np.array(
+                    [
+                        [generic_index.get(fact_id, -1) for fact_id in row]
+                        for row in fact_ids[:, specific_cells].tolist()
+                    ],
+                    dtype=np.int64,
+                )
+            generic = BingoSheetGenerator._sample_distinct(
+                keys=keys(SheetRandom.GENERIC_FACTS),
+                pool_size=len(fact_table.generic_fact_ids),
+                k=len(generic_cells),
+                exclude=exclude,
+            )
+            fact_ids[:, generic_cells] = fact_table.generic_fact_ids[generic]
+        return fact_ids, picked
 
-        num_cells = config.num_cells
-        num_specific_fact_cells = len(config.specific_fact_indexes)
-        num_generic_fact_cells = num_cells - num_specific_fact_cells
+    @staticmethod
+    def _pick_specific_facts(
+        config: Config,
+        fact_table: FactTable,
+        set_idx: int,
+        keys: Callable[[int], np.ndarray],
+        owners: np.ndarray,
+        non_owner_ranks: np.ndarray,
+        num_non_owners: int,
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pick the owners and the specific facts of the sheets of one set
 
-        random.seed(config.random_seed)
+        Arguments:
+            config -- Bingo sheet config
+            fact_table -- Interned bingo sheet data
+            set_idx -- Index of the set
+            keys -- Stream keys of every sheet for a stream (see SheetRandom)
+            owners -- Owner index of every participant, -1 for participants
+            without specific facts
+            non_owner_ranks -- Index of every participant among the
+            participants without specific facts (balanced assignment only)
+            num_non_owners -- Number of participants without specific facts
+            (balanced assignment only)
+            k -- Number of specific fact cells
 
-        # Pick generic facts
-        generic_fact_indexes = (
-            set([i for i in range(num_cells)]) - config.specific_fact_indexes
-        )
-        assert num_generic_fact_cells == len(generic_fact_indexes)
-        generic_facts = random.sample(
-            data.generic_facts, num_generic_fact_cells
+        Returns:
+            Tuple of the owners picked for every sheet and the fact IDs of
+            the specific cells, both of shape (number of participants, k)
+        """
+        seed = config.random_seed
+
+        # Owners whose specific facts are placed on every sheet, never the
+        # participant or owners that provided one of the participant's facts
+        owner_counts = fact_table.owner_counts
+        excluded = BingoSheetGenerator._excluded_owners(fact_table, owners)
+        if config.assignment == "balanced":
+            picked, offsets = BingoSheetGenerator._pick_owners_balanced(
+                seed=seed,
+                owner_keys=SheetRandom.name_keys(fact_table.owners),
+                owner_counts=owner_counts,
+                set_idx=set_idx,
+                owners=owners,
+                excluded=excluded,
+                non_owner_ranks=non_owner_ranks,
+                num_non_owners=num_non_owners,
+                k=k,
+            )
+            order = np.argsort(
+                SheetRandom.uniform(keys(SheetRandom.OWNER_ORDER), k), axis=1
+            )
+            picked = np.take_along_axis(picked, order, axis=1)
+            offsets = np.take_along_axis(offsets, order, axis=1)
+        else:
+            picked = BingoSheetGenerator._sample_distinct(
+                keys=keys(SheetRandom.OWNERS),
+                pool_size=fact_table.num_owners,
+                k=k,
+                exclude=excluded,
+            )
+            offsets = SheetRandom.integers(
+                keys(SheetRandom.OWNER_FACTS), k, owner_counts[picked]
+            )
+        return BingoSheetGenerator._replace_repeated_facts(
+            fact_table=fact_table,
+            picked=picked,
+            offsets=offsets,
+            excluded=excluded,
         )
-        random.shuffle(generic_facts)
 
-        # Pick specific facts (excluding the participant's own facts)
-        specific_facts_no_participant = deepcopy(data.specific_facts)
-        if participant_name in specific_facts_no_participant:
-            del specific_facts_no_participant[participant_name]
-        specific_names = list(specific_facts_no_participant.keys())
-        sampled_specific_names = random.sample(
-            specific_names, num_specific_fact_cells
-        )
-        random.shuffle(sampled_specific_names)
-        sampled_facts = [
-            random.sample(specific_facts_no_participant[name], 1)[0]
-            for name in sampled_specific_names
-        ]
+    @staticmethod
+    def _replace_repeated_facts(
+        fact_table: FactTable,
+        picked: np.ndarray,
+        offsets: np.ndarray,
+        excluded: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up the specific facts picked for the sheets, and replace the
+        facts that are already on their sheet because two picked owners
+        provided the same fact
 
-        # Create sheet
-        sheet = ["" for _ in range(num_cells)]
-        for idx, gen_fact in zip(generic_fact_indexes, generic_facts):
-            sheet[idx] = gen_fact
-        for idx, gen_fact in zip(config.specific_fact_indexes, sampled_facts):
-            sheet[idx] = gen_fact
-        assert not any([len(fact) == 0 for fact in sheet])
-
-        sheet_size = config.sheet_size
-        data = [
-            sheet[i * sheet_size : i * sheet_size + sheet_size]
-            for i in range(sheet_size)
+        A repeated fact is replaced by the next fact of the same owner that
+        is not on the sheet yet. If the owner has no such fact, the next
+        owner (by index) that is not excluded, not picked for the sheet and
+        has such a fact is picked instead. Only the sheets with a repeated
+        fact are changed.
+
+        Arguments:
+            fact_table -- Interned bingo sheet data
+            picked -- Owners picked for every sheet
+            offsets -- Index of the chosen fact among the facts of every
+            picked owner
+            excluded -- Owners excluded from the sheet of every participant,
+            see _excluded_owners
+
+        Returns:
+            Tuple of the owners picked for every sheet and the fact IDs of
+            the specific cells
+        """
+        owner_offsets = fact_table.owner_offsets
+        owner_fact_ids = fact_table.owner_fact_ids
+        fact_ids = owner_fact_ids[owner_offsets[picked] + offsets]
+        sorted_ids = np.sort(fact_ids, axis=1)
+        rows = np.nonzero((sorted_ids[:, 1:] == sorted_ids[:, :-1]).any(1))[0]
+        if len(rows) == 0:
+            return picked, fact_ids
+
+        picked = picked.copy()
+        num_owners = fact_table.num_owners
+
+        def owner_facts(owner: int, first: int) -> List[int]:
+            start, end = owner_offsets[owner], owner_offsets[owner + 1]
+            facts = owner_fact_ids[start:end].tolist()
+            return facts[first:] + facts[:first]
+
+        for row in rows.tolist():
+            seen: Set[int] = set()
+            unavailable = set(excluded[row].tolist()) | set(
+                picked[row].tolist()
+            )
+            for col in range(picked.shape[1]):
+                owner = int(picked[row, col])
+                fact_id = int(fact_ids[row, col])
+                if fact_id in seen:
+                    others = (
+                        (owner + step) % num_owners
+                        for step in range(1, num_owners)
+                    )
+                    candidates = itertools.chain(
+                        (
+                            (owner, fact)
+                            for fact in owner_facts(owner, offsets[row, col])
+                        ),
+                        (
+                            (other, fact)
+                            for other in others
+                            if other not in unavailable
+                            for fact in owner_facts(other, 0)
+                        ),
+                    )
+                    replacement = next(
+                        (
+                            (candidate_owner, fact)
+                            for candidate_owner, fact in candidates
+                            if fact not in seen
+                        ),
+                        None,
+                    )
+                    # Without a replacement the sheet keeps the repeated
+                    # fact and is rejected by Validator.verify_batch
+                    if replacement is not None:
+                        owner, fact_id = replacement
+                        unavailable.add(owner)
+                        picked[row, col] = owner
+                        fact_ids[row, col] = fact_id
+                seen.add(fact_id)
+        return picked, fact_ids
+
+    @staticmethod
+    def _excluded_owners(
+        fact_table: FactTable, owners: np.ndarray
+    ) -> np.ndarray:
+        """
+        Owners whose specific facts must not be placed on the sheet of every
+        participant: the participant and the owners that provided one of the
+        participant's facts (see FactTable.shared_owners)
+
+        Arguments:
+            fact_table -- Interned bingo sheet data
+            owners -- Owner index of every participant, -1 for participants
+            without specific facts
+
+        Returns:
+            Array with one row of excluded owners per participant, starting
+            with the participant's owner index and padded with -1
+        """
+        shared = [
+            fact_table.shared_owners.get(owner, ())
+            for owner in owners.tolist()
         ]
-        columns = [str(i) for i in range(sheet_size)]
+        width = 1 + max((len(others) for others in shared), default=0)
+        excluded = np.full((len(owners), width), -1, dtype=np.int64)
+        excluded[:, 0] = owners
+        for row, others in enumerate(shared):
+            excluded[row, 1 : 1 + len(others)] = others
+        return excluded
+
+    @staticmethod
+    def _pick_owners_balanced(
+        seed: int,
+        owner_keys: np.ndarray,
+        owner_counts: np.ndarray,
+        set_idx: int,
+        owners: np.ndarray,
+        excluded: np.ndarray,
+        non_owner_ranks: np.ndarray,
+        num_non_owners: int,
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pick k owners for the sheets of one set so that every owner appears
+        on as close to the same number of sheets as possible, and choose
+        which of their facts is used
+
+        For every set, the owners are placed on a random cycle. The sheet of
+        an owner gets the k owners that follow it on the cycle, so every
+        owner appears on exactly k of these sheets and never on its own
+        (owners that provided one of the same facts are skipped, and the
+        sheet takes the next owners on the cycle instead). The
+        sheets of participants without specific facts take consecutive runs
+        of k owners from a second random cycle that is shared by all sets,
+        each run continuing where the previous one stopped, which keeps all
+        appearances within one of each other. Every appearance of an owner
+        uses the next of its facts, from a random first fact, so that they
+        are used equally often. Both are computed in closed form from the set
+        index and the rank of the participant, without replaying other sets.
 
-        return pd.DataFrame(data=data, columns=columns)
+        Arguments:
+            seed -- Random seed
+            owner_keys -- Name key of every owner
+            owner_counts -- Number of specific facts of every owner
+            set_idx -- Index of the set
+            owners -- Owner index of every participant, -1 for participants
+            without specific facts
+            excluded -- Owners excluded from the sheet of every participant,
+            see _excluded_owners
+            non_owner_ranks -- Index of every participant among the
+            participants without specific facts
+            num_non_owners -- Number of participants without specific facts
+            k -- Number of owners per sheet
+
+        Returns:
+            Tuple of the picked owners and the index of the chosen fact among
+            the owner's facts, both of shape (number of participants, k)
+        """
+        num_owners = len(owner_keys)
+        steps = np.arange(k, dtype=np.int64)
+        is_owner = owners >= 0
+        picked = np.empty((len(owners), k), dtype=np.int64)
+        appearance = np.empty((len(owners), k), dtype=np.int64)
+        first_fact = SheetRandom.integers(
+            SheetRandom.stream_keys(
+                seed, owner_keys, 0, SheetRandom.FIRST_OWNER_FACT
+            ),
+            1,
+            owner_counts[:, None],
+        )[:, 0]
+
+        if is_owner.any():
+            cycle = np.argsort(
+                SheetRandom.stream_keys(
+                    seed, owner_keys, set_idx, SheetRandom.OWNER_CYCLE
+                ),
+                kind="stable",
+            )
+            position = np.empty(num_owners, dtype=np.int64)
+            position[cycle] = np.arange(num_owners)
+            picked[is_owner] = cycle[
+                (position[owners[is_owner], None] + 1 + steps) % num_owners
+            ]
+            appearance[is_owner] = set_idx * k + steps
+            # Owners sharing facts with the participant are skipped
+            for row in np.nonzero((excluded[:, 1:] >= 0).any(axis=1))[0]:
+                following = cycle[
+                    (position[owners[row]] + 1 + np.arange(num_owners - 1))
+                    % num_owners
+                ]
+                following = following[~np.isin(following, excluded[row])]
+                picked[row] = following[:k]
+
+        if not is_owner.all():
+            cycle = np.argsort(
+                SheetRandom.stream_keys(
+                    seed, owner_keys, 0, SheetRandom.NON_OWNER_CYCLE
+                ),
+                kind="stable",
+            )
+            runs = (
+                set_idx * num_non_owners + non_owner_ranks[~is_owner, None]
+            ) * k + steps
+            picked[~is_owner] = cycle[runs % num_owners]
+            appearance[~is_owner] = runs // num_owners
+
+        offsets = (first_fact[picked] + appearance) % owner_counts[picked]
+        return picked, offsets
+
+    @staticmethod
+    def _sample_distinct(
+        keys: np.ndarray, pool_size: int, k: int, exclude: np.ndarray
+    ) -> np.ndarray:
+        """
+        Sample k distinct indexes from range(pool_size) per stream, in random
+        order and never the excluded indexes
+
+        Small pools are sampled by sorting one random key per index. Large
+        pools are sampled by rejection: the first k distinct, not excluded,
+        random indexes of the stream are kept, so the cost is O(k) and not
+        O(pool_size) per stream.
+
+        Arguments:
+            keys -- Stream keys, one per sample
+            pool_size -- Number of indexes to sample from
+            k -- Number of indexes sampled per stream
+            exclude -- Indexes excluded from every sample, one row per
+            stream padded with -1
+
+        Returns:
+            Array with one row of k sampled indexes per stream
+        """
+        if pool_size <= BingoSheetGenerator._DENSE_SAMPLING_FACTOR * k:
+            random_keys = SheetRandom.uniform(keys, pool_size)
+            rows, cols = np.nonzero(exclude >= 0)
+            random_keys[rows, exclude[rows, cols]] = np.inf
+            return BingoSheetGenerator._sample_without_replacement(
+                keys=random_keys, k=k
+            )
+
+        picked = np.empty((len(keys), k), dtype=np.int64)
+        todo = np.arange(len(keys))
+        num_draws = 2 * k + 8
+        while len(todo) > 0:
+            draws = SheetRandom.integers(keys[todo], num_draws, pool_size)
+            valid = np.empty(draws.shape, dtype=bool)
+            # Reject repeated indexes, keeping their first draw
+            order = np.argsort(draws, axis=1, kind="stable")
+            sorted_draws = np.take_along_axis(draws, order, axis=1)
+            repeated = np.zeros_like(valid)
+            repeated[:, 1:] = sorted_draws[:, 1:] == sorted_draws[:, :-1]
+            np.put_along_axis(valid, order, ~repeated, axis=1)
+            valid &= (draws[:, :, None] != exclude[todo, None, :]).all(axis=2)
+
+            done = valid.sum(axis=1) >= k
+            kept = valid[done] & (np.cumsum(valid[done], axis=1) <= k)
+            picked[todo[done]] = draws[done][kept].reshape(-1, k)
+            todo = todo[~done]
+            num_draws *= 2
+        return picked
+
+    @staticmethod
+    def _sample_without_replacement(keys: np.ndarray, k: int) -> np.ndarray:
+        """
+        Sample k indexes per row, in random order and without replacement
+
+        Arguments:
+            keys -- Uniform random keys with one row per sample
+            k -- Number of indexes sampled per row
+
+        Returns:
+            Array with one row of k sampled indexes per row of keys
+        """
+        picked = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(keys, picked, axis=1), axis=1)
+        return np.take_along_axis(picked, order, axis=1)
+
+    @staticmethod
+    def _to_dataframe(cells: List[str], sheet_size: int) -> "pd.DataFrame":
+        """
+        Arrange the cells of a bingo sheet into a Pandas Dataframe
+
+        Arguments:
+            cells -- Facts of every cell in row major order
+            sheet_size -- Number of cells in a rol/col the bingo sheet
+
+        Returns:
+            Bingo sheet with sheet_size number rows and sheet_size number cols
+        """
+        return Sheet.from_cells(
+            cells=cells, sheet_size=sheet_size
+        ).to_dataframe()
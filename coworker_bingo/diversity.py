@@ -0,0 +1,549 @@
+import logging
+import numpy as np
+
+from .bingo_sheet_generator import BingoSheetGenerator
+from .fact_table import FactTable
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+class DiversityOptimizer:
+    """
+    Methods and dataclasses to make the sheets of a batch share as few facts
+    as possible, so that neighbours cannot simply copy each other's answers
+
+    Only the generic cells are changed: a local search swaps the generic
+    fact of a cell for another generic fact whenever that lowers the sum of
+    the squared number of facts the sheet shares with every other sheet of
+    its set, without raising the largest number of facts it shares with any
+    one of them. The number of sheets that contain both of any two generic
+    facts (an inverted fact -> sheets index, aggregated into a co-occurrence
+    matrix) is updated with every swap, which gives the exact effect of
+    every possible swap of a sheet without comparing it to the other sheets.
+
+    The optimized sheets depend on each other, so they can no longer be
+    regenerated one at a time by generate_sheet or in shards.
+    """
+
+    @dataclass
+    class Config:
+        """
+        Configuration of the optimization
+
+        Attributes:
+            max_passes: Maximum number of passes over all sheets. The search
+            stops earlier once a pass finds no improving swap
+            candidates: Number of best swaps of a sheet that are checked
+            against the largest overlap before giving up on the sheet
+        """
+
+        max_passes: int = 10
+        candidates: int = 8
+
+    @dataclass
+    class OverlapStats:
+        """
+        Distribution of the number of facts shared by two sheets of the same
+        set
+
+        Attributes:
+            histogram: Number of pairs of sheets by the number of facts they
+            share
+        """
+
+        histogram: np.ndarray
+
+        @property
+        def num_pairs(self) -> int:
+            """
+            Number of pairs of sheets
+
+            Returns:
+                Aforementioned quantity
+            """
+            return int(self.histogram.sum())
+
+        @property
+        def max(self) -> int:
+            """
+            Most facts shared by any two sheets
+
+            Returns:
+                Aforementioned quantity
+            """
+            nonzero = np.flatnonzero(self.histogram)
+            return int(nonzero[-1]) if len(nonzero) > 0 else 0
+
+        @property
+        def mean(self) -> float:
+            """
+            Mean number of facts shared by two sheets
+
+            Returns:
+                Aforementioned quantity
+            """
+            if self.num_pairs == 0:
+                return 0.0
+            shared = np.arange(len(self.histogram))
+            return float((shared * self.histogram).sum() / self.num_pairs)
+
+        def quantile(self, q: float) -> int:
+            """
+            Number of shared facts that a fraction q of the pairs of sheets
+            does not exceed
+
+            Arguments:
+                q -- Fraction between 0 and 1
+
+            Returns:
+                Aforementioned quantity
+            """
+            if self.num_pairs == 0:
+                return 0
+            cumulative = np.cumsum(self.histogram)
+            return int(np.searchsorted(cumulative, q * self.num_pairs))
+
+        def summary(self) -> str:
+            """
+            One line description of the distribution
+
+            Returns:
+                Aforementioned quantity
+            """
+            return (
+                f"mean {self.mean:.2f}, p99 {self.quantile(0.99)}, "
+                f"max {self.max} shared facts over {self.num_pairs} pairs"
+            )
+
+    @dataclass
+    class Result:
+        """
+        Outcome of an optimization
+
+        Attributes:
+            before: Overlap between the sheets before the optimization
+            after: Overlap between the sheets after the optimization
+            num_swaps: Number of generic facts that were swapped
+            num_passes: Number of passes over the sheets
+        """
+
+        before: "DiversityOptimizer.OverlapStats"
+        after: "DiversityOptimizer.OverlapStats"
+        num_swaps: int
+        num_passes: int
+
+    # Facts on more sheets than this are counted with a matrix product when
+    # computing the overlap of all pairs of sheets, others pair by pair
+    _DENSE_MIN_SHEETS: int = 32
+    # Max number of elements of a block of the overlap matrix
+    _BLOCK_ELEMENTS: int = 1 << 22
+    # Change of the sum of squares of swaps that are not allowed
+    _NO_SWAP: int = np.iinfo(np.int64).max
+
+    @staticmethod
+    def optimize(
+        batch: BingoSheetGenerator.Batch,
+        config: BingoSheetGenerator.Config,
+        fact_table: FactTable,
+        optimizer_config: Config = Config(),
+    ) -> "DiversityOptimizer.Result":
+        """
+        Swap generic facts of the sheets of a batch so that the sheets of
+        every set share as few facts as possible. Modifies batch.fact_ids
+
+        Arguments:
+            batch -- Generated bingo sheets
+            config -- Bingo sheet config the batch was generated with
+            fact_table -- Interned bingo sheet data of the batch
+            optimizer_config -- Configuration of the optimization
+
+        Returns:
+            Overlap before and after the optimization
+        """
+        before = DiversityOptimizer.overlap_stats(batch.fact_ids)
+        generic_cells = np.setdiff1d(
+            np.arange(config.num_cells), sorted(config.specific_fact_indexes)
+        )
+        own_facts = [
+            DiversityOptimizer._own_facts(fact_table, name)
+            for name in batch.participants
+        ]
+
+        num_swaps = 0
+        num_passes = 0
+        for set_idx in range(batch.fact_ids.shape[1]):
+            fact_ids = np.ascontiguousarray(batch.fact_ids[:, set_idx])
+            swaps, passes = DiversityOptimizer._optimize_set(
+                fact_ids=fact_ids,
+                generic_cells=generic_cells,
+                generic_fact_ids=fact_table.generic_fact_ids,
+                own_facts=own_facts,
+                num_facts=len(fact_table.facts),
+                optimizer_config=optimizer_config,
+            )
+            batch.fact_ids[:, set_idx] = fact_ids
+            num_swaps += swaps
+            num_passes = max(num_passes, passes)
+
+        after = DiversityOptimizer.overlap_stats(batch.fact_ids)
+        return DiversityOptimizer.Result(
+            before=before,
+            after=after,
+            num_swaps=num_swaps,
+            num_passes=num_passes,
+        )
+
+    @staticmethod
+    def overlap_stats(
+        fact_ids: np.ndarray,
+    ) -> "DiversityOptimizer.OverlapStats":
+        """
+        Distribution of the number of facts shared by every pair of sheets
+        of the same set
+
+        Facts on many sheets are counted with a blockwise matrix product
+        over the sheets, facts on few sheets pair by pair, so memory use
+        stays bounded for any number of sheets.
+
+        Arguments:
+            fact_ids -- Fact IDs of the cells of every sheet, of shape
+            (number of participants, number of sets, number of cells)
+
+        Returns:
+            Aforementioned quantity
+        """
+        histogram = np.zeros(fact_ids.shape[2] + 1, dtype=np.int64)
+        for set_idx in range(fact_ids.shape[1]):
+            histogram += DiversityOptimizer._set_histogram(
+                fact_ids[:, set_idx], num_bins=len(histogram)
+            )
+        return DiversityOptimizer.OverlapStats(histogram=histogram)
+
+    @staticmethod
+    def _set_histogram(fact_ids: np.ndarray, num_bins: int) -> np.ndarray:
+        """
+        Number of pairs of sheets by the number of facts they share
+
+        Arguments:
+            fact_ids -- Fact IDs of the cells of every sheet of a set, of
+            shape (number of sheets, number of cells)
+            num_bins -- Length of the histogram
+
+        Returns:
+            Aforementioned quantity
+        """
+        num_sheets = len(fact_ids)
+        histogram = np.zeros(num_bins, dtype=np.int64)
+        if num_sheets < 2:
+            return histogram
+
+        # Distinct (sheet, fact) pairs, since a fact that is both generic
+        # and specific can be on a sheet twice
+        facts, columns = np.unique(fact_ids, return_inverse=True)
+        entries = np.unique(
+            np.repeat(np.arange(num_sheets), fact_ids.shape[1]) * len(facts)
+            + columns.ravel()
+        )
+        sheets, flat = np.divmod(entries, len(facts))
+        degrees = np.bincount(flat, minlength=len(facts))
+        is_dense = degrees > DiversityOptimizer._DENSE_MIN_SHEETS
+        dense_index = np.cumsum(is_dense) - 1
+
+        membership = np.zeros((num_sheets, int(is_dense.sum())), np.float32)
+        dense = is_dense[flat]
+        membership[sheets[dense], dense_index[flat[dense]]] = 1
+
+        # Pairs of sheets that share rare facts, with the number of them
+        rare = ~dense
+        order = np.argsort(flat[rare], kind="stable")
+        rare_facts = flat[rare][order]
+        rare_sheets = sheets[rare][order]
+        starts = np.flatnonzero(np.r_[True, rare_facts[1:] != rare_facts[:-1]])
+        ends = np.r_[starts[1:], len(rare_facts)]
+        pair_codes: List[np.ndarray] = []
+        for start, end in zip(starts, ends):
+            if end - start < 2:
+                continue
+            group = rare_sheets[start:end]
+            first, second = np.triu_indices(len(group), k=1)
+            pair_codes.append(
+                group[first].astype(np.int64) * num_sheets + group[second]
+            )
+        if pair_codes:
+            codes, counts = np.unique(
+                np.concatenate(pair_codes), return_counts=True
+            )
+        else:
+            codes = np.empty(0, dtype=np.int64)
+            counts = np.empty(0, dtype=np.int64)
+        code_rows = codes // num_sheets
+
+        block = max(1, DiversityOptimizer._BLOCK_ELEMENTS // num_sheets)
+        for start in range(0, num_sheets, block):
+            end = min(start + block, num_sheets)
+            overlap = (membership[start:end] @ membership.T).astype(np.int64)
+            lo, hi = np.searchsorted(code_rows, [start, end])
+            np.add.at(
+                overlap,
+                (code_rows[lo:hi] - start, codes[lo:hi] % num_sheets),
+                counts[lo:hi],
+            )
+            upper = (
+                np.arange(num_sheets)[None, :] > np.arange(start, end)[:, None]
+            )
+            histogram += np.bincount(overlap[upper], minlength=num_bins)[
+                :num_bins
+            ]
+        return histogram
+
+    @staticmethod
+    def _own_facts(fact_table: FactTable, name: str) -> np.ndarray:
+        """
+        Fact IDs of the specific facts of a participant
+
+        Arguments:
+            fact_table -- Interned bingo sheet data
+            name -- Name of the participant
+
+        Returns:
+            Aforementioned quantity, empty if the participant has none
+        """
+        owner = fact_table.owner_index.get(name)
+        if owner is None:
+            return np.empty(0, dtype=np.uint32)
+        start, end = fact_table.owner_offsets[owner : owner + 2]
+        return fact_table.owner_fact_ids[start:end]
+
+    @staticmethod
+    def _optimize_set(
+        fact_ids: np.ndarray,
+        generic_cells: np.ndarray,
+        generic_fact_ids: np.ndarray,
+        own_facts: List[np.ndarray],
+        num_facts: int,
+        optimizer_config: Config,
+    ) -> Tuple[int, int]:
+        """
+        Local search over the generic cells of the sheets of one set
+
+        Arguments:
+            fact_ids -- Fact IDs of the cells of every sheet of the set, of
+            shape (number of sheets, number of cells). Modified in place
+            generic_cells -- Indexes of the generic cells
+            generic_fact_ids -- Fact IDs of the generic facts
+            own_facts -- Fact IDs of the specific facts of the participant
+            of every sheet
+            num_facts -- Number of facts in the fact table
+            optimizer_config -- Configuration of the optimization
+
+        Returns:
+            Number of swaps and number of passes over the sheets
+        """
+        num_sheets = len(fact_ids)
+        num_generic = len(generic_fact_ids)
+        if num_sheets < 2 or len(generic_cells) == 0:
+            return (0, 0)
+
+        # Column of every generic fact, -1 for other facts
+        column_of = np.full(num_facts, -1, dtype=np.int64)
+        column_of[generic_fact_ids] = np.arange(num_generic)
+        columns = column_of[fact_ids]
+        sheet_of_cell = np.repeat(np.arange(num_sheets), fact_ids.shape[1])
+
+        # Inverted index of the generic facts as a (facts, sheets) matrix,
+        # and the number of sheets every two generic facts share
+        on_sheet = np.zeros((num_generic, num_sheets), dtype=np.float32)
+        is_generic = columns.ravel() >= 0
+        on_sheet[columns.ravel()[is_generic], sheet_of_cell[is_generic]] = 1
+        shared = (on_sheet @ on_sheet.T).round().astype(np.int64)
+
+        # Other facts (specific facts that are not generic facts) never
+        # change, so the number of them every sheet shares with the others
+        # is fixed
+        other_neighbours = DiversityOptimizer._other_neighbours(
+            fact_ids=fact_ids, is_other=columns < 0
+        )
+        excluded_columns = [column_of[ids] for ids in own_facts]
+        excluded_columns = [ids[ids >= 0] for ids in excluded_columns]
+
+        num_swaps = 0
+        num_passes = 0
+        for _ in range(optimizer_config.max_passes):
+            num_passes += 1
+            pass_swaps = 0
+            for sheet in range(num_sheets):
+                neighbours, counts = other_neighbours[sheet]
+                for _ in range(len(generic_cells)):
+                    swap = DiversityOptimizer._best_swap(
+                        sheet=sheet,
+                        columns=columns[sheet],
+                        generic_cells=generic_cells,
+                        on_sheet=on_sheet,
+                        shared=shared,
+                        neighbours=neighbours,
+                        counts=counts,
+                        excluded=excluded_columns[sheet],
+                        candidates=optimizer_config.candidates,
+                    )
+                    if swap is None:
+                        break
+                    cell, new_column = swap
+                    old_column = columns[sheet, cell]
+                    others = np.unique(columns[sheet][columns[sheet] >= 0])
+                    others = others[others != old_column]
+                    shared[old_column, others] -= 1
+                    shared[others, old_column] -= 1
+                    shared[old_column, old_column] -= 1
+                    shared[new_column, others] += 1
+                    shared[others, new_column] += 1
+                    shared[new_column, new_column] += 1
+                    on_sheet[old_column, sheet] = 0
+                    on_sheet[new_column, sheet] = 1
+                    columns[sheet, cell] = new_column
+                    fact_ids[sheet, cell] = generic_fact_ids[new_column]
+                    pass_swaps += 1
+            num_swaps += pass_swaps
+            logging.debug(f"Diversity pass {num_passes}: {pass_swaps} swaps")
+            if pass_swaps == 0:
+                break
+        return (num_swaps, num_passes)
+
+    @staticmethod
+    def _best_swap(
+        sheet: int,
+        columns: np.ndarray,
+        generic_cells: np.ndarray,
+        on_sheet: np.ndarray,
+        shared: np.ndarray,
+        neighbours: np.ndarray,
+        counts: np.ndarray,
+        excluded: np.ndarray,
+        candidates: int,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Find the swap of a generic fact of a sheet that lowers the sum of the
+        squared overlaps of the sheet with all other sheets the most, without
+        raising its largest overlap
+
+        With o the overlap of the sheet with every other sheet, A and B the
+        indicator vectors of the sheets with the removed and the added fact,
+        the sum of squares changes by
+        2 o.(B - A) + |A| + |B| - 2 A.B
+        where every term follows from the co-occurrence matrix.
+
+        Arguments:
+            sheet -- Index of the sheet in the set
+            columns -- Generic fact column of every cell of the sheet, -1
+            for other facts
+            generic_cells -- Indexes of the generic cells
+            on_sheet -- Whether every generic fact is on every sheet
+            shared -- Number of sheets every two generic facts share
+            neighbours -- Other sheets sharing facts that are not generic
+            facts with the sheet
+            counts -- Number of such facts shared with every neighbour
+            excluded -- Generic fact columns that must not be added (the
+            participant's own facts)
+            candidates -- Number of best swaps checked against the largest
+            overlap
+
+        Returns:
+            Cell and generic fact column of the swap. None if there is no
+            improving swap
+        """
+        present = np.sort(columns[columns >= 0])
+        repeated = present[1:][present[1:] == present[:-1]]
+        if len(repeated) > 0:
+            present = np.unique(present)
+        removable = columns[generic_cells]
+        other_dot = on_sheet[:, neighbours] @ counts.astype(np.float32)
+        overlap_dot = shared[present].sum(axis=0) + other_dot.round().astype(
+            np.int64
+        )
+        degrees = np.diagonal(shared)
+        delta = (
+            (
+                -2 * (overlap_dot[removable] - len(present))
+                + degrees[removable]
+                - 1
+            )[:, None]
+            + (2 * overlap_dot + degrees)[None, :]
+            - 2 * shared[removable]
+        )
+        delta[:, present] = DiversityOptimizer._NO_SWAP
+        delta[:, excluded] = DiversityOptimizer._NO_SWAP
+        if len(repeated) > 0:
+            # Removing one copy of a fact that is on the sheet twice does not
+            # remove it from the sheet
+            delta[np.isin(removable, repeated)] = DiversityOptimizer._NO_SWAP
+
+        flat = np.argpartition(delta.ravel(), min(candidates, delta.size - 1))
+        best = flat[: min(candidates, delta.size)]
+        best = best[np.argsort(delta.ravel()[best], kind="stable")]
+        best = best[delta.ravel()[best] < 0]
+        if len(best) == 0:
+            return None
+
+        overlap = on_sheet[present].sum(axis=0)
+        overlap[neighbours] += counts
+        overlap[sheet] = 0
+        max_overlap = overlap.max()
+        for index in best:
+            cell_idx, new_column = divmod(int(index), delta.shape[1])
+            changed = (
+                overlap - on_sheet[removable[cell_idx]] + on_sheet[new_column]
+            )
+            changed[sheet] = 0
+            if changed.max() <= max_overlap:
+                return (int(generic_cells[cell_idx]), new_column)
+        return None
+
+    @staticmethod
+    def _other_neighbours(
+        fact_ids: np.ndarray, is_other: np.ndarray
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Sheets sharing facts that are not generic facts with every sheet
+
+        Arguments:
+            fact_ids -- Fact IDs of the cells of every sheet of a set
+            is_other -- Whether every cell holds a fact that is not a
+            generic fact
+
+        Returns:
+            For every sheet, the other sheets that share such facts with it
+            and the number of such facts they share
+        """
+        num_sheets = len(fact_ids)
+        entries = np.unique(
+            fact_ids[is_other].astype(np.int64) * num_sheets
+            + np.nonzero(is_other)[0]
+        )
+        facts, sheets = np.divmod(entries, num_sheets)
+        starts = np.flatnonzero(np.r_[True, facts[1:] != facts[:-1]])
+        ends = np.r_[starts[1:], len(facts)]
+
+        firsts: List[np.ndarray] = []
+        seconds: List[np.ndarray] = []
+        for start, end in zip(starts, ends):
+            if end - start < 2:
+                continue
+            group = sheets[start:end]
+            first, second = np.nonzero(~np.eye(len(group), dtype=bool))
+            firsts.append(group[first])
+            seconds.append(group[second])
+
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        neighbours = [empty] * num_sheets
+        if not firsts:
+            return neighbours
+        codes, counts = np.unique(
+            np.concatenate(firsts).astype(np.int64) * num_sheets
+            + np.concatenate(seconds),
+            return_counts=True,
+        )
+        rows = codes // num_sheets
+        bounds = np.searchsorted(rows, np.arange(num_sheets + 1))
+        for sheet in np.flatnonzero(np.diff(bounds)):
+            lo, hi = bounds[sheet], bounds[sheet + 1]
+            neighbours[sheet] = (codes[lo:hi] % num_sheets, counts[lo:hi])
+        return neighbours
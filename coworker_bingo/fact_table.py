@@ -0,0 +1,186 @@
+import numpy as np
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence, Set
+
+
+@dataclass
+class FactTable:
+    """
+    Interned store of the facts used to populate the bingo sheets
+
+    Every unique fact is stored once in facts. Everything else refers to a
+    fact by its index in facts (fact ID), using compact integer arrays.
+
+    Attributes:
+        facts: Unique facts, indexed by fact ID
+        generic_fact_ids: Fact IDs of the generic facts
+        owners: Names of the participants that provided specific facts
+        owner_offsets: Array of length len(owners) + 1. The fact IDs of the
+        specific facts of owners[i] are
+        owner_fact_ids[owner_offsets[i]:owner_offsets[i + 1]]
+        owner_fact_ids: Fact IDs of the specific facts of all owners
+        owner_index: Index in owners of every owner name
+        shared_owners: Other owners that provided at least one of the same
+        specific facts, only for the owners that share any
+        shared_generic_index: Index in generic_fact_ids of the specific facts
+        that are also generic facts, by fact ID
+    """
+
+    facts: List[str]
+    generic_fact_ids: np.ndarray
+    owners: List[str]
+    owner_offsets: np.ndarray
+    owner_fact_ids: np.ndarray
+    owner_index: Dict[str, int] = field(init=False, repr=False)
+    shared_owners: Dict[int, np.ndarray] = field(init=False, repr=False)
+    shared_generic_index: Dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.owner_index = {name: idx for idx, name in enumerate(self.owners)}
+        self.shared_owners = FactTable._shared_owners(
+            self.owner_offsets, self.owner_fact_ids
+        )
+        is_shared = np.isin(self.generic_fact_ids, self.owner_fact_ids)
+        self.shared_generic_index = {
+            int(self.generic_fact_ids[idx]): int(idx)
+            for idx in np.nonzero(is_shared)[0]
+        }
+
+    @staticmethod
+    def from_input_files(
+        generic_facts: Iterable[str],
+        specific_facts: Mapping[str, Sequence[str]],
+    ) -> "FactTable":
+        """
+        Intern the facts read by InputFilesReader
+
+        Arguments:
+            generic_facts -- Generic facts
+            specific_facts -- Dictionary where the key is the name of the
+            participant and the value is a list of the participant's facts
+
+        Returns:
+            Fact table where every unique fact is stored once
+        """
+        facts: List[str] = []
+        fact_ids: Dict[str, int] = {}
+
+        def intern(fact: str) -> int:
+            fact_id = fact_ids.get(fact)
+            if fact_id is None:
+                fact_id = len(facts)
+                fact_ids[fact] = fact_id
+                facts.append(fact)
+            return fact_id
+
+        generic_fact_ids = list(
+            dict.fromkeys(intern(fact) for fact in generic_facts)
+        )
+        owners = []
+        owner_offsets = [0]
+        owner_fact_ids: List[int] = []
+        for name, participant_facts in specific_facts.items():
+            ids = list(
+                dict.fromkeys(intern(fact) for fact in participant_facts)
+            )
+            if len(ids) == 0:
+                continue
+            owners.append(name)
+            owner_fact_ids.extend(ids)
+            owner_offsets.append(len(owner_fact_ids))
+
+        return FactTable(
+            facts=facts,
+            generic_fact_ids=np.array(generic_fact_ids, dtype=np.uint32),
+            owners=owners,
+            owner_offsets=np.array(owner_offsets, dtype=np.int64),
+            owner_fact_ids=np.array(owner_fact_ids, dtype=np.uint32),
+        )
+
+    @property
+    def num_owners(self) -> int:
+        """
+        Number of participants that provided specific facts
+
+        Returns:
+            Aforementioned quantity
+        """
+        return len(self.owners)
+
+    @property
+    def owner_counts(self) -> np.ndarray:
+        """
+        Number of specific facts of every owner
+
+        Returns:
+            Aforementioned quantity
+        """
+        return np.diff(self.owner_offsets)
+
+    def specific_fact_ids(self, name: str) -> np.ndarray:
+        """
+        Fact IDs of the specific facts of a participant
+
+        Arguments:
+            name -- Name of the participant
+
+        Returns:
+            Fact IDs. Empty if the participant provided no specific facts
+        """
+        owner = self.owner_index.get(name)
+        if owner is None:
+            return self.owner_fact_ids[:0]
+        return self.owner_fact_ids[
+            self.owner_offsets[owner] : self.owner_offsets[owner + 1]
+        ]
+
+    @staticmethod
+    def _shared_owners(
+        owner_offsets: np.ndarray, owner_fact_ids: np.ndarray
+    ) -> Dict[int, np.ndarray]:
+        """
+        Find the owners that provided the same specific facts
+
+        Arguments:
+            owner_offsets -- Offsets of the facts of every owner in
+            owner_fact_ids
+            owner_fact_ids -- Fact IDs of the specific facts of all owners
+
+        Returns:
+            Dictionary where the key is the index of an owner sharing at
+            least one fact and the value is the sorted indexes of the other
+            owners sharing one
+        """
+        owner_of_fact = np.repeat(
+            np.arange(len(owner_offsets) - 1), np.diff(owner_offsets)
+        )
+        # The facts of an owner are unique, so a fact ID that repeats is
+        # provided by several owners
+        order = np.argsort(owner_fact_ids, kind="stable")
+        sorted_ids = owner_fact_ids[order]
+        repeated = sorted_ids[1:] == sorted_ids[:-1]
+        if not repeated.any():
+            return {}
+        shared: Dict[int, Set[int]] = {}
+        for fact_id in np.unique(sorted_ids[1:][repeated]):
+            start, end = np.searchsorted(sorted_ids, [fact_id, fact_id + 1])
+            owners = owner_of_fact[order[start:end]].tolist()
+            for owner in owners:
+                shared.setdefault(owner, set()).update(owners)
+        return {
+            owner: np.array(sorted(others - {owner}), dtype=np.int64)
+            for owner, others in shared.items()
+        }
+
+    def to_strings(self, fact_ids: Iterable[int]) -> List[str]:
+        """
+        Look up the facts of a sequence of fact IDs
+
+        Arguments:
+            fact_ids -- Fact IDs
+
+        Returns:
+            Facts in the same order as fact_ids
+        """
+        return [self.facts[fact_id] for fact_id in fact_ids]
@@ -1,5 +1,5 @@
+import csv
 import logging
-import pandas as pd
 
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
@@ -34,7 +34,7 @@ class InputFilesReader:
 
     @staticmethod
     def read_participant_names_and_specific_facts(
-        csv_file_path: Path, name_col: str
+        csv_file_path: Path, name_col: str, streaming: bool = False
     ) -> Optional[Tuple[Set[str], Dict[str, List[str]]]]:
         """
         Read the specific facts csv file
@@ -43,6 +43,10 @@ class InputFilesReader:
             csv_file_path -- Path to the specific facts csv file
             name_col -- Label of the column in the csv table that indicates the
             name of the participants
+            streaming -- Parse the file row by row with the csv module instead
+            of loading it into a Pandas Dataframe. Faster, uses less memory
+            for large files and does not import Pandas. Facts are always kept
+            as text
 
         Returns:
             A tuple where the first element is a unique set of participant
@@ -51,6 +55,13 @@ class InputFilesReader:
             him/her. None if there was an error reading the file
         """
 
+        if streaming:
+            return InputFilesReader._read_specific_facts_streaming(
+                csv_file_path=csv_file_path, name_col=name_col
+            )
+
+        import pandas as pd
+
         df = None
 
         try:
@@ -94,3 +105,75 @@ class InputFilesReader:
                 specific_facts[name] = single_participant_personal_fact
 
         return (participants, specific_facts)
+
+    @staticmethod
+    def _read_specific_facts_streaming(
+        csv_file_path: Path, name_col: str
+    ) -> Optional[Tuple[Set[str], Dict[str, List[str]]]]:
+        """
+        Read the specific facts csv file row by row with the csv module
+
+        Empty rows are skipped. Duplicate names and rows without a name are
+        detected while reading.
+
+        Arguments:
+            csv_file_path -- Path to the specific facts csv file
+            name_col -- Label of the column in the csv table that indicates the
+            name of the participants
+
+        Returns:
+            Same as read_participant_names_and_specific_facts
+        """
+
+        participants: Set[str] = set()
+        specific_facts: Dict[str, List[str]] = dict()
+
+        try:
+            with open(
+                csv_file_path, "r", newline="", encoding="utf-8-sig"
+            ) as file:
+                reader = csv.reader(file)
+                header = next(reader, None)
+                if header is None or name_col not in header:
+                    logging.error(
+                        f"Column '{name_col}' not found in specific facts "
+                        f"file '{csv_file_path}'."
+                    )
+                    return None
+                name_idx = header.index(name_col)
+
+                for row in reader:
+                    if not any(row):
+                        continue
+                    name = row[name_idx] if name_idx < len(row) else ""
+                    if name == "":
+                        logging.error(
+                            f"Row {reader.line_num} of the specific facts "
+                            "file has facts but no participant name."
+                        )
+                        return None
+                    if name in participants:
+                        logging.error(
+                            "Participant names are not unique. Ensure that "
+                            f"there are no duplicate names ({name})."
+                        )
+                        return None
+                    participants.add(name)
+                    facts = [
+                        val
+                        for idx, val in enumerate(row)
+                        if idx != name_idx and val != ""
+                    ]
+                    if len(facts) > 0:
+                        specific_facts[name] = facts
+        except FileNotFoundError:
+            logging.error(
+                f"Specific facts file '{csv_file_path}' was not found."
+            )
+            return None
+
+        if len(participants) == 0:
+            logging.error("No participants found.")
+            return None
+
+        return (participants, specific_facts)
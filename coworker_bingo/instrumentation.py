@@ -0,0 +1,233 @@
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class Instrumentation:
+    """
+    Process wide timers and memory statistics of the stages of a generation
+    run (reading, validation, generation, drawing, writing, ...)
+
+    Disabled by default, in which case stage() costs a single attribute
+    lookup. Stages that run in other processes (e.g. drawing with several
+    workers) are not recorded.
+    """
+
+    # Number of allocation sites listed per tracemalloc snapshot
+    TOP_ALLOCATIONS: int = 10
+
+    _enabled: bool = False
+    _trace_memory: bool = False
+    _start_time: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+    # Stage name -> [count, total seconds, max seconds]
+    _stages: Dict[str, List[float]] = {}
+    _snapshots: List[Dict[str, Any]] = []
+
+    class _Timer:
+        """
+        Context manager that adds its duration to a stage
+        """
+
+        __slots__ = ("name", "start")
+
+        def __init__(self, name: str) -> None:
+            self.name = name
+            self.start = 0.0
+
+        def __enter__(self) -> None:
+            self.start = time.perf_counter()
+
+        def __exit__(self, *_) -> None:
+            Instrumentation.record(self.name, time.perf_counter() - self.start)
+
+    class _NoTimer:
+        """
+        Context manager that does nothing, used while disabled
+        """
+
+        __slots__ = ()
+
+        def __enter__(self) -> None:
+            pass
+
+        def __exit__(self, *_) -> None:
+            pass
+
+    _NO_TIMER = _NoTimer()
+
+    @staticmethod
+    def start(trace_memory: bool = True) -> None:
+        """
+        Clear all statistics and start recording
+
+        Arguments:
+            trace_memory -- Whether to trace Python memory allocations with
+            tracemalloc (slows down the run)
+        """
+        with Instrumentation._lock:
+            Instrumentation._stages = {}
+            Instrumentation._snapshots = []
+            Instrumentation._start_time = time.perf_counter()
+            Instrumentation._enabled = True
+            Instrumentation._trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @staticmethod
+    def stop() -> None:
+        """
+        Stop recording. The statistics are kept until the next start
+        """
+        Instrumentation._enabled = False
+        if Instrumentation._trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        Instrumentation._trace_memory = False
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Whether statistics are being recorded
+
+        Returns:
+            Aforementioned quantity
+        """
+        return Instrumentation._enabled
+
+    @staticmethod
+    def stage(name: str) -> Any:
+        """
+        Time a stage of the run, e.g. `with Instrumentation.stage("plot"):`
+
+        Arguments:
+            name -- Name of the stage. Durations of the same name are summed
+
+        Returns:
+            Context manager timing its body
+        """
+        if not Instrumentation._enabled:
+            return Instrumentation._NO_TIMER
+        return Instrumentation._Timer(name)
+
+    @staticmethod
+    def record(name: str, seconds: float) -> None:
+        """
+        Add a duration to a stage
+
+        Arguments:
+            name -- Name of the stage
+            seconds -- Duration
+        """
+        if not Instrumentation._enabled:
+            return
+        with Instrumentation._lock:
+            stats = Instrumentation._stages.get(name)
+            if stats is None:
+                Instrumentation._stages[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    @staticmethod
+    def snapshot(label: str) -> None:
+        """
+        Record the memory use at a point of the run, with the largest
+        allocation sites if memory is traced
+
+        Arguments:
+            label -- Name of the point of the run
+        """
+        if not Instrumentation._enabled:
+            return
+        snapshot: Dict[str, Any] = {
+            "label": label,
+            "time_s": time.perf_counter() - Instrumentation._start_time,
+            "peak_rss_bytes": Instrumentation.peak_rss_bytes(),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot["traced_current_bytes"] = current
+            snapshot["traced_peak_bytes"] = peak
+            statistics = tracemalloc.take_snapshot().statistics("lineno")
+            snapshot["top_allocations"] = [
+                {
+                    "location": str(stat.traceback),
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in statistics[: Instrumentation.TOP_ALLOCATIONS]
+            ]
+        with Instrumentation._lock:
+            Instrumentation._snapshots.append(snapshot)
+
+    @staticmethod
+    def peak_rss_bytes() -> Optional[int]:
+        """
+        Peak resident set size of this process
+
+        Returns:
+            Aforementioned quantity. None if the platform does not report it
+        """
+        try:
+            import resource
+        except ImportError:  # Windows
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    @staticmethod
+    def report() -> Dict[str, Any]:
+        """
+        Statistics recorded since the last start
+
+        Returns:
+            JSON serialisable report with the count, total, mean and max
+            duration of every stage, the peak RSS and the memory snapshots
+        """
+        with Instrumentation._lock:
+            stages = {
+                name: {
+                    "count": int(count),
+                    "total_s": total,
+                    "mean_s": total / count,
+                    "max_s": longest,
+                }
+                for name, (count, total, longest) in sorted(
+                    Instrumentation._stages.items(),
+                    key=lambda item: -item[1][1],
+                )
+            }
+            snapshots = list(Instrumentation._snapshots)
+        return {
+            "wall_time_s": time.perf_counter() - Instrumentation._start_time,
+            "peak_rss_bytes": Instrumentation.peak_rss_bytes(),
+            "stages": stages,
+            "snapshots": snapshots,
+        }
+
+    @staticmethod
+    def write_report(report_path: Path) -> bool:
+        """
+        Write the report of the recorded statistics as a JSON file
+
+        Arguments:
+            report_path -- Location to save the report to
+
+        Returns:
+            Boolean on whether the report has been saved successfully
+        """
+        try:
+            with open(report_path, "w") as file:
+                json.dump(Instrumentation.report(), file, indent=2)
+        except OSError as e:
+            logging.error(f"Failed to write profile to {report_path}: {e}")
+            return False
+        return True
@@ -0,0 +1,231 @@
+import logging
+
+from .scoring import Scoreboard
+from itertools import combinations
+from typing import List, Optional, Set
+
+
+class SpecificLayout:
+    """
+    Methods to find the cells of a bingo sheet that hold specific facts
+    (BingoSheetGenerator.Config.specific_fact_indexes) for any sheet size
+
+    Specific facts are harder to find than generic facts, so they should be
+    spread as evenly as possible over the rows, columns and diagonals that
+    complete a line. A layout is scored exactly on the bitmasks of the lines
+    (see Scoreboard.line_masks): with n the sheet size and k the number of
+    specific cells, every line ideally holds k / n of them, and the cost of
+    a layout is the sum of (n * cells in line - k) ** 2 over all lines.
+
+    The search fills the sheet row by row, every row holding k // n or
+    k // n + 1 specific cells, and only keeps the column bitmasks of a row
+    that leave every column able to end with k // n or k // n + 1 of them.
+    The rows and columns are then always perfectly balanced, and a branch
+    and bound search over the two diagonals stops as soon as a layout
+    reaches the lower bound of the cost. Mirror images of a layout (columns
+    in reverse order) have the same cost, so only one of them is searched.
+    The cells that hold generic facts have the same cost as the specific
+    cells, so more than half of the cells are placed as the complement of a
+    layout with fewer cells.
+    """
+
+    # Max number of candidate row bitmasks checked before the best layout
+    # found is returned. Bounds the time of the search (well below a second
+    # for sheets up to 12x12) while giving the same layout on every machine
+    MAX_CANDIDATES: int = 500_000
+
+    @staticmethod
+    def search(sheet_size: int, count: int) -> Optional[Set[int]]:
+        """
+        Find the cells that spread a number of specific facts as evenly as
+        possible over the rows, columns and diagonals of a sheet
+
+        Arguments:
+            sheet_size -- Number of cells in a row/col of the bingo sheet
+            count -- Number of cells with specific facts
+
+        Returns:
+            Indexes of the cells (in row major order) for
+            specific_fact_indexes. None if the count does not fit the sheet
+        """
+        num_cells = sheet_size * sheet_size
+        if sheet_size < 1 or not 0 <= count <= num_cells:
+            logging.error(
+                f"Cannot place {count} specific facts on a "
+                f"{sheet_size}x{sheet_size} bingo sheet."
+            )
+            return None
+
+        if 2 * count > num_cells:
+            complement = SpecificLayout.search(sheet_size, num_cells - count)
+            if complement is None:
+                return None
+            return set(range(num_cells)) - complement
+
+        n = sheet_size
+        per_line, extra = divmod(count, n)
+        # Rows with an extra cell, spread over the sheet
+        row_counts = [
+            per_line + ((row + 1) * extra // n - row * extra // n)
+            for row in range(n)
+        ]
+        row_masks = {
+            cells: [
+                sum(1 << col for col in cols)
+                for cols in combinations(range(n), cells)
+            ]
+            for cells in set(row_counts)
+        }
+        mirror = [SpecificLayout._mirror(mask, n) for mask in range(1 << n)]
+        # Columns of the main diagonal and anti-diagonal in every row
+        diagonal_bits = [(1 << row, 1 << (n - 1 - row)) for row in range(n)]
+
+        def diagonal_cost(cells: int) -> int:
+            return (n * cells - count) ** 2
+
+        # Number of specific cells of the cheapest diagonal
+        best_cells = min(range(n + 1), key=diagonal_cost)
+        lower_bound = 2 * diagonal_cost(best_cells)
+
+        best: List[int] = []
+        best_cost = [float("inf")]
+        checked = [0]
+        rows: List[int] = []
+        column_counts = [0] * n
+
+        def bound(diagonal: int, remaining: int) -> int:
+            return min(
+                diagonal_cost(cells)
+                for cells in range(diagonal, diagonal + remaining + 1)
+            )
+
+        def visit(row: int, main: int, anti: int, symmetric: bool) -> bool:
+            if row == n:
+                cost = diagonal_cost(main) + diagonal_cost(anti)
+                if cost < best_cost[0]:
+                    best_cost[0] = cost
+                    best[:] = rows
+                return cost == lower_bound
+
+            remaining = n - row - 1
+            full = sum(1 for cells in column_counts if cells > per_line)
+            main_bit, anti_bit = diagonal_bits[row]
+            candidates = []
+            checked[0] += len(row_masks[row_counts[row]])
+            for mask in row_masks[row_counts[row]]:
+                if symmetric and mask > mirror[mask]:
+                    continue
+                feasible = True
+                new_full = full
+                for col in range(n):
+                    cells = column_counts[col] + (mask >> col & 1)
+                    if cells > per_line + 1 or cells + remaining < per_line:
+                        feasible = False
+                        break
+                    if mask >> col & 1 and cells == per_line + 1:
+                        new_full += 1
+                if not feasible or new_full > extra:
+                    continue
+                # Prefer the columns with the fewest specific cells so far,
+                # then diagonals that stay close to best_cells spread evenly
+                # over the rows, then specific cells that do not touch
+                load = sum(
+                    column_counts[col] for col in range(n) if mask >> col & 1
+                )
+                target = best_cells * (row + 1)
+                drift = abs(n * (main + (mask & main_bit != 0)) - target)
+                drift += abs(n * (anti + (mask & anti_bit != 0)) - target)
+                touching = (mask & mask >> 1).bit_count()
+                if rows:
+                    touching += (mask & rows[-1]).bit_count()
+                candidates.append((load, drift, touching, mask))
+            candidates.sort()
+
+            for _, _, _, mask in candidates:
+                new_main = main + (mask & main_bit != 0)
+                new_anti = anti + (mask & anti_bit != 0)
+                if (
+                    bound(new_main, remaining) + bound(new_anti, remaining)
+                    >= best_cost[0]
+                ):
+                    continue
+                for col in range(n):
+                    column_counts[col] += mask >> col & 1
+                rows.append(mask)
+                done = visit(
+                    row + 1,
+                    new_main,
+                    new_anti,
+                    symmetric and mask == mirror[mask],
+                )
+                rows.pop()
+                for col in range(n):
+                    column_counts[col] -= mask >> col & 1
+                if done or checked[0] >= SpecificLayout.MAX_CANDIDATES:
+                    return True
+            return False
+
+        visit(row=0, main=0, anti=0, symmetric=True)
+        if checked[0] >= SpecificLayout.MAX_CANDIDATES:
+            logging.warning(
+                f"Stopped the layout search after {checked[0]} candidate "
+                "rows, the layout may not be the most even one."
+            )
+        return {
+            row * n + col
+            for row, mask in enumerate(best)
+            for col in range(n)
+            if mask >> col & 1
+        }
+
+    @staticmethod
+    def line_counts(sheet_size: int, indexes: Set[int]) -> List[int]:
+        """
+        Number of specific cells in every line of a sheet
+
+        Arguments:
+            sheet_size -- Number of cells in a row/col of the bingo sheet
+            indexes -- Indexes of the cells with specific facts
+
+        Returns:
+            Number of specific cells of the rows, then the columns, then the
+            main diagonal and the anti-diagonal
+        """
+        cells = sum(1 << index for index in indexes)
+        return [
+            (cells & mask).bit_count()
+            for mask in Scoreboard.line_masks(sheet_size)
+        ]
+
+    @staticmethod
+    def cost(sheet_size: int, indexes: Set[int]) -> int:
+        """
+        How unevenly the specific cells are spread over the lines of a
+        sheet, 0 if every line holds the same number of them
+
+        Arguments:
+            sheet_size -- Number of cells in a row/col of the bingo sheet
+            indexes -- Indexes of the cells with specific facts
+
+        Returns:
+            Sum of (sheet_size * cells in line - number of cells) ** 2 over
+            the rows, columns and diagonals
+        """
+        return sum(
+            (sheet_size * cells - len(indexes)) ** 2
+            for cells in SpecificLayout.line_counts(sheet_size, indexes)
+        )
+
+    @staticmethod
+    def _mirror(mask: int, sheet_size: int) -> int:
+        """
+        Column bitmask of a row with the columns in reverse order
+
+        Arguments:
+            mask -- Column bitmask of a row
+            sheet_size -- Number of cells in a row/col of the bingo sheet
+
+        Returns:
+            Aforementioned quantity
+        """
+        return int(f"{mask:0{sheet_size}b}"[::-1], 2) if sheet_size else 0
@@ -0,0 +1,1279 @@
+import dataclasses
+import math
+import zlib
+
+from .text_layout import TextLayout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .sheet_drawer import SheetDrawer
+
+
+class PdfRenderer:
+    """
+    Methods to render a bingo sheet directly as PDF drawing operators, with
+    the same layout as the tables drawn by df2img
+    """
+
+    # Layout in PDF points (equal to the pixels of the df2img figure)
+    MARGIN: float = 5
+    TITLE_MARGIN: float = 40
+    TITLE_X_FRACTION: float = 0.01
+    HEADER_HEIGHT: float = 28
+    HEADER_FONT_SIZE: float = 12
+    CELL_PADDING: float = 8
+    LINE_SPACING: float = 1.3
+    LINE_WIDTH: float = 1
+
+    # Colours (RGB from 0 to 1) of the default plotly table template
+    TITLE_COLOR: Tuple[float, float, float] = (0, 0, 0)
+    TEXT_COLOR: Tuple[float, float, float] = (0.165, 0.247, 0.373)
+    HEADER_FILL_COLOR: Tuple[float, float, float] = (0.784, 0.831, 0.89)
+    CELL_FILL_COLOR: Tuple[float, float, float] = (0.922, 0.941, 0.973)
+    LINE_COLOR: Tuple[float, float, float] = (0, 0, 0)
+
+    @staticmethod
+    def render(
+        header: List[str],
+        rows: List[List[str]],
+        config: "SheetDrawer.Config",
+        title: str,
+    ) -> bytes:
+        """
+        Render a bingo sheet into a single page PDF document
+
+        Arguments:
+            header -- Labels shown in the header row
+            rows -- Facts of every cell, one list per row of the sheet
+            config -- Drawer config
+            title -- Title that will be shown above the table
+
+        Returns:
+            Content of the PDF file
+        """
+        fonts = PdfRenderer.font_resources(config=config)
+        content = PdfRenderer.content_stream(
+            header=header, rows=rows, config=config, title=title, fonts=fonts
+        )
+        return PdfRenderer.document(
+            content=content, fonts=fonts, page_size=config.fig_size
+        )
+
+    @staticmethod
+    def font_resources(config: "SheetDrawer.Config") -> Dict[str, str]:
+        """
+        Resource names of the fonts used to render a bingo sheet
+
+        Arguments:
+            config -- Drawer config
+
+        Returns:
+            Dictionary where the key is the standard PDF font and the value is
+            the name of the font in the page resources
+        """
+        fonts: Dict[str, str] = {}
+        for font in (config.title_font, config.cell_font):
+            base_font = TextLayout.resolve_font(font)
+            if base_font not in fonts:
+                fonts[base_font] = f"F{len(fonts) + 1}"
+        return fonts
+
+    @staticmethod
+    def content_stream(
+        header: List[str],
+        rows: List[List[str]],
+        config: "SheetDrawer.Config",
+        title: str,
+        fonts: Dict[str, str],
+    ) -> bytes:
+        """
+        PDF drawing operators of a bingo sheet page
+
+        Arguments:
+            header -- Labels shown in the header row
+            rows -- Facts of every cell, one list per row of the sheet
+            config -- Drawer config
+            title -- Title that will be shown above the table
+            fonts -- Font resource names returned by font_resources
+
+        Returns:
+            Uncompressed content stream of the page
+        """
+        wrapped_rows, row_heights = PdfRenderer.layout(
+            rows=rows, num_cols=len(header), config=config
+        )
+        return (
+            PdfRenderer.grid_stream(
+                header=header,
+                row_heights=row_heights,
+                config=config,
+                fonts=fonts,
+            )
+            + b"\n"
+            + PdfRenderer.text_stream(
+                wrapped_rows=wrapped_rows,
+                row_heights=row_heights,
+                num_cols=len(header),
+                config=config,
+                title=title,
+                fonts=fonts,
+            )
+        )
+
+    @staticmethod
+    def layout(
+        rows: List[List[str]], num_cols: int, config: "SheetDrawer.Config"
+    ) -> Tuple[List[List[List[str]]], List[float]]:
+        """
+        Wrap the facts of every cell and compute the height of every row
+
+        Arguments:
+            rows -- Facts of every cell, one list per row of the sheet
+            num_cols -- Number of columns of the sheet
+            config -- Drawer config
+
+        Returns:
+            A tuple where the first element holds the wrapped lines of every
+            cell, one list per row of the sheet. The second element is the
+            height of every row
+        """
+        text_width = (
+            PdfRenderer.column_width(num_cols=num_cols, config=config)
+            - 2 * PdfRenderer.CELL_PADDING
+        )
+        line_height = config.cell_font_size * PdfRenderer.LINE_SPACING
+        wrapped_rows = [
+            [
+                TextLayout.wrap(
+                    text=str(cell),
+                    font=config.cell_font,
+                    font_size=config.cell_font_size,
+                    max_width=text_width,
+                )
+                for cell in row
+            ]
+            for row in rows
+        ]
+        # Rows grow to fit their facts, like the tables drawn by plotly
+        row_heights = [
+            max(
+                config.cell_height,
+                2 * PdfRenderer.CELL_PADDING
+                + max([len(lines) for lines in row] + [0]) * line_height,
+            )
+            for row in wrapped_rows
+        ]
+        return (wrapped_rows, row_heights)
+
+    @staticmethod
+    def column_width(num_cols: int, config: "SheetDrawer.Config") -> float:
+        """
+        Width of every column of the sheet
+
+        Arguments:
+            num_cols -- Number of columns of the sheet
+            config -- Drawer config
+
+        Returns:
+            Aforementioned quantity
+        """
+        return (config.fig_size[0] - 2 * PdfRenderer.MARGIN) / num_cols
+
+    @staticmethod
+    def grid_stream(
+        header: List[str],
+        row_heights: List[float],
+        config: "SheetDrawer.Config",
+        fonts: Dict[str, str],
+    ) -> bytes:
+        """
+        PDF drawing operators of the parts of a page that do not depend on
+        the facts: cell backgrounds, grid lines and header labels
+
+        Arguments:
+            header -- Labels shown in the header row
+            row_heights -- Height of every row returned by layout
+            config -- Drawer config
+            fonts -- Font resource names returned by font_resources
+
+        Returns:
+            Uncompressed content stream
+        """
+        num_cols = len(header)
+        col_width = PdfRenderer.column_width(num_cols=num_cols, config=config)
+        cell_font = fonts[TextLayout.resolve_font(config.cell_font)]
+        left = PdfRenderer.MARGIN
+        top = config.fig_size[1] - PdfRenderer.TITLE_MARGIN
+        table_width = col_width * num_cols
+        body_height = sum(row_heights)
+        bottom = top - PdfRenderer.HEADER_HEIGHT - body_height
+        ops: List[str] = []
+
+        # Backgrounds
+        ops.append(PdfRenderer._fill_color(PdfRenderer.HEADER_FILL_COLOR))
+        ops.append(
+            f"{_num(left)} {_num(top - PdfRenderer.HEADER_HEIGHT)} "
+            f"{_num(table_width)} {_num(PdfRenderer.HEADER_HEIGHT)} re f"
+        )
+        ops.append(PdfRenderer._fill_color(PdfRenderer.CELL_FILL_COLOR))
+        ops.append(
+            f"{_num(left)} {_num(bottom)} "
+            f"{_num(table_width)} {_num(body_height)} re f"
+        )
+
+        # Grid
+        ops.append(PdfRenderer._stroke_color(PdfRenderer.LINE_COLOR))
+        ops.append(f"{_num(PdfRenderer.LINE_WIDTH)} w")
+        y = top
+        for height in [PdfRenderer.HEADER_HEIGHT] + list(row_heights) + [0]:
+            ops.append(
+                f"{_num(left)} {_num(y)} m {_num(left + table_width)} "
+                f"{_num(y)} l"
+            )
+            y -= height
+        for col in range(num_cols + 1):
+            x = left + col * col_width
+            ops.append(f"{_num(x)} {_num(top)} m {_num(x)} {_num(bottom)} l")
+        ops.append("S")
+
+        # Header labels
+        ops.append(PdfRenderer._fill_color(PdfRenderer.TEXT_COLOR))
+        for col, label in enumerate(header):
+            label = str(label)
+            label_width = TextLayout.text_width(
+                label, config.cell_font, PdfRenderer.HEADER_FONT_SIZE
+            )
+            ops.append(
+                PdfRenderer._text(
+                    font=cell_font,
+                    font_size=PdfRenderer.HEADER_FONT_SIZE,
+                    x=left + (col + 0.5) * col_width - label_width / 2,
+                    y=top
+                    - PdfRenderer.HEADER_HEIGHT / 2
+                    - PdfRenderer.HEADER_FONT_SIZE / 3,
+                    lines=[label],
+                    line_height=0,
+                )
+            )
+
+        return "\n".join(ops).encode("latin-1")
+
+    @staticmethod
+    def text_stream(
+        wrapped_rows: List[List[List[str]]],
+        row_heights: List[float],
+        num_cols: int,
+        config: "SheetDrawer.Config",
+        title: str,
+        fonts: Dict[str, str],
+    ) -> bytes:
+        """
+        PDF drawing operators of the title and the facts of a page
+
+        Arguments:
+            wrapped_rows -- Wrapped lines of every cell returned by layout
+            row_heights -- Height of every row returned by layout
+            num_cols -- Number of columns of the sheet
+            config -- Drawer config
+            title -- Title that will be shown above the table
+            fonts -- Font resource names returned by font_resources
+
+        Returns:
+            Uncompressed content stream
+        """
+        page_width, page_height = config.fig_size
+        col_width = PdfRenderer.column_width(num_cols=num_cols, config=config)
+        cell_font = fonts[TextLayout.resolve_font(config.cell_font)]
+        title_font = fonts[TextLayout.resolve_font(config.title_font)]
+        line_height = config.cell_font_size * PdfRenderer.LINE_SPACING
+        left = PdfRenderer.MARGIN
+        ops: List[str] = []
+
+        # Title
+        ops.append(PdfRenderer._fill_color(PdfRenderer.TITLE_COLOR))
+        ops.append(
+            PdfRenderer._text(
+                font=title_font,
+                font_size=config.title_font_size,
+                x=page_width * PdfRenderer.TITLE_X_FRACTION,
+                y=page_height
+                - PdfRenderer.TITLE_MARGIN / 2
+                - config.title_font_size / 3,
+                lines=[title],
+                line_height=0,
+            )
+        )
+
+        # Cells: a block of left aligned lines centered in the cell
+        ops.append(PdfRenderer._fill_color(PdfRenderer.TEXT_COLOR))
+        row_top = page_height - PdfRenderer.TITLE_MARGIN
+        row_top -= PdfRenderer.HEADER_HEIGHT
+        for row, height in zip(wrapped_rows, row_heights):
+            for col, lines in enumerate(row):
+                if len(lines) == 0:
+                    continue
+                block_width = max(
+                    TextLayout.text_width(
+                        line, config.cell_font, config.cell_font_size
+                    )
+                    for line in lines
+                )
+                ops.append(
+                    PdfRenderer._text(
+                        font=cell_font,
+                        font_size=config.cell_font_size,
+                        x=left + (col + 0.5) * col_width - block_width / 2,
+                        y=row_top
+                        - PdfRenderer.CELL_PADDING
+                        - config.cell_font_size,
+                        lines=lines,
+                        line_height=line_height,
+                    )
+                )
+            row_top -= height
+
+        return "\n".join(ops).encode("latin-1")
+
+    @staticmethod
+    def document(
+        content: bytes, fonts: Dict[str, str], page_size: Tuple[int, int]
+    ) -> bytes:
+        """
+        Assemble a single page PDF document
+
+        Arguments:
+            content -- Content stream of the page
+            fonts -- Font resource names returned by font_resources
+            page_size -- Width and height of the page
+
+        Returns:
+            Content of the PDF file
+        """
+        font_ids = {name: 4 + i for i, name in enumerate(fonts.values())}
+        content_id = 4 + len(fonts)
+        font_refs = " ".join(
+            f"/{name} {obj_id} 0 R" for name, obj_id in font_ids.items()
+        )
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (
+                f"<< /Type /Page /Parent 2 0 R "
+                f"/MediaBox [0 0 {_num(page_size[0])} {_num(page_size[1])}] "
+                f"/Resources << /Font << {font_refs} >> >> "
+                f"/Contents {content_id} 0 R >>"
+            ).encode("latin-1"),
+        ]
+        objects.extend(
+            PdfRenderer.font_object(base_font) for base_font in fonts
+        )
+        objects.append(PdfRenderer.stream_object(content))
+
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for obj_id, obj in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += f"{obj_id} 0 obj\n".encode("latin-1")
+            output += obj
+            output += b"\nendobj\n"
+        xref_offset = len(output)
+        output += f"xref\n0 {len(objects) + 1}\n".encode("latin-1")
+        output += b"0000000000 65535 f \n"
+        for offset in offsets:
+            output += f"{offset:010d} 00000 n \n".encode("latin-1")
+        output += (
+            f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode("latin-1")
+        return bytes(output)
+
+    @staticmethod
+    def font_object(base_font: str) -> bytes:
+        """
+        PDF object of a standard font
+
+        Arguments:
+            base_font -- Name of the standard PDF font
+
+        Returns:
+            Serialised font dictionary
+        """
+        return (
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} "
+            "/Encoding /WinAnsiEncoding >>"
+        ).encode("latin-1")
+
+    @staticmethod
+    def stream_object(content: bytes, entries: str = "") -> bytes:
+        """
+        PDF stream object holding compressed content
+
+        Arguments:
+            content -- Uncompressed content of the stream
+            entries -- Additional entries of the stream dictionary
+
+        Returns:
+            Serialised stream object
+        """
+        compressed = zlib.compress(content)
+        return (
+            (
+                f"<< {entries + ' ' if entries else ''}"
+                f"/Length {len(compressed)} /Filter /FlateDecode >>\n"
+                "stream\n"
+            ).encode("latin-1")
+            + compressed
+            + b"\nendstream"
+        )
+
+    @staticmethod
+    def _text(
+        font: str,
+        font_size: float,
+        x: float,
+        y: float,
+        lines: List[str],
+        line_height: float,
+    ) -> str:
+        """
+        Operators to draw left aligned lines of text
+
+        Arguments:
+            font -- Font resource name
+            font_size -- Font size
+            x -- Horizontal position of the start of the lines
+            y -- Vertical position of the baseline of the first line
+            lines -- Lines of text
+            line_height -- Distance between the baselines of two lines
+
+        Returns:
+            Text object operators
+        """
+        ops = [
+            "BT",
+            f"/{font} {_num(font_size)} Tf",
+            f"{_num(line_height)} TL",
+            f"{_num(x)} {_num(y)} Td",
+        ]
+        for i, line in enumerate(lines):
+            ops.append(f"{'T* ' if i > 0 else ''}({_escape(line)}) Tj")
+        ops.append("ET")
+        return "\n".join(ops)
+
+    @staticmethod
+    def _fill_color(color: Tuple[float, float, float]) -> str:
+        return " ".join(_num(c) for c in color) + " rg"
+
+    @staticmethod
+    def _stroke_color(color: Tuple[float, float, float]) -> str:
+        return " ".join(_num(c) for c in color) + " RG"
+
+
+class PdfSheetTemplate:
+    """
+    Precomputed parts of the pages of all bingo sheets drawn with the same
+    drawer config and header
+
+    Only the title and the facts differ between the sheets, so the document
+    structure, fonts and grids are built once and every sheet only stamps
+    its text into a copy of the template. The wrapped lines and text
+    operators of every fact are cached, since the generic facts appear on
+    most sheets. Renders the same bytes as PdfRenderer.render.
+    """
+
+    # Number of facts and grids (row heights) cached per template
+    MAX_CACHED_FACTS: int = 1 << 16
+    MAX_CACHED_GRIDS: int = 64
+
+    # Number of templates kept by get, e.g. for different configs
+    MAX_TEMPLATES: int = 8
+
+    _templates: Dict[Tuple, "PdfSheetTemplate"] = {}
+
+    @dataclass(frozen=True)
+    class CellText:
+        """
+        Cached layout of a fact
+
+        Attributes:
+            num_lines: Number of lines the fact is wrapped into
+            x_offset: Horizontal offset from the center of the cell to the
+            start of the lines
+            ops: Text operators that follow the position of the text object
+        """
+
+        num_lines: int
+        x_offset: float
+        ops: str
+
+    @staticmethod
+    def get(
+        config: "SheetDrawer.Config", header: List[str]
+    ) -> "PdfSheetTemplate":
+        """
+        Get the template of a drawer config and header, creating it on first
+        use
+
+        Arguments:
+            config -- Drawer config
+            header -- Labels shown in the header row
+
+        Returns:
+            Template shared by all sheets with the same config and header
+        """
+        key = (dataclasses.astuple(config), tuple(header))
+        template = PdfSheetTemplate._templates.get(key)
+        if template is None:
+            if len(PdfSheetTemplate._templates) >= (
+                PdfSheetTemplate.MAX_TEMPLATES
+            ):
+                PdfSheetTemplate._templates.clear()
+            template = PdfSheetTemplate(config=config, header=header)
+            PdfSheetTemplate._templates[key] = template
+        return template
+
+    def __init__(self, config: "SheetDrawer.Config", header: List[str]):
+        """
+        Precompute the parts of the page that do not depend on the facts
+
+        Arguments:
+            config -- Drawer config
+            header -- Labels shown in the header row
+        """
+        self.config = config
+        self.header = [str(label) for label in header]
+        self.fonts = PdfRenderer.font_resources(config=config)
+        self.num_cols = len(header)
+        self.col_width = PdfRenderer.column_width(
+            num_cols=self.num_cols, config=config
+        )
+        self.text_width = self.col_width - 2 * PdfRenderer.CELL_PADDING
+        self.line_height = config.cell_font_size * PdfRenderer.LINE_SPACING
+        cell_font = self.fonts[TextLayout.resolve_font(config.cell_font)]
+        self._cell_prefix = (
+            f"BT\n/{cell_font} {_num(config.cell_font_size)} Tf\n"
+            f"{_num(self.line_height)} TL\n"
+        )
+        self._cells: Dict[str, PdfSheetTemplate.CellText] = {}
+        self._grids: Dict[Tuple[float, ...], bytes] = {}
+
+        # Everything of the single page document before the content stream
+        page_width, page_height = config.fig_size
+        font_ids = {name: 4 + i for i, name in enumerate(self.fonts.values())}
+        self._content_id = 4 + len(self.fonts)
+        font_refs = " ".join(
+            f"/{name} {obj_id} 0 R" for name, obj_id in font_ids.items()
+        )
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (
+                f"<< /Type /Page /Parent 2 0 R "
+                f"/MediaBox [0 0 {_num(page_width)} {_num(page_height)}] "
+                f"/Resources << /Font << {font_refs} >> >> "
+                f"/Contents {self._content_id} 0 R >>"
+            ).encode("latin-1"),
+        ]
+        objects.extend(
+            PdfRenderer.font_object(base_font) for base_font in self.fonts
+        )
+        head = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        xref = [
+            f"xref\n0 {self._content_id + 1}\n",
+            "0000000000 65535 f \n",
+        ]
+        for obj_id, obj in enumerate(objects, start=1):
+            xref.append(f"{len(head):010d} 00000 n \n")
+            head += f"{obj_id} 0 obj\n".encode("latin-1")
+            head += obj
+            head += b"\nendobj\n"
+        self._head = bytes(head)
+        self._xref = "".join(xref)
+
+    def cell_text(self, fact: str) -> "PdfSheetTemplate.CellText":
+        """
+        Layout of a fact in a cell, computed on first use
+
+        Arguments:
+            fact -- Fact shown in the cell
+
+        Returns:
+            Cached layout of the fact
+        """
+        cell = self._cells.get(fact)
+        if cell is None:
+            config = self.config
+            lines = TextLayout.wrap(
+                text=fact,
+                font=config.cell_font,
+                font_size=config.cell_font_size,
+                max_width=self.text_width,
+            )
+            block_width = max(
+                [
+                    TextLayout.text_width(
+                        line, config.cell_font, config.cell_font_size
+                    )
+                    for line in lines
+                ]
+                + [0]
+            )
+            ops = [
+                f"{'T* ' if i > 0 else ''}({_escape(line)}) Tj"
+                for i, line in enumerate(lines)
+            ]
+            ops.append("ET")
+            cell = PdfSheetTemplate.CellText(
+                num_lines=len(lines),
+                x_offset=-block_width / 2,
+                ops="\n".join(ops),
+            )
+            if len(self._cells) >= PdfSheetTemplate.MAX_CACHED_FACTS:
+                self._cells.clear()
+            self._cells[fact] = cell
+        return cell
+
+    def layout(
+        self, rows: List[List[str]]
+    ) -> Tuple[List[List["PdfSheetTemplate.CellText"]], List[float]]:
+        """
+        Look up the layout of every cell and compute the height of every row
+
+        Arguments:
+            rows -- Facts of every cell, one list per row of the sheet
+
+        Returns:
+            A tuple where the first element holds the layout of every cell,
+            one list per row of the sheet. The second element is the height
+            of every row
+        """
+        cell_rows = [
+            [self.cell_text(str(cell)) for cell in row] for row in rows
+        ]
+        # Rows grow to fit their facts, like the tables drawn by plotly
+        row_heights = [
+            max(
+                self.config.cell_height,
+                2 * PdfRenderer.CELL_PADDING
+                + max([cell.num_lines for cell in row] + [0])
+                * self.line_height,
+            )
+            for row in cell_rows
+        ]
+        return (cell_rows, row_heights)
+
+    def grid(self, row_heights: List[float]) -> bytes:
+        """
+        Operators that draw the cell backgrounds, grid lines and header
+        labels, computed once per distinct row heights
+
+        Arguments:
+            row_heights -- Height of every row returned by layout
+
+        Returns:
+            Uncompressed content stream
+        """
+        key = tuple(row_heights)
+        grid = self._grids.get(key)
+        if grid is None:
+            grid = PdfRenderer.grid_stream(
+                header=self.header,
+                row_heights=row_heights,
+                config=self.config,
+                fonts=self.fonts,
+            )
+            if len(self._grids) >= PdfSheetTemplate.MAX_CACHED_GRIDS:
+                self._grids.clear()
+            self._grids[key] = grid
+        return grid
+
+    def text(
+        self,
+        cell_rows: List[List["PdfSheetTemplate.CellText"]],
+        row_heights: List[float],
+        title: str,
+    ) -> bytes:
+        """
+        Operators that draw the title and the facts of a sheet
+
+        Arguments:
+            cell_rows -- Layout of every cell returned by layout
+            row_heights -- Height of every row returned by layout
+            title -- Title that will be shown above the table
+
+        Returns:
+            Uncompressed content stream
+        """
+        config = self.config
+        page_width, page_height = config.fig_size
+        title_font = self.fonts[TextLayout.resolve_font(config.title_font)]
+        ops = [
+            PdfRenderer._fill_color(PdfRenderer.TITLE_COLOR),
+            PdfRenderer._text(
+                font=title_font,
+                font_size=config.title_font_size,
+                x=page_width * PdfRenderer.TITLE_X_FRACTION,
+                y=page_height
+                - PdfRenderer.TITLE_MARGIN / 2
+                - config.title_font_size / 3,
+                lines=[title],
+                line_height=0,
+            ),
+            PdfRenderer._fill_color(PdfRenderer.TEXT_COLOR),
+        ]
+
+        # Cells: a block of left aligned lines centered in the cell
+        row_top = page_height - PdfRenderer.TITLE_MARGIN
+        row_top -= PdfRenderer.HEADER_HEIGHT
+        centers = [
+            PdfRenderer.MARGIN + (col + 0.5) * self.col_width
+            for col in range(self.num_cols)
+        ]
+        for row, height in zip(cell_rows, row_heights):
+            y = _num(
+                row_top - PdfRenderer.CELL_PADDING - config.cell_font_size
+            )
+            for center, cell in zip(centers, row):
+                if cell.num_lines == 0:
+                    continue
+                ops.append(
+                    f"{self._cell_prefix}{_num(center + cell.x_offset)} {y} "
+                    f"Td\n{cell.ops}"
+                )
+            row_top -= height
+
+        return "\n".join(ops).encode("latin-1")
+
+    def content_stream(self, rows: List[List[str]], title: str) -> bytes:
+        """
+        PDF drawing operators of a bingo sheet page
+
+        Arguments:
+            rows -- Facts of every cell, one list per row of the sheet
+            title -- Title that will be shown above the table
+
+        Returns:
+            Uncompressed content stream of the page
+        """
+        cell_rows, row_heights = self.layout(rows=rows)
+        return (
+            self.grid(row_heights=row_heights)
+            + b"\n"
+            + self.text(
+                cell_rows=cell_rows, row_heights=row_heights, title=title
+            )
+        )
+
+    def render(self, rows: List[List[str]], title: str) -> bytes:
+        """
+        Render a bingo sheet into a single page PDF document
+
+        Arguments:
+            rows -- Facts of every cell, one list per row of the sheet
+            title -- Title that will be shown above the table
+
+        Returns:
+            Content of the PDF file
+        """
+        content = PdfRenderer.stream_object(
+            self.content_stream(rows=rows, title=title)
+        )
+        content_offset = len(self._head)
+        output = bytearray(self._head)
+        output += f"{self._content_id} 0 obj\n".encode("latin-1")
+        output += content
+        output += b"\nendobj\n"
+        xref_offset = len(output)
+        output += (
+            f"{self._xref}{content_offset:010d} 00000 n \n"
+            f"trailer\n<< /Size {self._content_id + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode("latin-1")
+        return bytes(output)
+
+
+class PdfDocumentWriter:
+    """
+    Stream bingo sheets into a single multi-page PDF document
+
+    Every page is written to the file as soon as it is added, so only the
+    object offsets and the page numbers of every bookmark are kept in memory.
+    The fonts and the grid of the sheets are written once and shared by all
+    pages. The document starts with index pages that list the pages of every
+    bookmark name, and has an outline (bookmarks) with an entry per name.
+    """
+
+    INDEX_TITLE: str = "Index"
+    INDEX_FONT_SIZE: float = 12
+
+    # Number of distinct grids (header and row heights) shared as templates.
+    # Grids of sheets beyond that are drawn on the page itself
+    MAX_TEMPLATES: int = 64
+
+    _CATALOG_ID: int = 1
+    _PAGES_ID: int = 2
+    _RESOURCES_ID: int = 3
+
+    @dataclass(frozen=True)
+    class Page:
+        """
+        A rendered bingo sheet that can be added to any document with the
+        same drawer config, e.g. one written by another process
+
+        Attributes:
+            header: Labels shown in the header row
+            row_heights: Height of every row of the sheet
+            text: Content stream that draws the title and the facts
+        """
+
+        header: Tuple[str, ...]
+        row_heights: Tuple[float, ...]
+        text: bytes
+
+    def __init__(self, path: Path, config: "SheetDrawer.Config") -> None:
+        """
+        Create the document and write its header and fonts
+
+        Arguments:
+            path -- Location to save the document to
+            config -- Drawer config used for every page
+        """
+        self.path = path
+        self.config = config
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._offsets: Dict[int, int] = {}
+        self._next_id = PdfDocumentWriter._RESOURCES_ID + 1
+        self._sheet_page_ids: List[int] = []
+        self._bookmarks: Dict[str, List[int]] = {}
+        self._templates: Dict[
+            Tuple[Tuple[str, ...], Tuple[float, ...]], str
+        ] = {}
+        self._template_ids: Dict[str, int] = {}
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._fonts = PdfRenderer.font_resources(config=config)
+        self._font_ids: Dict[str, int] = {}
+        for base_font, name in self._fonts.items():
+            self._font_ids[name] = self._write_object(
+                PdfRenderer.font_object(base_font)
+            )
+
+    def __enter__(self) -> "PdfDocumentWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def num_sheets(self) -> int:
+        """
+        Number of sheets added to the document so far
+
+        Returns:
+            Aforementioned quantity
+        """
+        return len(self._sheet_page_ids)
+
+    def add_sheet(
+        self,
+        header: List[str],
+        rows: List[List[str]],
+        title: str,
+        bookmark: str,
+    ) -> None:
+        """
+        Add a bingo sheet as the next page of the document
+
+        Arguments:
+            header -- Labels shown in the header row
+            rows -- Facts of every cell, one list per row of the sheet
+            title -- Title that will be shown above the table
+            bookmark -- Name the page is listed under in the index and the
+            bookmarks
+        """
+        self.add_page(
+            page=PdfDocumentWriter.render_page(
+                config=self.config, header=header, rows=rows, title=title
+            ),
+            bookmark=bookmark,
+        )
+
+    @staticmethod
+    def render_page(
+        config: "SheetDrawer.Config",
+        header: List[str],
+        rows: List[List[str]],
+        title: str,
+    ) -> "PdfDocumentWriter.Page":
+        """
+        Render a bingo sheet as a page, without adding it to a document
+
+        Arguments:
+            config -- Drawer config of the document
+            header -- Labels shown in the header row
+            rows -- Facts of every cell, one list per row of the sheet
+            title -- Title that will be shown above the table
+
+        Returns:
+            Rendered page
+        """
+        template = PdfSheetTemplate.get(config=config, header=header)
+        cell_rows, row_heights = template.layout(rows=rows)
+        return PdfDocumentWriter.Page(
+            header=tuple(template.header),
+            row_heights=tuple(row_heights),
+            text=template.text(
+                cell_rows=cell_rows, row_heights=row_heights, title=title
+            ),
+        )
+
+    def add_page(self, page: "PdfDocumentWriter.Page", bookmark: str) -> None:
+        """
+        Add a rendered bingo sheet as the next page of the document
+
+        Arguments:
+            page -- Page rendered with the drawer config of the document
+            bookmark -- Name the page is listed under in the index and the
+            bookmarks
+        """
+        template = PdfSheetTemplate.get(
+            config=self.config, header=list(page.header)
+        )
+        grid = self._grid(
+            template=template, row_heights=list(page.row_heights)
+        )
+        self._bookmarks.setdefault(bookmark, []).append(self.num_sheets)
+        self._sheet_page_ids.append(self._write_page(grid + b"\n" + page.text))
+
+    def close(self) -> None:
+        """
+        Write the index pages, bookmarks and cross reference table and close
+        the file. Does nothing if the document is already closed
+        """
+        if self._file is None:
+            return
+
+        index_page_ids = self._write_index_pages()
+        page_ids = index_page_ids + self._sheet_page_ids
+        outlines_id = self._write_outlines(
+            first_sheet_page=len(index_page_ids)
+        )
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        self._write_object(
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode(
+                "latin-1"
+            ),
+            obj_id=PdfDocumentWriter._PAGES_ID,
+        )
+        font_refs = " ".join(
+            f"/{name} {obj_id} 0 R" for name, obj_id in self._font_ids.items()
+        )
+        template_refs = " ".join(
+            f"/{name} {obj_id} 0 R"
+            for name, obj_id in self._template_ids.items()
+        )
+        self._write_object(
+            (
+                f"<< /Font << {font_refs} >> /XObject << {template_refs} >> >>"
+            ).encode("latin-1"),
+            obj_id=PdfDocumentWriter._RESOURCES_ID,
+        )
+        outlines = f" /Outlines {outlines_id} 0 R" if outlines_id else ""
+        self._write_object(
+            (
+                f"<< /Type /Catalog /Pages {PdfDocumentWriter._PAGES_ID} 0 R"
+                f"{outlines} /PageMode /UseOutlines >>"
+            ).encode("latin-1"),
+            obj_id=PdfDocumentWriter._CATALOG_ID,
+        )
+
+        xref_offset = self._file.tell()
+        size = self._next_id
+        xref = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            xref.append(f"{self._offsets[obj_id]:010d} 00000 n \n")
+        xref.append(
+            f"trailer\n<< /Size {size} /Root "
+            f"{PdfDocumentWriter._CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        )
+        self._write("".join(xref).encode("latin-1"))
+        self._file.close()
+        self._file = None
+
+    def _grid(
+        self, template: PdfSheetTemplate, row_heights: List[float]
+    ) -> bytes:
+        """
+        Operators that draw the grid of a sheet, using a shared template
+        whenever possible
+
+        Arguments:
+            template -- Template of the header of the sheet
+            row_heights -- Height of every row returned by template.layout
+
+        Returns:
+            Uncompressed content stream
+        """
+        key = (tuple(template.header), tuple(row_heights))
+        name = self._templates.get(key)
+        if name is None:
+            grid = template.grid(row_heights=row_heights)
+            if len(self._templates) >= PdfDocumentWriter.MAX_TEMPLATES:
+                return grid
+            name = f"G{len(self._templates) + 1}"
+            page_width, page_height = self.config.fig_size
+            self._template_ids[name] = self._write_object(
+                PdfRenderer.stream_object(
+                    grid,
+                    entries=(
+                        "/Type /XObject /Subtype /Form "
+                        f"/BBox [0 0 {_num(page_width)} {_num(page_height)}] "
+                        f"/Resources {PdfDocumentWriter._RESOURCES_ID} 0 R"
+                    ),
+                )
+            )
+            self._templates[key] = name
+        return f"/{name} Do".encode("latin-1")
+
+    def _write_index_pages(self) -> List[int]:
+        """
+        Write the pages listing the page numbers of every bookmark name
+
+        Returns:
+            Object IDs of the index pages
+        """
+        names = sorted(self._bookmarks)
+        if len(names) == 0:
+            return []
+
+        page_width, page_height = self.config.fig_size
+        line_height = (
+            PdfDocumentWriter.INDEX_FONT_SIZE * PdfRenderer.LINE_SPACING
+        )
+        lines_per_page = max(
+            1,
+            int(
+                (
+                    page_height
+                    - PdfRenderer.TITLE_MARGIN
+                    - 2 * PdfRenderer.MARGIN
+                )
+                // line_height
+            ),
+        )
+        num_index_pages = math.ceil(len(names) / lines_per_page)
+        title_font = self._fonts[
+            TextLayout.resolve_font(self.config.title_font)
+        ]
+        cell_font = self._fonts[TextLayout.resolve_font(self.config.cell_font)]
+        left = PdfRenderer.MARGIN + PdfRenderer.CELL_PADDING
+        first_line = page_height - PdfRenderer.TITLE_MARGIN - line_height
+
+        page_ids = []
+        for page in range(num_index_pages):
+            page_names = names[
+                page * lines_per_page : (page + 1) * lines_per_page
+            ]
+            entries = [
+                ", ".join(
+                    str(num_index_pages + sheet + 1)
+                    for sheet in self._bookmarks[name]
+                )
+                for name in page_names
+            ]
+            pages_x = (
+                page_width - PdfRenderer.MARGIN - PdfRenderer.CELL_PADDING
+            )
+            ops = [
+                PdfRenderer._fill_color(PdfRenderer.TITLE_COLOR),
+                PdfRenderer._text(
+                    font=title_font,
+                    font_size=self.config.title_font_size,
+                    x=page_width * PdfRenderer.TITLE_X_FRACTION,
+                    y=page_height
+                    - PdfRenderer.TITLE_MARGIN / 2
+                    - self.config.title_font_size / 3,
+                    lines=[PdfDocumentWriter.INDEX_TITLE],
+                    line_height=0,
+                ),
+                PdfRenderer._text(
+                    font=cell_font,
+                    font_size=PdfDocumentWriter.INDEX_FONT_SIZE,
+                    x=left,
+                    y=first_line,
+                    lines=page_names,
+                    line_height=line_height,
+                ),
+            ]
+            for i, entry in enumerate(entries):
+                entry_width = TextLayout.text_width(
+                    entry,
+                    self.config.cell_font,
+                    PdfDocumentWriter.INDEX_FONT_SIZE,
+                )
+                ops.append(
+                    PdfRenderer._text(
+                        font=cell_font,
+                        font_size=PdfDocumentWriter.INDEX_FONT_SIZE,
+                        x=pages_x - entry_width,
+                        y=first_line - i * line_height,
+                        lines=[entry],
+                        line_height=0,
+                    )
+                )
+            page_ids.append(self._write_page("\n".join(ops).encode("latin-1")))
+        return page_ids
+
+    def _write_outlines(self, first_sheet_page: int) -> Optional[int]:
+        """
+        Write the bookmarks of the document: one entry per bookmark name,
+        with one child entry per page if the name has several pages
+
+        Arguments:
+            first_sheet_page -- Number of pages before the first sheet
+
+        Returns:
+            Object ID of the outlines dictionary. None if there are no
+            bookmarks
+        """
+        names = sorted(self._bookmarks)
+        if len(names) == 0:
+            return None
+
+        outlines_id = self._reserve_id()
+        item_ids = [self._reserve_id() for _ in names]
+        for i, (name, item_id) in enumerate(zip(names, item_ids)):
+            sheets = self._bookmarks[name]
+            entries = [
+                f"/Title {_text_string(name)}",
+                f"/Parent {outlines_id} 0 R",
+                f"/Dest [{self._sheet_page_ids[sheets[0]]} 0 R /Fit]",
+            ]
+            if i > 0:
+                entries.append(f"/Prev {item_ids[i - 1]} 0 R")
+            if i < len(names) - 1:
+                entries.append(f"/Next {item_ids[i + 1]} 0 R")
+            if len(sheets) > 1:
+                child_ids = [self._reserve_id() for _ in sheets]
+                entries.append(f"/First {child_ids[0]} 0 R")
+                entries.append(f"/Last {child_ids[-1]} 0 R")
+                entries.append(f"/Count -{len(child_ids)}")
+                for j, (sheet, child_id) in enumerate(zip(sheets, child_ids)):
+                    page = first_sheet_page + sheet + 1
+                    child = [
+                        f"/Title {_text_string(f'Page {page}')}",
+                        f"/Parent {item_id} 0 R",
+                        f"/Dest [{self._sheet_page_ids[sheet]} 0 R /Fit]",
+                    ]
+                    if j > 0:
+                        child.append(f"/Prev {child_ids[j - 1]} 0 R")
+                    if j < len(child_ids) - 1:
+                        child.append(f"/Next {child_ids[j + 1]} 0 R")
+                    self._write_object(
+                        f"<< {' '.join(child)} >>".encode("latin-1"),
+                        obj_id=child_id,
+                    )
+            self._write_object(
+                f"<< {' '.join(entries)} >>".encode("latin-1"), obj_id=item_id
+            )
+
+        self._write_object(
+            (
+                f"<< /Type /Outlines /First {item_ids[0]} 0 R "
+                f"/Last {item_ids[-1]} 0 R /Count {len(item_ids)} >>"
+            ).encode("latin-1"),
+            obj_id=outlines_id,
+        )
+        return outlines_id
+
+    def _write_page(self, content: bytes) -> int:
+        """
+        Write a page and its content stream
+
+        Arguments:
+            content -- Uncompressed content stream of the page
+
+        Returns:
+            Object ID of the page
+        """
+        page_width, page_height = self.config.fig_size
+        content_id = self._write_object(PdfRenderer.stream_object(content))
+        return self._write_object(
+            (
+                f"<< /Type /Page /Parent {PdfDocumentWriter._PAGES_ID} 0 R "
+                f"/MediaBox [0 0 {_num(page_width)} {_num(page_height)}] "
+                f"/Resources {PdfDocumentWriter._RESOURCES_ID} 0 R "
+                f"/Contents {content_id} 0 R >>"
+            ).encode("latin-1")
+        )
+
+    def _reserve_id(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_object(self, body: bytes, obj_id: Optional[int] = None) -> int:
+        """
+        Write an indirect object to the file
+
+        Arguments:
+            body -- Serialised object
+            obj_id -- Previously reserved object ID. None to use a new one
+
+        Returns:
+            Object ID of the written object
+        """
+        if obj_id is None:
+            obj_id = self._reserve_id()
+        assert self._file is not None
+        self._offsets[obj_id] = self._file.tell()
+        self._write(
+            f"{obj_id} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        )
+        return obj_id
+
+    def _write(self, data: bytes) -> None:
+        assert self._file is not None
+        self._file.write(data)
+
+
+def _num(value: float) -> str:
+    """
+    Format a number as compactly as possible for a PDF content stream
+    """
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _escape(text: str) -> str:
+    """
+    Encode text as the content of a PDF literal string in WinAnsiEncoding
+
+    Raises:
+        ValueError -- The text has characters that are not in Windows-1252,
+        which the standard fonts cannot draw
+    """
+    try:
+        encoded = text.encode("cp1252").decode("latin-1")
+    except UnicodeEncodeError as e:
+        raise ValueError(
+            f"{text[e.start : e.end]!r} in {text!r} cannot be drawn by the "
+            "pdf backend, which only supports the characters of "
+            "Windows-1252. Use the df2img backend for other characters"
+        ) from None
+    return (
+        encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    )
+
+
+def _text_string(text: str) -> str:
+    """
+    Encode text as a PDF text string, using UTF-16 for non ASCII text
+    """
+    if text.isascii():
+        return f"({_escape(text)})"
+    return "<FEFF" + text.encode("utf-16-be").hex().upper() + ">"
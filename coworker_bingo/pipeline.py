@@ -0,0 +1,333 @@
+import queue
+import threading
+import time
+
+from .instrumentation import Instrumentation
+from .sheet_drawer import SheetDrawer
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+
+class SheetPipeline:
+    """
+    Draw bingo sheets in three overlapping stages: the jobs are generated by
+    the calling thread, rendered by a pool of workers and written to disk by
+    background threads. The stages are connected by bounded queues, so at
+    most a fixed number of rendered sheets are held in memory at any time.
+    """
+
+    @dataclass
+    class Config:
+        """
+        Configuration of the stages of the pipeline
+
+        Attributes:
+            render_workers: Number of workers rendering sheets. More than one
+            renders in a pool of processes, one renders in a background
+            thread
+            write_workers: Number of threads writing rendered sheets to disk
+            queue_depth: Maximum number of sheets waiting to be rendered and
+            maximum number of rendered sheets waiting to be written
+        """
+
+        render_workers: int = 1
+        write_workers: int = 1
+        queue_depth: int = 16
+
+        def is_valid(self) -> bool:
+            """
+            Check whether the configuration of the pipeline is valid
+
+            Returns:
+                Boolean on whether the configuration is valid
+            """
+            return (
+                self.render_workers >= 1
+                and self.write_workers >= 1
+                and self.queue_depth >= 1
+            )
+
+    @dataclass
+    class Stats:
+        """
+        Number of sheets that passed every stage of the pipeline so far
+
+        Attributes:
+            generated: Number of jobs taken from the generation stage
+            rendered: Number of sheets rendered
+            written: Number of sheets written to disk
+            start_time: Time the pipeline started (time.perf_counter)
+        """
+
+        generated: int = 0
+        rendered: int = 0
+        written: int = 0
+        start_time: float = field(default_factory=time.perf_counter)
+        _lock: threading.Lock = field(
+            default_factory=threading.Lock, repr=False, compare=False
+        )
+
+        def add(self, stage: str) -> None:
+            """
+            Count a sheet that passed a stage. Thread safe
+
+            Arguments:
+                stage -- One of "generated", "rendered" or "written"
+            """
+            with self._lock:
+                setattr(self, stage, getattr(self, stage) + 1)
+
+        def rates(self) -> Dict[str, float]:
+            """
+            Throughput of every stage since the pipeline started
+
+            Returns:
+                Dictionary where the key is the stage and the value is the
+                number of sheets per second
+            """
+            elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+            return {
+                "generated": self.generated / elapsed,
+                "rendered": self.rendered / elapsed,
+                "written": self.written / elapsed,
+            }
+
+        def summary(self) -> str:
+            """
+            Throughput of every stage as text, e.g. to show in a progress bar
+
+            Returns:
+                Aforementioned quantity
+            """
+            rates = self.rates()
+            return (
+                f"gen {rates['generated']:.0f}/s | "
+                f"render {rates['rendered']:.0f}/s | "
+                f"write {rates['written']:.0f}/s"
+            )
+
+    @dataclass
+    class Rendered:
+        """
+        Sheet that passed the render stage
+
+        Attributes:
+            export_path: Location to save file to
+            content: Content of the file. None if rendering failed
+            error: Description of the failure. None if successful
+        """
+
+        export_path: Path
+        content: Optional[bytes]
+        error: Optional[str] = None
+
+    # Sentinel that tells a writer thread to stop
+    _STOP = None
+
+    @staticmethod
+    def run(
+        jobs: Iterable[SheetDrawer.Job],
+        drawer_config: SheetDrawer.Config,
+        config: Config,
+        stats: Optional[Stats] = None,
+    ) -> Iterator[SheetDrawer.Result]:
+        """
+        Draw many bingo sheets to files with overlapping stages
+
+        Jobs are only taken from the iterable while fewer than queue_depth
+        sheets are being rendered, so a lazy generator of jobs only generates
+        sheets as fast as they are drawn. A failure to draw a sheet is
+        reported in its result instead of stopping the remaining sheets.
+
+        Arguments:
+            jobs: Bingo sheets to draw
+            drawer_config: Drawer config
+            config: Configuration of the stages of the pipeline
+            stats: Counters updated while the pipeline runs. None to not
+            report them
+
+        Returns:
+            Iterator over the result of every job, in order of completion
+        """
+        if stats is None:
+            stats = SheetPipeline.Stats()
+
+        write_queue: "queue.Queue[Optional[SheetPipeline.Rendered]]" = (
+            queue.Queue(maxsize=config.queue_depth)
+        )
+        results: "queue.Queue[SheetDrawer.Result]" = queue.Queue()
+        writers = [
+            threading.Thread(
+                target=SheetPipeline._write_loop,
+                args=(write_queue, results, stats),
+                daemon=True,
+            )
+            for _ in range(config.write_workers)
+        ]
+        for writer in writers:
+            writer.start()
+
+        def drain() -> List[SheetDrawer.Result]:
+            drained = []
+            while True:
+                try:
+                    drained.append(results.get_nowait())
+                except queue.Empty:
+                    return drained
+
+        def hand_off(done: Set[Future]) -> None:
+            for future in done:
+                rendered = future.result()
+                stats.add("rendered")
+                # Blocks while the writers are behind, which in turn stops
+                # new jobs from being generated
+                write_queue.put(rendered)
+
+        executor: Executor
+        # Drawing session of the render thread. Render processes have their
+        # own session, created by SheetDrawer._init_worker
+        session: Optional[SheetDrawer.Session] = None
+        if config.render_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=config.render_workers,
+                initializer=SheetDrawer._init_worker,
+                initargs=(drawer_config,),
+            )
+        else:
+            session = SheetDrawer.Session(drawer_config)
+            executor = ThreadPoolExecutor(
+                max_workers=1, initializer=session.start
+            )
+
+        try:
+            with executor:
+                in_flight: Set[Future] = set()
+                for job in jobs:
+                    stats.add("generated")
+                    if len(in_flight) >= config.queue_depth:
+                        done, in_flight = wait(
+                            in_flight, return_when=FIRST_COMPLETED
+                        )
+                        hand_off(done)
+                        yield from drain()
+                    if session is None:
+                        job = SheetDrawer._process_job(job)
+                    in_flight.add(
+                        executor.submit(
+                            SheetPipeline._render_job,
+                            job=job,
+                            session=session,
+                        )
+                    )
+                    yield from drain()
+                while in_flight:
+                    done, in_flight = wait(
+                        in_flight, return_when=FIRST_COMPLETED
+                    )
+                    hand_off(done)
+                    yield from drain()
+        finally:
+            if session is not None:
+                session.close()
+            for _ in writers:
+                write_queue.put(SheetPipeline._STOP)
+            for writer in writers:
+                writer.join()
+
+        yield from drain()
+
+    @staticmethod
+    def _render_job(
+        job: SheetDrawer.Job, session: Optional[SheetDrawer.Session] = None
+    ) -> "SheetPipeline.Rendered":
+        """
+        Render a single job, catching any error raised while rendering it
+
+        Arguments:
+            job: Bingo sheet to render
+            session: Drawing session. None to use the session of the render
+            process
+
+        Returns:
+            Rendered sheet
+        """
+        if session is None:
+            session = SheetDrawer._worker_session
+        assert session is not None, "Render process not initialised"
+        try:
+            content = session.render(
+                sheet=job.sheet,
+                title=job.title,
+                export_format=job.export_path.suffix,
+            )
+        except Exception as e:
+            return SheetPipeline.Rendered(
+                export_path=job.export_path,
+                content=None,
+                error=f"{type(e).__name__}: {e}",
+            )
+        return SheetPipeline.Rendered(
+            export_path=job.export_path,
+            content=content,
+            error=(
+                None
+                if content is not None
+                else "Unsupported backend or export path extension"
+            ),
+        )
+
+    @staticmethod
+    def _write_loop(
+        write_queue: "queue.Queue[Optional[SheetPipeline.Rendered]]",
+        results: "queue.Queue[SheetDrawer.Result]",
+        stats: "SheetPipeline.Stats",
+    ) -> None:
+        """
+        Write rendered sheets to disk until the stop sentinel is received
+
+        Arguments:
+            write_queue: Rendered sheets to write
+            results: Queue the result of every sheet is put into
+            stats: Counters of the pipeline
+        """
+        while True:
+            rendered = write_queue.get()
+            if rendered is SheetPipeline._STOP:
+                return
+            if rendered.content is None:
+                results.put(
+                    SheetDrawer.Result(
+                        export_path=rendered.export_path,
+                        success=False,
+                        error=rendered.error,
+                    )
+                )
+                continue
+            try:
+                with Instrumentation.stage("write"):
+                    with open(rendered.export_path, "wb") as file:
+                        file.write(rendered.content)
+            except OSError as e:
+                results.put(
+                    SheetDrawer.Result(
+                        export_path=rendered.export_path,
+                        success=False,
+                        error=f"{type(e).__name__}: {e}",
+                    )
+                )
+                continue
+            stats.add("written")
+            results.put(
+                SheetDrawer.Result(
+                    export_path=rendered.export_path, success=True
+                )
+            )
@@ -0,0 +1,273 @@
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+
+class RenderCache:
+    """
+    Content addressed cache of the files rendered by a generation run
+
+    A manifest in the output folder records the hash of the input files, the
+    hash of the config, the random seed and a hash of every rendered file.
+    The hash of a sheet covers everything its file depends on (facts, title,
+    drawer config and export path), so a rerun only needs to render the
+    sheets whose hash changed and can reuse the existing files for the rest.
+    The config hashes also cover RENDERER_VERSION and the version of the
+    package, so files drawn by an older renderer are rendered again.
+    """
+
+    MANIFEST_PATH: Path = Path(".cache") / "manifest.json"
+    MANIFEST_VERSION: int = 1
+    # Increase when a change of SheetDrawer, PdfRenderer or TextLayout
+    # changes the files drawn for the same sheets and config
+    RENDERER_VERSION: int = 1
+
+    def __init__(
+        self, folder: Path, input_hash: str, config_hash: str, seed: int
+    ) -> None:
+        """
+        Load the manifest of the previous run from the output folder
+
+        Arguments:
+            folder -- Output folder of the rendered files
+            input_hash -- Hash of the input files of this run
+            config_hash -- Hash of the config of this run
+            seed -- Random seed of this run
+        """
+        self.folder = folder
+        self.input_hash = input_hash
+        self.config_hash = config_hash
+        self.seed = seed
+        self._previous = self._load()
+        self._previous_files: Dict[str, str] = self._previous.get("files", {})
+        self._files: Dict[str, str] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        """
+        Location of the manifest
+
+        Returns:
+            Aforementioned quantity
+        """
+        return self.folder / RenderCache.MANIFEST_PATH
+
+    @staticmethod
+    def hash_files(paths: Iterable[Path]) -> str:
+        """
+        Hash the content of files
+
+        Arguments:
+            paths -- Files to hash
+
+        Returns:
+            Hex digest over the content of all files
+        """
+        digest = hashlib.sha256()
+        for path in paths:
+            with open(path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_config(*configs: Any) -> str:
+        """
+        Hash config values such as dataclasses, numbers and strings, together
+        with the version of the renderer (see renderer_version)
+
+        Arguments:
+            configs -- Config values to hash
+
+        Returns:
+            Hex digest over all config values
+        """
+
+        def to_json(value: Any) -> Any:
+            if dataclasses.is_dataclass(value):
+                return to_json(dataclasses.asdict(value))
+            if isinstance(value, dict):
+                return {str(k): to_json(v) for k, v in value.items()}
+            if isinstance(value, (set, frozenset)):
+                return sorted(to_json(v) for v in value)
+            if isinstance(value, (list, tuple)):
+                return [to_json(v) for v in value]
+            if isinstance(value, Path):
+                return str(value)
+            return value
+
+        text = json.dumps(
+            [RenderCache.renderer_version()]
+            + [to_json(config) for config in configs]
+        )
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def renderer_version() -> str:
+        """
+        Version of the code that draws the files: RENDERER_VERSION and the
+        version of the installed package
+
+        Returns:
+            Aforementioned quantity
+        """
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            package_version = version("coworker_bingo")
+        except PackageNotFoundError:
+            package_version = "unknown"
+        return f"{RenderCache.RENDERER_VERSION}/{package_version}"
+
+    @staticmethod
+    def hash_sheet(cells: Sequence[str], title: str, render_key: str) -> str:
+        """
+        Hash everything the rendered file of a sheet depends on
+
+        Arguments:
+            cells -- Facts of every cell of the sheet
+            title -- Title of the sheet
+            render_key -- Hash of the drawer config and export format
+
+        Returns:
+            Hex digest of the sheet
+        """
+        digest = hashlib.sha256(render_key.encode("utf-8"))
+        for text in [title, *cells]:
+            digest.update(b"\0")
+            digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def is_unchanged(self) -> bool:
+        """
+        Whether the inputs, config and seed are the same as in the previous
+        run and all its files still exist, so nothing needs to be rendered
+
+        Returns:
+            Aforementioned quantity
+        """
+        return (
+            self._previous.get("input_hash") == self.input_hash
+            and self._previous.get("config_hash") == self.config_hash
+            and self._previous.get("seed") == self.seed
+            and len(self._previous_files) > 0
+            and all(
+                (self.folder / name).is_file() for name in self._previous_files
+            )
+        )
+
+    def reuse_all(self) -> None:
+        """
+        Keep every file of the previous run in the manifest of this run
+        """
+        self._files.update(self._previous_files)
+
+    def is_fresh(self, export_path: Path, sheet_hash: str) -> bool:
+        """
+        Whether a file was rendered from the same sheet hash in the previous
+        run and still exists
+
+        Arguments:
+            export_path -- Location of the rendered file
+            sheet_hash -- Hash of the sheet returned by hash_sheet
+
+        Returns:
+            Aforementioned quantity
+        """
+        name = self._name(export_path)
+        if self._previous_files.get(name) != sheet_hash:
+            return False
+        if not export_path.is_file():
+            return False
+        self._files[name] = sheet_hash
+        return True
+
+    def update(self, export_path: Path, sheet_hash: str) -> None:
+        """
+        Record a file rendered in this run
+
+        Arguments:
+            export_path -- Location of the rendered file
+            sheet_hash -- Hash of the sheet returned by hash_sheet
+        """
+        self._files[self._name(export_path)] = sheet_hash
+
+    def remove_stale(self) -> int:
+        """
+        Delete the files of the previous run that are not part of this run,
+        e.g. the sheets of participants that are no longer in the input
+        files. Only files listed in the previous manifest are deleted
+
+        Returns:
+            Number of deleted files
+        """
+        num_removed = 0
+        for name in self._previous_files:
+            if name in self._files:
+                continue
+            path = self.folder / name
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logging.warning(f"Failed to remove outdated file {path}: {e}")
+                continue
+            num_removed += 1
+        return num_removed
+
+    def save(self) -> None:
+        """
+        Write the manifest of this run, replacing the previous one
+        """
+        manifest = {
+            "version": RenderCache.MANIFEST_VERSION,
+            "input_hash": self.input_hash,
+            "config_hash": self.config_hash,
+            "seed": self.seed,
+            "files": dict(sorted(self._files.items())),
+        }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(manifest, file, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _name(self, export_path: Path) -> str:
+        """
+        Name of a file in the manifest, relative to the output folder
+        """
+        return os.path.relpath(export_path, self.folder)
+
+    def _load(self) -> Dict[str, Any]:
+        """
+        Read the manifest of the previous run
+
+        Returns:
+            Content of the manifest. Empty if there is no valid manifest
+        """
+        manifest: Optional[Dict[str, Any]] = None
+        try:
+            with open(self.manifest_path, "r") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(
+                f"Ignoring unreadable cache manifest {self.manifest_path}: {e}"
+            )
+            return {}
+        if (
+            not isinstance(manifest, dict)
+            or manifest.get("version") != RenderCache.MANIFEST_VERSION
+        ):
+            return {}
+        return manifest
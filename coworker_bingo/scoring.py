@@ -0,0 +1,240 @@
+import logging
+
+from .bingo_sheet_generator import BingoSheetGenerator
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class Scoreboard:
+    """
+    Live scores of a game of bingo: the number of completed rows, columns and
+    diagonals of every player
+
+    Every line of the sheet is precomputed as a bitmask over the cells (in
+    the row major order of BingoSheetGenerator.Config), and the marked cells
+    of every player are held as a single integer. Marking a cell only checks
+    the 2 to 4 lines through it, so a mark costs O(lines touched) no matter
+    how many players there are. Players are kept in one bucket per score, in
+    the order they reached it, so the leaderboard is always up to date
+    without sorting.
+    """
+
+    def __init__(self, config: BingoSheetGenerator.Config) -> None:
+        """
+        Create an empty scoreboard
+
+        Arguments:
+            config -- Config of the bingo sheets that are played
+        """
+        self.sheet_size = config.sheet_size
+        self.lines = Scoreboard.line_masks(config.sheet_size)
+        # Bitmasks of the lines through every cell
+        self._cell_lines: List[Tuple[int, ...]] = [
+            tuple(mask for mask in self.lines if mask >> cell & 1)
+            for cell in range(config.num_cells)
+        ]
+        self._marks: Dict[str, int] = {}
+        self._scores: Dict[str, int] = {}
+        # Players of every score, in the order they reached it. Dicts are
+        # used as ordered sets
+        self._buckets: List[Dict[str, None]] = [
+            {} for _ in range(len(self.lines) + 1)
+        ]
+        self._max_score = 0
+
+    @staticmethod
+    def line_masks(sheet_size: int) -> List[int]:
+        """
+        Bitmask of the cells of every row, column and diagonal of a sheet
+
+        Arguments:
+            sheet_size -- Number of cells in a row/col the bingo sheet
+
+        Returns:
+            Bitmasks of the rows, then the columns, then the main diagonal
+            and the anti-diagonal
+        """
+        row = (1 << sheet_size) - 1
+        rows = [row << (r * sheet_size) for r in range(sheet_size)]
+        column = sum(1 << (r * sheet_size) for r in range(sheet_size))
+        columns = [column << c for c in range(sheet_size)]
+        diagonal = sum(1 << (i * (sheet_size + 1)) for i in range(sheet_size))
+        anti_diagonal = sum(
+            1 << ((i + 1) * (sheet_size - 1)) for i in range(sheet_size)
+        )
+        return rows + columns + [diagonal, anti_diagonal]
+
+    @property
+    def num_players(self) -> int:
+        """
+        Number of players on the scoreboard
+
+        Returns:
+            Aforementioned quantity
+        """
+        return len(self._scores)
+
+    def add_player(self, player: str, marks: int = 0) -> None:
+        """
+        Add a player, or reset the marks of a player already on the
+        scoreboard
+
+        Arguments:
+            player -- Name of the player, e.g. the name of their sheet
+            marks -- Bitmask of the cells the player has already marked
+        """
+        if player in self._scores:
+            del self._buckets[self._scores[player]][player]
+        marks &= (1 << (self.sheet_size * self.sheet_size)) - 1
+        score = sum(1 for mask in self.lines if marks & mask == mask)
+        self._marks[player] = marks
+        self._set_score(player, score)
+
+    def mark(self, player: str, cell: int) -> Optional[int]:
+        """
+        Mark a cell of a player's sheet. Marking a cell twice has no effect
+
+        Arguments:
+            player -- Name of the player
+            cell -- Index of the cell in row major order
+
+        Returns:
+            Score of the player after the mark. None if the player or cell
+            is unknown
+        """
+        marks = self._marks.get(player)
+        if marks is None or not 0 <= cell < len(self._cell_lines):
+            logging.error(f"Cannot mark cell {cell} of player {player}.")
+            return None
+        bit = 1 << cell
+        score = self._scores[player]
+        if marks & bit:
+            return score
+
+        marks |= bit
+        self._marks[player] = marks
+        completed = 0
+        for mask in self._cell_lines[cell]:
+            if marks & mask == mask:
+                completed += 1
+        if completed > 0:
+            del self._buckets[score][player]
+            score += completed
+            self._set_score(player, score)
+        return score
+
+    def unmark(self, player: str, cell: int) -> Optional[int]:
+        """
+        Remove the mark of a cell of a player's sheet, e.g. one marked by
+        mistake. Unmarking a cell that is not marked has no effect
+
+        Arguments:
+            player -- Name of the player
+            cell -- Index of the cell in row major order
+
+        Returns:
+            Score of the player after removing the mark. None if the player
+            or cell is unknown
+        """
+        marks = self._marks.get(player)
+        if marks is None or not 0 <= cell < len(self._cell_lines):
+            logging.error(f"Cannot unmark cell {cell} of player {player}.")
+            return None
+        bit = 1 << cell
+        score = self._scores[player]
+        if not marks & bit:
+            return score
+
+        broken = 0
+        for mask in self._cell_lines[cell]:
+            if marks & mask == mask:
+                broken += 1
+        self._marks[player] = marks & ~bit
+        if broken > 0:
+            del self._buckets[score][player]
+            score -= broken
+            self._set_score(player, score)
+        return score
+
+    def score(self, player: str) -> Optional[int]:
+        """
+        Number of lines a player has completed
+
+        Arguments:
+            player -- Name of the player
+
+        Returns:
+            Aforementioned quantity. None if the player is unknown
+        """
+        return self._scores.get(player)
+
+    def marks(self, player: str) -> Optional[int]:
+        """
+        Bitmask of the cells a player has marked
+
+        Arguments:
+            player -- Name of the player
+
+        Returns:
+            Aforementioned quantity. None if the player is unknown
+        """
+        return self._marks.get(player)
+
+    def completed_lines(self, player: str) -> List[int]:
+        """
+        Bitmasks of the lines a player has completed
+
+        Arguments:
+            player -- Name of the player
+
+        Returns:
+            Aforementioned quantity. Empty if the player is unknown
+        """
+        marks = self._marks.get(player, 0)
+        return [mask for mask in self.lines if marks & mask == mask]
+
+    def ranking(self) -> Iterator[Tuple[str, int]]:
+        """
+        Players from the highest to the lowest score. Players with the same
+        score are ordered by who reached it first
+
+        Returns:
+            Iterator over the name and score of every player
+        """
+        for score in range(self._max_score, -1, -1):
+            for player in self._buckets[score]:
+                yield (player, score)
+
+    def leaderboard(self, top: int = 10) -> List[Tuple[str, int]]:
+        """
+        Players with the highest scores, see ranking
+
+        Arguments:
+            top -- Maximum number of players to list
+
+        Returns:
+            Name and score of the best players
+        """
+        leaders: List[Tuple[str, int]] = []
+        for score in range(self._max_score, -1, -1):
+            if len(leaders) >= top:
+                break
+            bucket = islice(self._buckets[score], top - len(leaders))
+            leaders.extend((player, score) for player in bucket)
+        return leaders
+
+    def _set_score(self, player: str, score: int) -> None:
+        """
+        Move a player into the bucket of a score. The player must not be in
+        any bucket
+
+        Arguments:
+            player -- Name of the player
+            score -- New score of the player
+        """
+        self._scores[player] = score
+        self._buckets[score][player] = None
+        if score > self._max_score:
+            self._max_score = score
+        while self._max_score > 0 and not self._buckets[self._max_score]:
+            self._max_score -= 1
@@ -34,12 +34,33 @@ Index diagram for 6x6 Bingo Sheet
 # Sheet generation options
 NUMBER_PUZZLE_SETS = 1  # Number of puzzles generated per person
 RANDOM_SEED = 1
+NUMBER_WORKERS = 1  # Number of processes used to draw the bingo sheets
+# Generate, draw and write the sheets in overlapping stages connected by
+# queues of at most QUEUE_DEPTH sheets (opt in, e.g. --pipeline, and only
+# used when OUTPUT_MODE is "files")
+USE_PIPELINE = False
+NUMBER_WRITE_WORKERS = 1  # Number of threads writing the bingo sheets
+QUEUE_DEPTH = 16
+# "random": participants are sampled independently for every sheet.
+# "balanced" (opt in, e.g. --assignment balanced): every participant's facts
+# appear on roughly the same number of sheets
+ASSIGNMENT = "random"
 
 # Uncomment below for 5x5 Bingo Sheets (Comment the other BINGO_SHEET_CONFIG)
 # BINGO_SHEET_CONFIG = BingoSheetGenerator.Config(
 #     sheet_size=5,
 #     specific_fact_indexes= {0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24},
-#     random_seed=RANDOM_SEED)
+#     random_seed=RANDOM_SEED,
+#     assignment=ASSIGNMENT)
+
+# For other sheet sizes, SpecificLayout.search spreads a number of specific
+# facts as evenly as possible over the rows, columns and diagonals, e.g. 32
+# of the 64 cells of an 8x8 sheet (import it from coworker_bingo)
+# BINGO_SHEET_CONFIG = BingoSheetGenerator.Config(
+#     sheet_size=8,
+#     specific_fact_indexes=SpecificLayout.search(sheet_size=8, count=32),
+#     random_seed=RANDOM_SEED,
+#     assignment=ASSIGNMENT)
 
 # Uncomment below for 6x6 Bingo Sheets (Comment the other BINGO_SHEET_CONFIG)
 BINGO_SHEET_CONFIG = BingoSheetGenerator.Config(
@@ -51,6 +72,7 @@ BINGO_SHEET_CONFIG = BingoSheetGenerator.Config(
         26,28,30,33,35,
     },
     random_seed=RANDOM_SEED,
+    assignment=ASSIGNMENT,
 )  # fmt: skip
 
 # Input data location
@@ -63,6 +85,9 @@ GENERIC_FACTS_FILE_PATH = INPUT_FOLDER / "generic_facts.txt"
 # Output data location
 OUTPUT_FOLDER_NAME = "generated_sheets"
 OUTPUT_DATA_PATH = GIT_ROOT_DIRECTORY / OUTPUT_FOLDER_NAME
+# Only render the sheets whose facts, title or appearance changed since the
+# last run and reuse the existing files for the rest (opt in, e.g. --cache)
+USE_CACHE = False
 
 # Specific facts csv info
 NAME_COL = "Name"
@@ -70,6 +95,22 @@ NAME_COL = "Name"
 # Output/Appearance options
 OUTPUT_EXTENSION = "pdf"  # Can be pdf/png/jpg
 
+# "files" saves one file per sheet. "document" streams all sheets into
+# multi-page pdf document(s) with an index page and bookmarks per participant
+# (requires OUTPUT_EXTENSION pdf and the "pdf" backend)
+OUTPUT_MODE = "files"
+SHEETS_PER_DOCUMENT = 0  # Max sheets per document, 0 for a single document
+
+# Measure the facts before drawing and adjust cell_font_size, cell_height
+# and fig_size so that no fact overflows out of its cell (opt in, e.g.
+# --auto-fit, and only for the "pdf" backend)
+AUTO_FIT_LAYOUT = False
+
+# Swap generic facts between the sheets of a set so that any two sheets
+# share as few facts as possible. Not supported by sharded runs and serve,
+# since a sheet then depends on all other sheets
+OPTIMIZE_DIVERSITY = False
+
 SHEET_DRAWER_CONFIG = SheetDrawer.Config(
     title_font="Arial",
     title_font_size=18,
@@ -79,4 +120,7 @@ SHEET_DRAWER_CONFIG = SheetDrawer.Config(
     fig_size=(750, 750),
     # Increase accordingly if only a portion of the table is rendered
     # in the drawn sheet
+    backend="df2img",
+    # Use "pdf" to write PDF files directly, which is much faster than
+    # exporting through df2img/plotly (only supports OUTPUT_EXTENSION pdf)
 )
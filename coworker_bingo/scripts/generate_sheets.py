@@ -1,36 +1,696 @@
+import argparse
+import cProfile
+import dataclasses
 import logging
 import sys
 
-from coworker_bingo import BingoSheetGenerator, InputFilesReader, SheetDrawer
+from coworker_bingo import (
+    BingoSheetGenerator,
+    FactTable,
+    InputFilesReader,
+    SheetDrawer,
+)
+from coworker_bingo.instrumentation import Instrumentation
+from coworker_bingo.render_cache import RenderCache
+from coworker_bingo.validation import Validator
+from coworker_bingo.scripts.run_config import RunConfig
+from pathlib import Path
 from progress.bar import Bar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-import coworker_bingo.scripts.config as cfg
+# The modules of the subcommands and of optional stages are imported where
+# they are used, so that starting the script does not load them (and
+# http.server)
+if TYPE_CHECKING:
+    from coworker_bingo.server import SheetServer
+    from coworker_bingo.shard import Shard
 
 
-def main() -> int:
-    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    Parse the command line arguments of the generation script
+
+    Every setting defaults to None, which keeps the value of the config file
+    (if given) or scripts/config.py
 
-    generic_facts = InputFilesReader.read_generic_facts(
-        txt_file_path=cfg.GENERIC_FACTS_FILE_PATH
+    Arguments:
+        argv -- Command line arguments. None to use sys.argv
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate co-worker bingo sheets"
+    )
+    add_run_arguments(parser)
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="REPORT_JSON",
+        help="Write the duration of every stage, the peak memory use and "
+        "tracemalloc snapshots of the run to a JSON report",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        metavar="PROF_FILE",
+        help="Write cProfile statistics of the run (e.g. for snakeviz)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        metavar="K/N",
+        help="Only generate and draw the K-th of N disjoint parts of the "
+        "sheets, saved in a shard folder of the output folder. Run "
+        "'generate_coworker_bingo_sheets merge' once all shards are done",
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="Only check the input files and config, do not generate sheets",
+    )
+    return parser.parse_args(argv)
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the flags that replace the settings of a run (see load_run_config)
+
+    Arguments:
+        parser -- Parser to add the flags to
+    """
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="TOML or JSON file with settings that replace the ones in "
+        "scripts/config.py. Command line flags replace both",
+    )
+    parser.add_argument(
+        "--generic-facts",
+        type=Path,
+        help="Location of the generic facts txt file",
+    )
+    parser.add_argument(
+        "--specific-facts",
+        type=Path,
+        help="Location of the specific facts csv file",
+    )
+    parser.add_argument(
+        "--name-col",
+        help="Column of the specific facts csv file with the names",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="Folder the bingo sheets are saved to",
+    )
+    parser.add_argument(
+        "--sets",
+        type=int,
+        help="Number of puzzles generated per person",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed")
+    parser.add_argument(
+        "--sheet-size",
+        type=int,
+        help="Number of cells in a row/col of the bingo sheet. Uses a "
+        "checkerboard of specific fact cells unless --specific-cells or "
+        "--specific-count is given",
+    )
+    specific_cells = parser.add_mutually_exclusive_group()
+    specific_cells.add_argument(
+        "--specific-cells",
+        type=_parse_indexes,
+        help="Comma separated indexes of the cells with specific facts, "
+        "e.g. 0,2,4",
+    )
+    specific_cells.add_argument(
+        "--specific-count",
+        type=int,
+        help="Number of cells with specific facts, spread as evenly as "
+        "possible over the rows, columns and diagonals",
+    )
+    parser.add_argument(
+        "--assignment",
+        choices=BingoSheetGenerator.Config.SUPPORTED_ASSIGNMENTS,
+        help="How participants are assigned to the sheets of others. "
+        "'balanced' spreads every participant's facts evenly over the sheets",
+    )
+    parser.add_argument(
+        "--extension",
+        choices=sorted(
+            ext.lstrip(".") for ext in SheetDrawer.SUPPORTED_EXPORT_FORMATS
+        ),
+        help="File format of the bingo sheets",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(SheetDrawer.SUPPORTED_BACKENDS),
+        help="Rendering backend of the bingo sheets",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=RunConfig.SUPPORTED_OUTPUT_MODES,
+        help="One file per sheet or multi-page pdf documents",
+    )
+    parser.add_argument(
+        "--sheets-per-document",
+        type=int,
+        help="Max sheets per document, 0 for a single document",
+    )
+    parser.add_argument(
+        "--auto-fit",
+        action=argparse.BooleanOptionalAction,
+        help="Fit the font size and cell height to the facts",
+    )
+    parser.add_argument(
+        "--diversify",
+        action=argparse.BooleanOptionalAction,
+        help="Swap generic facts so that any two sheets of a set share as "
+        "few facts as possible (not supported with --shard)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of processes used to draw the bingo sheets",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action=argparse.BooleanOptionalAction,
+        help="Overlap generating, drawing and writing the bingo sheets",
+    )
+    parser.add_argument(
+        "--write-workers",
+        type=int,
+        help="Number of threads writing the bingo sheets (pipeline only)",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        help="Maximum number of bingo sheets queued between the stages "
+        "(pipeline only)",
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        help="Reuse the bingo sheets that are up to date (--no-cache to "
+        "render every sheet)",
+    )
+
+
+def load_run_config(args: argparse.Namespace) -> Optional[RunConfig]:
+    """
+    Combine the settings of scripts/config.py, the config file and the
+    command line flags (in increasing priority)
+
+    Arguments:
+        args -- Parsed command line arguments
+
+    Returns:
+        Settings of the run, None if a setting is invalid
+    """
+    run = RunConfig.from_config_module()
+
+    if args.config is not None:
+        values = RunConfig.load_file(file_path=args.config)
+        if values is None:
+            return None
+        run = run.with_overrides(
+            values=values, base_path=args.config.resolve().parent
+        )
+        if run is None:
+            return None
+
+    flags = {
+        "generic_facts_file_path": args.generic_facts,
+        "specific_facts_file_path": args.specific_facts,
+        "name_col": args.name_col,
+        "output_data_path": args.output_dir,
+        "number_puzzle_sets": args.sets,
+        "output_extension": args.extension,
+        "output_mode": args.output_mode,
+        "sheets_per_document": args.sheets_per_document,
+        "auto_fit_layout": args.auto_fit,
+        "optimize_diversity": args.diversify,
+        "use_cache": args.cache,
+        "use_pipeline": args.pipeline,
+        "number_workers": args.workers,
+        "number_write_workers": args.write_workers,
+        "queue_depth": args.queue_depth,
+    }
+    sheet_flags = {
+        "sheet_size": args.sheet_size,
+        "specific_fact_indexes": args.specific_cells,
+        RunConfig.SPECIFIC_COUNT_KEY: args.specific_count,
+        "random_seed": args.seed,
+        "assignment": args.assignment,
+    }
+    drawer_flags = {"backend": args.backend}
+    values: Dict[str, Any] = {
+        key: value for key, value in flags.items() if value is not None
+    }
+    values[RunConfig.SHEET_SECTION] = {
+        key: value for key, value in sheet_flags.items() if value is not None
+    }
+    values[RunConfig.DRAWER_SECTION] = {
+        key: value for key, value in drawer_flags.items() if value is not None
+    }
+    return run.with_overrides(values=values)
+
+
+def _parse_indexes(text: str) -> Set[int]:
+    """
+    Parse comma separated cell indexes
+
+    Arguments:
+        text -- Comma separated integers, e.g. "0,2,4"
+
+    Returns:
+        Cell indexes
+    """
+    try:
+        return {int(idx) for idx in text.split(",") if idx.strip()}
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Expected comma separated integers, got {text!r}"
+        )
+
+
+def parse_merge_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse the command line arguments of the merge subcommand
+
+    Arguments:
+        argv -- Command line arguments after "merge"
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="generate_coworker_bingo_sheets merge",
+        description="Check the manifests of the shards of a sharded run and "
+        "assemble their bingo sheets in the output folder",
+    )
+    parser.add_argument(
+        "shard_dirs",
+        type=Path,
+        nargs="*",
+        help="Output folders of the shards. Defaults to the shard folders "
+        "in the output folder",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="Folder the combined bingo sheets are saved to. Defaults to "
+        "the output folder of scripts/config.py",
+    )
+    return parser.parse_args(argv)
+
+
+def _parse_shard(text: str) -> "Shard":
+    """
+    Parse a shard given as K/N
+
+    Arguments:
+        text -- Shard number and number of shards, e.g. "2/4"
+
+    Returns:
+        Parsed shard
+    """
+    from coworker_bingo.shard import Shard
+
+    shard = Shard.parse(text)
+    if shard is None:
+        raise argparse.ArgumentTypeError(
+            f"Expected K/N with 1 <= K <= N, got {text!r}"
+        )
+    return shard
+
+
+def merge(argv: List[str]) -> int:
+    """
+    Merge the output of the shards of a sharded run
+
+    Arguments:
+        argv -- Command line arguments after "merge"
+
+    Returns:
+        Exit code of the script
+    """
+    from coworker_bingo.shard import Shard
+
+    args = parse_merge_args(argv)
+    output_dir = args.output_dir
+    if output_dir is None:
+        output_dir = RunConfig.from_config_module().output_data_path
+    shard_dirs = args.shard_dirs or Shard.find_folders(output_dir)
+    if not Shard.merge(shard_folders=shard_dirs, output_folder=output_dir):
+        logging.error("Failed to merge the shards. Exiting.")
+        return 1
+    return 0
+
+
+def parse_serve_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse the command line arguments of the serve subcommand
+
+    Arguments:
+        argv -- Command line arguments after "serve"
+
+    Returns:
+        Parsed arguments
+    """
+    from coworker_bingo.server import SheetServer
+
+    parser = argparse.ArgumentParser(
+        prog="generate_coworker_bingo_sheets serve",
+        description="Serve the bingo sheets over HTTP, generating and "
+        "drawing every sheet when it is first requested",
+    )
+    add_run_arguments(parser)
+    parser.add_argument(
+        "--host",
+        default=SheetServer.Config.host,
+        help="Address to listen on (default: %(default)s, only this "
+        "machine). Use 0.0.0.0 to serve the local network",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=SheetServer.Config.port,
+        help="Port to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=SheetServer.Config.cache_bytes / 2**20,
+        help="Memory for drawn sheets in MiB (default: %(default)s)",
+    )
+    return parser.parse_args(argv)
+
+
+def create_server(args: argparse.Namespace) -> Optional["SheetServer"]:
+    """
+    Read the input files of a run and prepare a server for its bingo sheets
+
+    Arguments:
+        args -- Parsed arguments of the serve subcommand
+
+    Returns:
+        Server that is ready to start. None if the settings or input files
+        are invalid
+    """
+    from coworker_bingo.server import SheetServer
+
+    run = load_run_config(args)
+    if run is None or not run.is_valid():
+        logging.error("Invalid settings. Exiting.")
+        return None
+    if run.optimize_diversity:
+        logging.warning(
+            "Served sheets are generated one at a time and are not "
+            "optimized for diversity."
+        )
+
+    inputs = load_inputs(run)
+    if inputs is None:
+        return None
+    participants, fact_table = inputs
+
+    drawer_config = run.sheet_drawer_config
+    if run.auto_fit_layout:
+        drawer_config = SheetDrawer.fit_config(
+            config=drawer_config,
+            facts=fact_table.facts,
+            sheet_size=run.bingo_sheet_config.sheet_size,
+        )
+    return SheetServer(
+        config=SheetServer.Config(
+            host=args.host,
+            port=args.port,
+            cache_bytes=int(args.cache_mb * 2**20),
+            num_sets=run.number_puzzle_sets,
+            extension=run.output_extension,
+        ),
+        bingo_config=run.bingo_sheet_config,
+        drawer_config=drawer_config,
+        participants=sorted(participants),
+        fact_table=fact_table,
+    )
+
+
+def serve(argv: List[str]) -> int:
+    """
+    Serve the bingo sheets of a run over HTTP until interrupted
+
+    Arguments:
+        argv -- Command line arguments after "serve"
+
+    Returns:
+        Exit code of the script
+    """
+    args = parse_serve_args(argv)
+    server = create_server(args)
+    if server is None:
+        return 1
+    try:
+        server.start()
+    except OSError as e:
+        logging.error(f"Failed to listen on {args.host}:{args.port}: {e}")
+        server.close()
+        return 1
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        logging.info("Stopping the server.")
+    finally:
+        server.close()
+    return 0
+
+
+def parse_simulate_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse the command line arguments of the simulate subcommand
+
+    Arguments:
+        argv -- Command line arguments after "simulate"
+
+    Returns:
+        Parsed arguments
+    """
+    from coworker_bingo.simulation import GameSimulator
+
+    defaults = GameSimulator.Config()
+    parser = argparse.ArgumentParser(
+        prog="generate_coworker_bingo_sheets simulate",
+        description="Simulate games played with the bingo sheets of a run "
+        "and report how long it takes to complete a line and how many lines "
+        "players complete",
+    )
+    add_run_arguments(parser)
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=defaults.num_games,
+        help="Number of simulated games (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--game-minutes",
+        type=float,
+        default=defaults.game_minutes,
+        help="Length of a game (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--conversation-minutes",
+        type=float,
+        default=defaults.conversation_minutes,
+        help="Time a player talks to every participant (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--generic-match",
+        type=float,
+        default=defaults.generic_match,
+        help="Probability that a generic fact applies to a participant "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--specific-match",
+        type=float,
+        default=defaults.specific_match,
+        help="Probability that a player talks to the owner of a specific "
+        "fact in a conversation (default: one over the number of other "
+        "participants)",
+    )
+    parser.add_argument(
+        "--absent-fraction",
+        type=float,
+        default=defaults.absent_fraction,
+        help="Probability that the owner of a specific fact misses a game "
+        "(default: %(default)s)",
     )
+    return parser.parse_args(argv)
+
+
+def simulate(argv: List[str]) -> int:
+    """
+    Generate the bingo sheets of a run and simulate games played with them
+
+    Arguments:
+        argv -- Command line arguments after "simulate"
+
+    Returns:
+        Exit code of the script
+    """
+    from coworker_bingo.diversity import DiversityOptimizer
+    from coworker_bingo.simulation import GameSimulator
+
+    args = parse_simulate_args(argv)
+    run = load_run_config(args)
+    if run is None or not run.is_valid():
+        logging.error("Invalid settings. Exiting.")
+        return 1
+    simulation_config = GameSimulator.Config(
+        num_games=args.games,
+        game_minutes=args.game_minutes,
+        conversation_minutes=args.conversation_minutes,
+        generic_match=args.generic_match,
+        specific_match=args.specific_match,
+        absent_fraction=args.absent_fraction,
+        seed=run.bingo_sheet_config.random_seed,
+    )
+    if not simulation_config.is_valid():
+        logging.error("Invalid simulation settings. Exiting.")
+        return 1
+
+    inputs = load_inputs(run)
+    if inputs is None:
+        return 1
+    participants, fact_table = inputs
+
+    batch = BingoSheetGenerator.generate_batch(
+        participants=sorted(participants),
+        config=run.bingo_sheet_config,
+        data=fact_table,
+        num_sets=run.number_puzzle_sets,
+    )
+    if batch is None:
+        logging.error("Failed to generate bingo sheets. Exiting.")
+        return 1
+    if run.optimize_diversity:
+        DiversityOptimizer.optimize(
+            batch=batch, config=run.bingo_sheet_config, fact_table=fact_table
+        )
+
+    result = GameSimulator.simulate(
+        batch=batch,
+        config=run.bingo_sheet_config,
+        simulation_config=simulation_config,
+    )
+    for line in result.summary():
+        logging.info(line)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) > 0 and argv[0] == "merge":
+        return merge(argv[1:])
+    if len(argv) > 0 and argv[0] == "serve":
+        return serve(argv[1:])
+    if len(argv) > 0 and argv[0] == "simulate":
+        return simulate(argv[1:])
+
+    args = parse_args(argv)
+
+    run = load_run_config(args)
+    if run is None or not run.is_valid():
+        logging.error("Invalid settings. Exiting.")
+        return 1
+
+    if args.profile is None and args.cprofile is None:
+        return generate(
+            run=run, validate_only=args.validate_only, shard=args.shard
+        )
+
+    # Profile the run: stage timers and memory snapshots are written to the
+    # JSON report, cProfile statistics to a separate dump
+    profiler: Optional[cProfile.Profile] = None
+    if args.cprofile is not None:
+        profiler = cProfile.Profile()
+    Instrumentation.start(trace_memory=args.profile is not None)
+    try:
+        if profiler is not None:
+            profiler.enable()
+        return_code = generate(
+            run=run, validate_only=args.validate_only, shard=args.shard
+        )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        Instrumentation.snapshot("end")
+        Instrumentation.stop()
+
+    if args.profile is not None:
+        if not Instrumentation.write_report(report_path=args.profile):
+            return_code = 1
+        else:
+            logging.info(f"Profile report saved to {args.profile}")
+    if profiler is not None:
+        profiler.dump_stats(str(args.cprofile))
+        logging.info(f"cProfile statistics saved to {args.cprofile}")
+    return return_code
+
+
+def load_inputs(run: RunConfig) -> Optional[Tuple[Set[str], FactTable]]:
+    """
+    Read the input files of a run, intern their facts and check them
+    against the config
+
+    Arguments:
+        run -- Settings of the run
+
+    Returns:
+        A tuple where the first element holds the names of the participants
+        and the second element the interned facts. None if the input files
+        cannot be read or are invalid
+    """
+    with Instrumentation.stage("read_generic_facts"):
+        generic_facts = InputFilesReader.read_generic_facts(
+            txt_file_path=run.generic_facts_file_path
+        )
 
     if generic_facts is None:
         logging.error("Failed to load generic facts file. Exiting.")
-        return 1
+        return None
 
     logging.info(f"Loaded {len(generic_facts)} generic facts.")
 
-    specific_facts_read_result = (
-        InputFilesReader.read_participant_names_and_specific_facts(
-            csv_file_path=cfg.SPECIFIC_FACTS_FILE_PATH, name_col=cfg.NAME_COL
+    with Instrumentation.stage("read_specific_facts"):
+        specific_facts_read_result = (
+            InputFilesReader.read_participant_names_and_specific_facts(
+                csv_file_path=run.specific_facts_file_path,
+                name_col=run.name_col,
+                streaming=True,
+            )
         )
-    )
 
     if specific_facts_read_result is None:
         logging.error(
             "Failed to load participant names and specific facts. Exiting."
         )
-        return 1
+        return None
 
     participants, specific_facts = specific_facts_read_result
 
@@ -44,56 +704,345 @@ def main() -> int:
         generic_facts=generic_facts, specific_facts=specific_facts
     )
 
-    if not BingoSheetGenerator.check_config_and_data(
-        config=cfg.BINGO_SHEET_CONFIG, data=bingo_generator_data
-    ):
+    with Instrumentation.stage("intern_facts"):
+        fact_table = FactTable.from_input_files(
+            generic_facts=generic_facts, specific_facts=specific_facts
+        )
+    logging.info(f"Interned {len(fact_table.facts)} unique facts.")
+
+    with Instrumentation.stage("validate"):
+        is_valid = BingoSheetGenerator.check_config_and_data(
+            config=run.bingo_sheet_config,
+            data=bingo_generator_data,
+            participants=participants,
+            fact_table=fact_table,
+        )
+    Instrumentation.snapshot("read_and_validate")
+
+    if not is_valid:
         logging.error("Bingo config and data is invalid. Exiting.")
+        return None
+
+    return (participants, fact_table)
+
+
+def generate(
+    run: RunConfig,
+    validate_only: bool = False,
+    shard: Optional["Shard"] = None,
+) -> int:
+    """
+    Generate and draw the bingo sheets of a run
+
+    Arguments:
+        run -- Settings of the run
+        validate_only -- Only check the input files and config
+        shard -- Only generate and draw the sheets of this shard, into its
+        folder in the output folder. None for all sheets
+
+    Returns:
+        Exit code of the script
+    """
+    from coworker_bingo.diversity import DiversityOptimizer
+    from coworker_bingo.pipeline import SheetPipeline
+    from coworker_bingo.shard import Shard
+
+    inputs = load_inputs(run)
+    if inputs is None:
+        return 1
+    participants, fact_table = inputs
+
+    if validate_only:
+        logging.info("Bingo config and data is valid.")
+        return 0
+
+    if run.optimize_diversity and shard is not None:
+        logging.error(
+            "Optimized sheets depend on each other and cannot be generated "
+            "in shards. Run without --shard or with --no-diversify. Exiting."
+        )
         return 1
 
+    pipeline_config = SheetPipeline.Config(
+        render_workers=run.number_workers,
+        write_workers=run.number_write_workers,
+        queue_depth=run.queue_depth,
+    )
+    pipeline_stats: Optional[SheetPipeline.Stats] = None
+    if run.use_pipeline and run.output_mode == "files":
+        if not pipeline_config.is_valid():
+            logging.error(
+                "Number of workers and queue depth must be at least 1. "
+                "Exiting."
+            )
+            return 1
+        pipeline_stats = SheetPipeline.Stats()
+
+    output_folder = run.output_data_path
+    if shard is not None:
+        output_folder = output_folder / shard.folder_name
+    output_folder.mkdir(parents=True, exist_ok=True)
+    shard_manifest_path = output_folder / Shard.MANIFEST_NAME
+
     participants_list_alphabetical = list(participants)
     participants_list_alphabetical.sort()
 
-    total_number_sheets = len(participants) * cfg.NUMBER_PUZZLE_SETS
+    # The participants depend on the name column as well as the input files
+    cache = RenderCache(
+        folder=output_folder,
+        input_hash=RenderCache.hash_files(
+            [run.generic_facts_file_path, run.specific_facts_file_path]
+        ),
+        config_hash=RenderCache.hash_config(
+            run.name_col,
+            participants_list_alphabetical,
+            run.bingo_sheet_config,
+            run.sheet_drawer_config,
+            run.number_puzzle_sets,
+            run.output_extension,
+            run.output_mode,
+            run.sheets_per_document,
+            run.auto_fit_layout,
+            run.optimize_diversity,
+        ),
+        seed=run.bingo_sheet_config.random_seed,
+    )
+
+    if (
+        run.use_cache
+        and cache.is_unchanged()
+        and (shard is None or shard_manifest_path.is_file())
+    ):
+        cache.reuse_all()
+        cache.save()
+        logging.info(
+            "Input files and config are unchanged since the last run, "
+            f"reusing the bingo sheets in {output_folder}"
+        )
+        return 0
+    # The manifest of a shard is only written once all its sheets are drawn
+    shard_manifest_path.unlink(missing_ok=True)
+
+    participant_indexes = range(len(participants_list_alphabetical))
+    if shard is not None:
+        participant_indexes = shard.participant_indexes(
+            num_participants=len(participants_list_alphabetical)
+        )
+        logging.info(f"Generating shard {shard.index} of {shard.count}")
+
+    total_number_sheets = len(participant_indexes) * run.number_puzzle_sets
     progress_bar = Bar("Generating Bingo Sheets", max=total_number_sheets)
 
     logging.info(
-        f"Generating bingo sheets for {len(participants)} participants "
-        f"({cfg.NUMBER_PUZZLE_SETS} each)"
+        f"Generating bingo sheets for {len(participant_indexes)} "
+        f"participants ({run.number_puzzle_sets} each)"
     )
     logging.info(f"Total sheets: {total_number_sheets}")
 
-    for i in range(1, cfg.NUMBER_PUZZLE_SETS + 1):
-        for participant_name in participants_list_alphabetical:
-            sheet = BingoSheetGenerator.generate(
-                participant_name=participant_name,
-                config=cfg.BINGO_SHEET_CONFIG,
-                data=bingo_generator_data,
-            )
-            sheet_size = cfg.BINGO_SHEET_CONFIG.sheet_size
-            stem = (
-                f"bingo_sheet_{participant_name}_{sheet_size}x{sheet_size}_{i}"
+    with Instrumentation.stage("generate_batch"):
+        batch = BingoSheetGenerator.generate_batch(
+            participants=participants_list_alphabetical,
+            config=run.bingo_sheet_config,
+            data=fact_table,
+            num_sets=run.number_puzzle_sets,
+            participant_indexes=None if shard is None else participant_indexes,
+        )
+    Instrumentation.snapshot("generate")
+
+    if batch is None:
+        logging.error("Failed to generate bingo sheets. Exiting.")
+        return 1
+
+    if run.optimize_diversity:
+        with Instrumentation.stage("diversify"):
+            result = DiversityOptimizer.optimize(
+                batch=batch,
+                config=run.bingo_sheet_config,
+                fact_table=fact_table,
             )
-            export_path = (
-                cfg.OUTPUT_DATA_PATH / f"{stem}.{cfg.OUTPUT_EXTENSION}"
+        logging.info(
+            f"Facts shared by two sheets: {result.before.summary()} before, "
+            f"{result.after.summary()} after {result.num_swaps} swaps"
+        )
+
+    with Instrumentation.stage("verify"):
+        report = Validator.verify_batch(
+            batch=batch, config=run.bingo_sheet_config, fact_table=fact_table
+        )
+    report.log()
+    if not report.is_valid:
+        logging.error("Generated bingo sheets are invalid. Exiting.")
+        return 1
+
+    stats = batch.appearance_stats()
+    logging.info(
+        "Appearances of participants on other participants' sheets: "
+        f"min {stats.min}, max {stats.max}, mean {stats.mean:.2f}, "
+        f"stddev {stats.stddev:.2f}"
+    )
+
+    drawer_config = run.sheet_drawer_config
+    if run.auto_fit_layout:
+        with Instrumentation.stage("fit_layout"):
+            drawer_config = SheetDrawer.fit_config(
+                config=drawer_config,
+                facts=fact_table.facts,
+                sheet_size=run.bingo_sheet_config.sheet_size,
             )
-            title = f"{stem} ---- Participant name: {participant_name}"
-            if not SheetDrawer.draw_table(
-                sheet=sheet,
-                config=cfg.SHEET_DRAWER_CONFIG,
-                export_path=export_path,
-                title=title,
+
+    # Hash of every sheet that is drawn, by export path. Sheets whose file
+    # is up to date are skipped in files mode, documents are always redrawn
+    sheet_hashes: Dict[Path, str] = {}
+    render_key = RenderCache.hash_config(drawer_config, run.output_extension)
+    use_cache = run.use_cache and run.output_mode == "files"
+    sheet_size = run.bingo_sheet_config.sheet_size
+    document_name = f"bingo_sheets_{sheet_size}x{sheet_size}.pdf"
+    # Position in the full run and export path of every sheet of a shard
+    shard_sheets: List[Tuple[int, Path]] = []
+
+    def jobs() -> Iterator[SheetDrawer.Job]:
+        for i in range(1, run.number_puzzle_sets + 1):
+            for participant_idx, participant_name in enumerate(
+                batch.participants
             ):
-                logging.error(
-                    f"Failed to save bingo sheet to {export_path}. Exiting."
+                stem = (
+                    f"bingo_sheet_{participant_name}_"
+                    f"{sheet_size}x{sheet_size}_{i}"
+                )
+                title = f"{stem} ---- Participant name: {participant_name}"
+                with Instrumentation.stage("build_sheet"):
+                    sheet = batch.sheet(
+                        participant_idx=participant_idx, set_idx=i - 1
+                    )
+                    sheet_hash = RenderCache.hash_sheet(
+                        cells=sheet.cells, title=title, render_key=render_key
+                    )
+                export_path = output_folder / f"{stem}.{run.output_extension}"
+                if shard is not None:
+                    sheet_id = Shard.sheet_id(
+                        participant_idx=participant_indexes[participant_idx],
+                        set_idx=i - 1,
+                        num_participants=len(participants_list_alphabetical),
+                    )
+                    shard_sheets.append((sheet_id, export_path))
+                if use_cache and cache.is_fresh(export_path, sheet_hash):
+                    progress_bar.next()
+                    continue
+                sheet_hashes[export_path] = sheet_hash
+                yield SheetDrawer.Job(
+                    sheet=sheet,
+                    export_path=export_path,
+                    title=title,
+                    bookmark=participant_name,
                 )
-                return 1
 
-            progress_bar.next()
+    if run.output_mode == "document" and shard is not None:
+        # The pages of all shards are assembled into documents by merge
+        results = SheetDrawer.write_pages(
+            jobs=jobs(),
+            config=drawer_config,
+            pages_path=output_folder / Shard.PAGES_NAME,
+        )
+    elif run.output_mode == "document":
+        results = SheetDrawer.draw_document(
+            jobs=jobs(),
+            config=drawer_config,
+            export_path=output_folder / document_name,
+            sheets_per_document=run.sheets_per_document,
+        )
+    elif run.use_pipeline:
+        results = SheetPipeline.run(
+            jobs=jobs(),
+            drawer_config=drawer_config,
+            config=pipeline_config,
+            stats=pipeline_stats,
+        )
+    else:
+        results = SheetDrawer.draw_many(
+            jobs=jobs(), config=drawer_config, workers=run.number_workers
+        )
+
+    failed_results = []
+    drawn_paths: Set[Path] = set()
+    for result in results:
+        if not result.success:
+            failed_results.append(result)
+        drawn_paths.add(result.export_path)
+        if pipeline_stats is not None:
+            progress_bar.suffix = (
+                f"%(index)d/%(max)d {pipeline_stats.summary()}"
+            )
+        progress_bar.next()
 
     print("")  # Flush new text to next line after printing progress bar
+    Instrumentation.snapshot("draw")
+
+    failed_paths = {result.export_path for result in failed_results}
+    for export_path in drawn_paths - failed_paths:
+        cache.update(
+            export_path, sheet_hashes.get(export_path, cache.config_hash)
+        )
+    if len(failed_results) == 0:
+        # Sheets of participants that are gone or of other settings
+        num_removed = cache.remove_stale()
+        if num_removed > 0:
+            logging.info(
+                f"Removed {num_removed} outdated bingo sheets of the previous "
+                "run."
+            )
+    cache.save()
+
+    num_reused = total_number_sheets - len(sheet_hashes)
+    if num_reused > 0:
+        logging.info(f"Reused {num_reused} up to date bingo sheets.")
+
+    if len(failed_results) > 0:
+        for result in failed_results:
+            logging.error(
+                f"Failed to save bingo sheet to {result.export_path}: "
+                f"{result.error}"
+            )
+        logging.error(
+            f"{len(failed_results)} of {total_number_sheets} bingo sheets "
+            "could not be saved."
+        )
+        return 1
+
+    if shard is not None:
+        values: Dict[str, Any] = {
+            "input_hash": cache.input_hash,
+            "config_hash": cache.config_hash,
+            "seed": cache.seed,
+            "num_participants": len(participants_list_alphabetical),
+            "num_sets": run.number_puzzle_sets,
+            "output_mode": run.output_mode,
+            "sheets_per_document": run.sheets_per_document,
+            "document_name": document_name,
+            "drawer_config": dataclasses.asdict(drawer_config),
+        }
+        if run.output_mode == "document":
+            values["sheets"] = [sheet_id for sheet_id, _ in shard_sheets]
+            values["pages_sha256"] = Shard.file_digest(
+                output_folder / Shard.PAGES_NAME
+            )
+        else:
+            values["files"] = [
+                {
+                    "name": export_path.name,
+                    "sheet": sheet_id,
+                    "sha256": Shard.file_digest(export_path),
+                }
+                for sheet_id, export_path in shard_sheets
+            ]
+        shard.write_manifest(folder=output_folder, values=values)
+        logging.info(
+            f"Shard {shard.index} of {shard.count} complete. Run "
+            "'generate_coworker_bingo_sheets merge' once all shards are done"
+        )
+
     logging.info(
         "Co-worker bingo sheet generation complete, "
-        f"output files can be found in {cfg.OUTPUT_DATA_PATH}"
+        f"output files can be found in {output_folder}"
     )
     return 0
 
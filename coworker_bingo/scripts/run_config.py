@@ -0,0 +1,380 @@
+import dataclasses
+import json
+import logging
+import typing
+
+from coworker_bingo import BingoSheetGenerator, SheetDrawer, SpecificLayout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Mapping, Optional, Set, Tuple
+
+import coworker_bingo.scripts.config as cfg
+
+
+@dataclass
+class RunConfig:
+    """
+    Settings of a generation run. The defaults are the constants in
+    scripts/config.py, which can be overridden by a config file and command
+    line flags so that differently configured runs do not need to edit the
+    installed package
+
+    Attributes:
+        number_puzzle_sets: Number of puzzles generated per person
+        bingo_sheet_config: Config of the bingo sheet generator
+        sheet_drawer_config: Config of the sheet drawer
+        generic_facts_file_path: Location of the generic facts txt file
+        specific_facts_file_path: Location of the specific facts csv file
+        name_col: Column of the specific facts csv file with the names
+        output_data_path: Folder the bingo sheets are saved to
+        output_extension: Extension of the saved files (pdf/png/jpg)
+        output_mode: "files" for one file per sheet, "document" for
+        multi-page pdf documents
+        sheets_per_document: Max sheets per document, 0 for a single document
+        auto_fit_layout: Whether to fit the sheet layout to the facts
+        optimize_diversity: Whether to minimize the facts shared by sheets
+        use_cache: Whether to reuse up to date sheets of the previous run
+        use_pipeline: Whether to generate, draw and write in overlapping
+        stages
+        number_workers: Number of processes used to draw the bingo sheets
+        number_write_workers: Number of threads writing the bingo sheets
+        queue_depth: Max number of sheets queued between pipeline stages
+    """
+
+    number_puzzle_sets: int
+    bingo_sheet_config: BingoSheetGenerator.Config
+    sheet_drawer_config: SheetDrawer.Config
+    generic_facts_file_path: Path
+    specific_facts_file_path: Path
+    name_col: str
+    output_data_path: Path
+    output_extension: str
+    output_mode: str
+    sheets_per_document: int
+    auto_fit_layout: bool
+    optimize_diversity: bool
+    use_cache: bool
+    use_pipeline: bool
+    number_workers: int
+    number_write_workers: int
+    queue_depth: int
+
+    # Tables of a config file that hold the fields of the generator and
+    # drawer configs. All other keys are fields of RunConfig
+    SHEET_SECTION: ClassVar[str] = "sheet"
+    DRAWER_SECTION: ClassVar[str] = "drawer"
+
+    # Key of the sheet table of a config file with the number of specific
+    # fact cells, placed by SpecificLayout instead of specific_fact_indexes
+    SPECIFIC_COUNT_KEY: ClassVar[str] = "specific_fact_count"
+
+    SUPPORTED_OUTPUT_MODES: ClassVar[Tuple[str, ...]] = ("files", "document")
+
+    @staticmethod
+    def from_config_module() -> "RunConfig":
+        """
+        Create the settings from the constants in scripts/config.py
+
+        Returns:
+            Default settings of a run
+        """
+        return RunConfig(
+            number_puzzle_sets=cfg.NUMBER_PUZZLE_SETS,
+            bingo_sheet_config=cfg.BINGO_SHEET_CONFIG,
+            sheet_drawer_config=cfg.SHEET_DRAWER_CONFIG,
+            generic_facts_file_path=cfg.GENERIC_FACTS_FILE_PATH,
+            specific_facts_file_path=cfg.SPECIFIC_FACTS_FILE_PATH,
+            name_col=cfg.NAME_COL,
+            output_data_path=cfg.OUTPUT_DATA_PATH,
+            output_extension=cfg.OUTPUT_EXTENSION,
+            output_mode=cfg.OUTPUT_MODE,
+            sheets_per_document=cfg.SHEETS_PER_DOCUMENT,
+            auto_fit_layout=cfg.AUTO_FIT_LAYOUT,
+            optimize_diversity=cfg.OPTIMIZE_DIVERSITY,
+            use_cache=cfg.USE_CACHE,
+            use_pipeline=cfg.USE_PIPELINE,
+            number_workers=cfg.NUMBER_WORKERS,
+            number_write_workers=cfg.NUMBER_WRITE_WORKERS,
+            queue_depth=cfg.QUEUE_DEPTH,
+        )
+
+    @staticmethod
+    def load_file(file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read a TOML (.toml) or JSON (.json) config file
+
+        Arguments:
+            file_path -- Location of the config file
+
+        Returns:
+            Settings in the config file, None if it could not be read
+        """
+        try:
+            if file_path.suffix == ".toml":
+                try:
+                    import tomllib
+                except ModuleNotFoundError:
+                    import tomli as tomllib  # Python < 3.11
+                with open(file_path, "rb") as file:
+                    values = tomllib.load(file)
+            elif file_path.suffix == ".json":
+                with open(file_path, "r") as file:
+                    values = json.load(file)
+            else:
+                logging.error(
+                    f"Unsupported config file {file_path}. "
+                    "Supported extensions: {'.toml', '.json'}"
+                )
+                return None
+        except Exception as e:
+            logging.error(f"Failed to read config file {file_path}: {e}")
+            return None
+
+        if not isinstance(values, dict):
+            logging.error(f"Config file {file_path} must hold a table/object")
+            return None
+        return values
+
+    def with_overrides(
+        self, values: Mapping[str, Any], base_path: Optional[Path] = None
+    ) -> Optional["RunConfig"]:
+        """
+        Create a copy of the settings with some values replaced
+
+        Arguments:
+            values -- Fields of RunConfig to replace. The fields of the
+            generator and drawer configs are given in nested mappings under
+            SHEET_SECTION and DRAWER_SECTION
+            base_path -- Folder relative paths are resolved against. None for
+            the current working directory
+
+        Returns:
+            Settings with the values replaced, None if a value is invalid
+        """
+        run_fields = {
+            f.name
+            for f in dataclasses.fields(RunConfig)
+            if f.name not in {"bingo_sheet_config", "sheet_drawer_config"}
+        }
+        sections = {RunConfig.SHEET_SECTION, RunConfig.DRAWER_SECTION}
+        unknown_keys = set(values) - run_fields - sections
+        if len(unknown_keys) > 0:
+            logging.error(f"Unknown settings: {sorted(unknown_keys)}")
+            return None
+
+        try:
+            run_values = {
+                key: value
+                for key, value in values.items()
+                if key in run_fields
+            }
+            RunConfig._check_types(RunConfig, run_values)
+            for key, value in run_values.items():
+                if key.endswith("_path"):
+                    path = Path(value).expanduser()
+                    if base_path is not None and not path.is_absolute():
+                        path = base_path / path
+                    run_values[key] = path
+
+            bingo_sheet_config = self._replace_config(
+                config=self.bingo_sheet_config,
+                values=values.get(RunConfig.SHEET_SECTION, {}),
+            )
+            sheet_drawer_config = self._replace_config(
+                config=self.sheet_drawer_config,
+                values=values.get(RunConfig.DRAWER_SECTION, {}),
+            )
+        except (TypeError, ValueError) as e:
+            logging.error(f"Invalid settings: {e}")
+            return None
+
+        if bingo_sheet_config is None or sheet_drawer_config is None:
+            return None
+
+        return dataclasses.replace(
+            self,
+            bingo_sheet_config=bingo_sheet_config,
+            sheet_drawer_config=sheet_drawer_config,
+            **run_values,
+        )
+
+    def is_valid(self) -> bool:
+        """
+        Check the settings that are not checked by the generator and drawer
+
+        Returns:
+            Boolean on whether the settings are valid
+        """
+        if self.output_mode not in RunConfig.SUPPORTED_OUTPUT_MODES:
+            logging.error(
+                f"Unknown output mode {self.output_mode}. "
+                f"Supported output modes: {RunConfig.SUPPORTED_OUTPUT_MODES}"
+            )
+            return False
+
+        backend = self.sheet_drawer_config.backend
+        supported_formats = SheetDrawer.SUPPORTED_BACKENDS.get(backend)
+        if supported_formats is None:
+            logging.error(
+                f"Unknown backend {backend}. "
+                f"Supported backends: {set(SheetDrawer.SUPPORTED_BACKENDS)}"
+            )
+            return False
+
+        if f".{self.output_extension}" not in supported_formats:
+            logging.error(
+                f"Output extension {self.output_extension} is not supported "
+                f"by backend {backend}. Supported extensions: "
+                f"{supported_formats}"
+            )
+            return False
+
+        if self.output_mode == "document" and (
+            backend != "pdf" or self.output_extension != "pdf"
+        ):
+            logging.error(
+                "Output mode 'document' requires the 'pdf' backend and "
+                "output extension pdf."
+            )
+            return False
+
+        if self.number_puzzle_sets < 1:
+            logging.error("Number of puzzle sets must be at least 1.")
+            return False
+
+        return True
+
+    @staticmethod
+    def _replace_config(config: Any, values: Mapping[str, Any]) -> Any:
+        """
+        Create a copy of a generator or drawer config with some fields
+        replaced
+
+        Arguments:
+            config -- BingoSheetGenerator.Config or SheetDrawer.Config
+            values -- Fields to replace
+
+        Returns:
+            Config with the fields replaced, None if a field is unknown or
+            the specific fact cells cannot be placed
+
+        Raises:
+            TypeError -- A value does not have the type of its field
+        """
+        values = dict(values)
+        count = None
+        if isinstance(config, BingoSheetGenerator.Config):
+            count = values.pop(RunConfig.SPECIFIC_COUNT_KEY, None)
+
+        fields = {f.name for f in dataclasses.fields(config)}
+        unknown_keys = set(values) - fields
+        if len(unknown_keys) > 0:
+            logging.error(
+                f"Unknown settings of {type(config).__qualname__}: "
+                f"{sorted(unknown_keys)}"
+            )
+            return None
+
+        RunConfig._check_types(type(config), values)
+        if count is not None:
+            RunConfig._check_types(
+                RunConfig, {RunConfig.SPECIFIC_COUNT_KEY: count}
+            )
+
+        if "fig_size" in values:
+            width, height = values["fig_size"]
+            values["fig_size"] = (int(width), int(height))
+        if count is not None:
+            if "specific_fact_indexes" in values:
+                logging.error(
+                    "Give either specific_fact_indexes or "
+                    f"{RunConfig.SPECIFIC_COUNT_KEY}, not both"
+                )
+                return None
+            indexes = SpecificLayout.search(
+                sheet_size=int(values.get("sheet_size", config.sheet_size)),
+                count=int(count),
+            )
+            if indexes is None:
+                return None
+            values["specific_fact_indexes"] = indexes
+        elif "specific_fact_indexes" in values:
+            values["specific_fact_indexes"] = {
+                int(idx) for idx in values["specific_fact_indexes"]
+            }
+        elif "sheet_size" in values and values["sheet_size"] != getattr(
+            config, "sheet_size"
+        ):
+            values["specific_fact_indexes"] = RunConfig.checkerboard_indexes(
+                int(values["sheet_size"])
+            )
+        return dataclasses.replace(config, **values)
+
+    @staticmethod
+    def _check_types(config_type: type, values: Mapping[str, Any]) -> None:
+        """
+        Check that the values of a config file or the command line have the
+        types of the fields they replace. Paths may be given as strings, and
+        sets and tuples as lists
+
+        Arguments:
+            config_type -- RunConfig, BingoSheetGenerator.Config or
+            SheetDrawer.Config
+            values -- Fields to replace. SPECIFIC_COUNT_KEY is checked as an
+            int
+
+        Raises:
+            TypeError -- A value does not have the type of its field
+        """
+        field_types: Dict[str, Any] = {
+            f.name: f.type for f in dataclasses.fields(config_type)
+        }
+        field_types[RunConfig.SPECIFIC_COUNT_KEY] = int
+
+        def matches(value: Any, expected: Any) -> bool:
+            origin = typing.get_origin(expected) or expected
+            args = typing.get_args(expected)
+            if origin is Path:
+                return isinstance(value, (str, Path))
+            if origin in (set, tuple):
+                if not isinstance(value, (list, tuple, set)):
+                    return False
+                if origin is tuple and len(value) != len(args):
+                    return False
+                item_types = args if origin is tuple else args * len(value)
+                return all(
+                    matches(item, item_type)
+                    for item, item_type in zip(value, item_types)
+                )
+            # bool is a subclass of int, but True is not a number of sheets
+            if isinstance(value, bool) and origin is not bool:
+                return False
+            return isinstance(value, origin)
+
+        for key, value in values.items():
+            expected = field_types.get(key)
+            if expected is not None and not matches(value, expected):
+                raise TypeError(
+                    f"{key} must be of type "
+                    f"{getattr(expected, '__name__', expected)}, got "
+                    f"{value!r}"
+                )
+
+    @staticmethod
+    def checkerboard_indexes(sheet_size: int) -> Set[int]:
+        """
+        Cell indexes of a checkerboard pattern, used for the specific facts
+        when only the sheet size is changed
+
+        Arguments:
+            sheet_size -- Number of cells in a rol/col the bingo sheet
+
+        Returns:
+            Indexes of the cells where row + col is even
+        """
+        return {
+            row * sheet_size + col
+            for row in range(sheet_size)
+            for col in range(sheet_size)
+            if (row + col) % 2 == 0
+        }
@@ -0,0 +1,512 @@
+import json
+import logging
+import threading
+
+from .bingo_sheet_generator import BingoSheetGenerator
+from .fact_table import FactTable
+from .render_cache import RenderCache
+from .sheet import Sheet
+from .sheet_drawer import SheetDrawer
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+
+class SheetServer:
+    """
+    Local HTTP service that generates and draws bingo sheets on request
+
+    The input data is interned and the drawer config fitted once at start
+    up. Every sheet is generated on its own when it is requested (see
+    BingoSheetGenerator.generate_sheet), identical to the sheet of a full
+    generation run with the same settings. The ETag of a sheet is the hash
+    of its facts, title and drawer config, so an unchanged sheet is answered
+    with 304 Not Modified without drawing it. Drawn sheets are kept in a
+    size-bounded LRU cache, and concurrent requests for a sheet that is
+    being drawn wait for that drawing instead of drawing it again.
+
+    Routes:
+        GET /participants -- Names of the participants, number of sets and
+        the URL of every sheet of the first participant as an example
+        GET /sheets/<participant>/<set> -- Sheet of a participant (URL
+        encoded name) and set (starting from 1)
+        GET /stats -- Request and cache counters
+    """
+
+    CONTENT_TYPES: Dict[str, str] = {
+        "pdf": "application/pdf",
+        "png": "image/png",
+        "jpg": "image/jpeg",
+    }
+
+    @dataclass
+    class Config:
+        """
+        Configuration of the server
+
+        Attributes:
+            host: Address to listen on. Defaults to the local machine only
+            port: Port to listen on. 0 to pick a free port
+            cache_bytes: Maximum total size of the drawn sheets kept in
+            memory
+            num_sets: Number of sets (sheets) per participant
+            extension: File format of the sheets, without the dot
+        """
+
+        host: str = "127.0.0.1"
+        port: int = 8000
+        cache_bytes: int = 64 * 1024 * 1024
+        num_sets: int = 1
+        extension: str = "pdf"
+
+    @dataclass
+    class Stats:
+        """
+        Counters of the requests served so far
+
+        Attributes:
+            requests: Number of sheet requests
+            not_modified: Requests answered with 304 Not Modified
+            hits: Requests answered from the cache
+            coalesced: Requests that waited for a drawing of the same sheet
+            by another request
+            renders: Number of sheets drawn
+            errors: Requests that failed
+        """
+
+        requests: int = 0
+        not_modified: int = 0
+        hits: int = 0
+        coalesced: int = 0
+        renders: int = 0
+        errors: int = 0
+
+    class Cache:
+        """
+        Thread safe least recently used cache of drawn sheets and their
+        ETags, bounded by the total size of the sheets rather than their
+        number
+        """
+
+        def __init__(self, max_bytes: int) -> None:
+            """
+            Create an empty cache
+
+            Arguments:
+                max_bytes -- Maximum total size of the cached sheets
+            """
+            self.max_bytes = max_bytes
+            self.num_bytes = 0
+            self._entries: "OrderedDict[Hashable, Tuple[str, bytes]]" = (
+                OrderedDict()
+            )
+            self._lock = threading.Lock()
+
+        def __len__(self) -> int:
+            return len(self._entries)
+
+        def get(self, key: Hashable) -> Optional[Tuple[str, bytes]]:
+            """
+            Get a cached sheet and mark it as recently used
+
+            Arguments:
+                key -- Key of the sheet
+
+            Returns:
+                ETag and content of the sheet. None if it is not cached
+            """
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                return entry
+
+        def put(self, key: Hashable, etag: str, content: bytes) -> None:
+            """
+            Cache a sheet, evicting the least recently used sheets until the
+            cache fits into max_bytes. Sheets larger than max_bytes are not
+            cached
+
+            Arguments:
+                key -- Key of the sheet
+                etag -- ETag of the sheet
+                content -- Content of the sheet
+            """
+            if len(content) > self.max_bytes:
+                return
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.num_bytes -= len(previous[1])
+                self._entries[key] = (etag, content)
+                self.num_bytes += len(content)
+                while self.num_bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.num_bytes -= len(evicted)
+
+    def __init__(
+        self,
+        config: Config,
+        bingo_config: BingoSheetGenerator.Config,
+        drawer_config: SheetDrawer.Config,
+        participants: List[str],
+        fact_table: FactTable,
+    ) -> None:
+        """
+        Prepare the server. It starts listening once start is called
+
+        Arguments:
+            config -- Server config
+            bingo_config -- Bingo sheet config
+            drawer_config -- Drawer config
+            participants -- Names of all participants, in alphabetical order
+            fact_table -- Interned generic and specific facts
+        """
+        self.config = config
+        self.bingo_config = bingo_config
+        self.drawer_config = drawer_config
+        self.participants = participants
+        self.fact_table = fact_table
+        self.stats = SheetServer.Stats()
+        self.cache = SheetServer.Cache(max_bytes=config.cache_bytes)
+
+        self._participant_set = set(participants)
+        # Ranks of the participants, prepared once for all requests
+        self._participants = BingoSheetGenerator.Participants.from_names(
+            names=participants, fact_table=fact_table
+        )
+        self._render_key = RenderCache.hash_config(
+            drawer_config, config.extension
+        )
+        # Drawing sessions are not thread safe, so all request threads
+        # share one session and draw one sheet at a time
+        self._session = SheetDrawer.Session(drawer_config)
+        self._render_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[
+            Tuple[str, int], "Future[Tuple[str, bytes]]"
+        ] = {}
+        self._http_server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SheetServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the server, with the actual port if port 0 was given
+
+        Returns:
+            Aforementioned quantity
+        """
+        assert self._http_server is not None, "Server not started"
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """
+        Start listening and serve the requests in a background thread
+        """
+        self._session.start()
+        server = ThreadingHTTPServer(
+            (self.config.host, self.config.port), SheetServer._Handler
+        )
+        server.daemon_threads = True
+        setattr(server, "sheet_server", self)
+        self._http_server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="sheet-server", daemon=True
+        )
+        self._thread.start()
+        logging.info(f"Serving bingo sheets at {self.url}/participants")
+
+    def close(self) -> None:
+        """
+        Stop the server and release the drawing session. Does nothing if
+        the server is not running
+        """
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._session.close()
+
+    def wait(self) -> None:
+        """
+        Block until the server is stopped, e.g. by Ctrl+C
+        """
+        if self._thread is not None:
+            self._thread.join()
+
+    def sheet_path(self, participant: str, set_number: int) -> str:
+        """
+        URL path of a sheet
+
+        Arguments:
+            participant -- Name of the participant
+            set_number -- Number of the set (starting from 1)
+
+        Returns:
+            Aforementioned quantity
+        """
+        return f"/sheets/{quote(participant, safe='')}/{set_number}"
+
+    def get_sheet(
+        self, participant: str, set_number: int, etag: Optional[str] = None
+    ) -> Optional[Tuple[str, Optional[bytes]]]:
+        """
+        Generate and draw the sheet of a participant, or take it from the
+        cache
+
+        Arguments:
+            participant -- Name of the participant
+            set_number -- Number of the set (starting from 1)
+            etag -- ETag the client already has, if any
+
+        Returns:
+            A tuple where the first element is the ETag of the sheet and the
+            second element the content of the sheet, or None if it matches
+            the given etag. None if the participant or set does not exist
+        """
+        if (
+            participant not in self._participant_set
+            or not 1 <= set_number <= self.config.num_sets
+        ):
+            return None
+
+        with self._lock:
+            self.stats.requests += 1
+        key = (participant, set_number)
+        entry = self.cache.get(key)
+        if entry is not None:
+            sheet_etag = entry[0]
+        else:
+            generated = self._generate(participant, set_number)
+            if generated is None:
+                return None
+            sheet, title, sheet_etag = generated
+
+        # A sheet the client already has is not drawn again, even if it is
+        # no longer cached
+        if etag == sheet_etag:
+            with self._lock:
+                self.stats.not_modified += 1
+            return (sheet_etag, None)
+        if entry is not None:
+            with self._lock:
+                self.stats.hits += 1
+            return entry
+        return self._draw(key=key, sheet=sheet, title=title, etag=sheet_etag)
+
+    def _generate(
+        self, participant: str, set_number: int
+    ) -> Optional[Tuple[Sheet, str, str]]:
+        """
+        Generate the sheet of a participant
+
+        Arguments:
+            participant -- Name of the participant
+            set_number -- Number of the set (starting from 1)
+
+        Returns:
+            The sheet, its title and its ETag. None if the data is not
+            sufficient
+        """
+        size = self.bingo_config.sheet_size
+        stem = f"bingo_sheet_{participant}_{size}x{size}_{set_number}"
+        title = f"{stem} ---- Participant name: {participant}"
+        sheet = BingoSheetGenerator.generate_sheet(
+            participant_name=participant,
+            set_idx=set_number - 1,
+            config=self.bingo_config,
+            data=self.fact_table,
+            participants=self._participants,
+        )
+        if sheet is None:
+            return None
+        sheet_hash = RenderCache.hash_sheet(
+            cells=sheet.cells, title=title, render_key=self._render_key
+        )
+        return (sheet, title, f'"{sheet_hash}"')
+
+    def _draw(
+        self, key: Tuple[str, int], sheet: Sheet, title: str, etag: str
+    ) -> Tuple[str, bytes]:
+        """
+        Draw a sheet and cache it. If the sheet is already being drawn for
+        another request, wait for that drawing instead
+
+        Arguments:
+            key -- Participant and set number of the sheet
+            sheet -- Sheet to draw
+            title -- Title of the sheet
+            etag -- ETag of the sheet
+
+        Returns:
+            ETag and content of the sheet
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if future is None:
+                # The sheet may have been cached since it was looked up
+                entry = self.cache.get(key)
+                if entry is not None:
+                    self.stats.hits += 1
+                    return entry
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.stats.coalesced += 1
+        if not is_owner:
+            try:
+                return future.result()
+            except Exception:
+                with self._lock:
+                    self.stats.errors += 1
+                raise
+
+        try:
+            with self._render_lock:
+                content = self._session.render(
+                    sheet=sheet,
+                    title=title,
+                    export_format=f".{self.config.extension}",
+                )
+            if content is None:
+                raise ValueError(
+                    f"Cannot draw sheets as .{self.config.extension}"
+                )
+            entry = (etag, content)
+            self.cache.put(key, *entry)
+            with self._lock:
+                self.stats.renders += 1
+            future.set_result(entry)
+        except Exception as e:
+            with self._lock:
+                self.stats.errors += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return entry
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """
+        Request counters and the state of the cache
+
+        Returns:
+            Aforementioned quantity
+        """
+        with self._lock:
+            values = asdict(self.stats)
+        values["cached_sheets"] = len(self.cache)
+        values["cached_bytes"] = self.cache.num_bytes
+        return values
+
+    class _Handler(BaseHTTPRequestHandler):
+        """
+        Handler of the requests of a SheetServer
+        """
+
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately, which Nagle's algorithm
+        # would delay on keep-alive connections
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            server: SheetServer = getattr(self.server, "sheet_server")
+            parts = [
+                unquote(part)
+                for part in urlsplit(self.path).path[1:].split("/")
+            ]
+            if parts == ["participants"]:
+                examples = [
+                    server.sheet_path(participant, number)
+                    for participant in server.participants[:1]
+                    for number in range(1, server.config.num_sets + 1)
+                ]
+                self._send_json(
+                    {
+                        "participants": server.participants,
+                        "sets": server.config.num_sets,
+                        "example_sheets": examples,
+                    }
+                )
+                return
+            if parts == ["stats"]:
+                self._send_json(server.stats_dict())
+                return
+            if len(parts) != 3 or parts[0] != "sheets":
+                self._send_error(404, "Unknown path")
+                return
+
+            try:
+                set_number = int(parts[2])
+            except ValueError:
+                self._send_error(404, "Invalid set number")
+                return
+            try:
+                result = server.get_sheet(
+                    participant=parts[1],
+                    set_number=set_number,
+                    etag=self.headers.get("If-None-Match"),
+                )
+            except Exception as e:
+                logging.error(f"Failed to draw sheet {self.path}: {e}")
+                self._send_error(500, "Failed to draw the sheet")
+                return
+            if result is None:
+                self._send_error(404, "Unknown participant or set")
+                return
+
+            etag, content = result
+            if content is None:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                SheetServer.CONTENT_TYPES.get(
+                    server.config.extension, "application/octet-stream"
+                ),
+            )
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logging.debug(f"{self.address_string()} {format % args}")
+
+        def _send_json(self, value: Dict[str, Any]) -> None:
+            body = json.dumps(value).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_error(self, code: int, message: str) -> None:
+            body = message.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
@@ -0,0 +1,388 @@
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+
+from .sheet_drawer import SheetDrawer
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    One of several disjoint parts of a generation run, so that the sheets of
+    a run can be generated and drawn on several machines and merged
+    afterwards
+
+    Participant i (in alphabetical order) belongs to shard i % count + 1,
+    together with all of their sets. Since every sheet only depends on the
+    seed, the participant and the set index, a shard generates exactly the
+    same sheets as the full run. Every shard saves its sheets in its own
+    folder together with a manifest, and merge assembles the output of all
+    shards once every manifest has been checked.
+
+    Attributes:
+        index: Number of the shard, from 1 to count
+        count: Number of shards of the run
+    """
+
+    MANIFEST_NAME: ClassVar[str] = "shard.json"
+    MANIFEST_VERSION: ClassVar[int] = 1
+    # File with the rendered pages of a shard in document mode
+    PAGES_NAME: ClassVar[str] = "pages.jsonl"
+    # Manifest values that must be identical for all shards of a run
+    RUN_KEYS: ClassVar[Tuple[str, ...]] = (
+        "count",
+        "input_hash",
+        "config_hash",
+        "seed",
+        "num_participants",
+        "num_sets",
+        "output_mode",
+        "sheets_per_document",
+        "document_name",
+        "drawer_config",
+    )
+
+    index: int
+    count: int
+
+    @staticmethod
+    def parse(text: str) -> Optional["Shard"]:
+        """
+        Parse a shard given as "K/N", e.g. "2/4" for the second of four shards
+
+        Arguments:
+            text -- Shard number and number of shards
+
+        Returns:
+            Parsed shard. None if the text is not a valid shard
+        """
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", text)
+        if match is None:
+            return None
+        shard = Shard(index=int(match.group(1)), count=int(match.group(2)))
+        if not 1 <= shard.index <= shard.count:
+            return None
+        return shard
+
+    @property
+    def folder_name(self) -> str:
+        """
+        Name of the folder the shard saves its output to, inside the output
+        folder of the run
+
+        Returns:
+            Aforementioned quantity
+        """
+        return f"shard_{self.index:03d}_of_{self.count:03d}"
+
+    def participant_indexes(self, num_participants: int) -> range:
+        """
+        Indexes of the participants whose sheets belong to the shard
+
+        Arguments:
+            num_participants -- Number of participants of the run
+
+        Returns:
+            Aforementioned quantity
+        """
+        return range(self.index - 1, num_participants, self.count)
+
+    @staticmethod
+    def sheet_id(
+        participant_idx: int, set_idx: int, num_participants: int
+    ) -> int:
+        """
+        Position of a sheet in the output of the full run, which orders the
+        sheets by set and then by participant
+
+        Arguments:
+            participant_idx -- Index of the participant
+            set_idx -- Index of the set (starting from 0)
+            num_participants -- Number of participants of the run
+
+        Returns:
+            Aforementioned quantity
+        """
+        return set_idx * num_participants + participant_idx
+
+    @staticmethod
+    def file_digest(path: Path) -> str:
+        """
+        SHA-256 digest of the content of a file
+
+        Arguments:
+            path -- File to hash
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def write_manifest(self, folder: Path, values: Dict[str, Any]) -> None:
+        """
+        Save the manifest of a completed shard
+
+        Arguments:
+            folder -- Output folder of the shard
+            values -- Run values (see RUN_KEYS) and the sheets of the shard:
+            "files" lists the name, sheet ID and digest of every file in
+            files mode, "sheets" lists the sheet ID of every page of the
+            pages file in document mode
+        """
+        manifest = {
+            "version": Shard.MANIFEST_VERSION,
+            "index": self.index,
+            "count": self.count,
+            **values,
+        }
+        tmp_path = folder / f"{Shard.MANIFEST_NAME}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(manifest, file, indent=1)
+        os.replace(tmp_path, folder / Shard.MANIFEST_NAME)
+
+    @staticmethod
+    def read_manifest(folder: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read the manifest of a shard
+
+        Arguments:
+            folder -- Output folder of the shard
+
+        Returns:
+            Content of the manifest. None if it is missing or invalid
+        """
+        path = folder / Shard.MANIFEST_NAME
+        try:
+            with open(path, "r") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to read shard manifest {path}: {e}")
+            return None
+        if (
+            not isinstance(manifest, dict)
+            or manifest.get("version") != Shard.MANIFEST_VERSION
+        ):
+            logging.error(f"Unsupported shard manifest {path}.")
+            return None
+        return manifest
+
+    @staticmethod
+    def find_folders(output_folder: Path) -> List[Path]:
+        """
+        Shard folders inside the output folder of a run
+
+        Arguments:
+            output_folder -- Output folder of the run
+
+        Returns:
+            Aforementioned quantity, sorted by name
+        """
+        return sorted(
+            path
+            for path in output_folder.glob("shard_*_of_*")
+            if path.is_dir()
+        )
+
+    @staticmethod
+    def check_manifests(
+        manifests: List[Dict[str, Any]], folders: List[Path]
+    ) -> bool:
+        """
+        Check that the manifests belong to all shards of the same run, and
+        that together they cover every sheet of the run exactly once
+
+        Arguments:
+            manifests -- Manifest of every shard
+            folders -- Output folder of every shard, for error messages
+
+        Returns:
+            Boolean on whether the manifests are consistent
+        """
+        if len(manifests) == 0:
+            logging.error("No shards to merge.")
+            return False
+
+        first = manifests[0]
+        for manifest, folder in zip(manifests, folders):
+            different = [
+                key
+                for key in Shard.RUN_KEYS
+                if manifest.get(key) != first.get(key)
+            ]
+            if different:
+                logging.error(
+                    f"Shard {folder} belongs to a different run than "
+                    f"{folders[0]} (different {', '.join(different)})."
+                )
+                return False
+
+        count = first["count"]
+        indexes = sorted(manifest["index"] for manifest in manifests)
+        if indexes != list(range(1, count + 1)):
+            missing = sorted(set(range(1, count + 1)) - set(indexes))
+            logging.error(
+                f"Expected each of the {count} shards exactly once, got "
+                f"shards {indexes} (missing {missing})."
+            )
+            return False
+
+        sheet_ids: List[int] = []
+        for manifest in manifests:
+            if first["output_mode"] == "document":
+                sheet_ids.extend(manifest["sheets"])
+            else:
+                sheet_ids.extend(entry["sheet"] for entry in manifest["files"])
+        num_sheets = first["num_participants"] * first["num_sets"]
+        if sorted(sheet_ids) != list(range(num_sheets)):
+            logging.error(
+                f"The shards hold {len(sheet_ids)} sheets ("
+                f"{len(set(sheet_ids))} distinct) but the run has "
+                f"{num_sheets} sheets."
+            )
+            return False
+        return True
+
+    @staticmethod
+    def merge(shard_folders: List[Path], output_folder: Path) -> bool:
+        """
+        Assemble the output of all shards of a run in the output folder:
+        copy the sheet files in files mode, or write the pages of all shards
+        into the documents in document mode
+
+        Arguments:
+            shard_folders -- Output folder of every shard
+            output_folder -- Folder to save the combined output to
+
+        Returns:
+            Boolean on whether the output has been assembled successfully
+        """
+        manifests = []
+        for folder in shard_folders:
+            manifest = Shard.read_manifest(folder)
+            if manifest is None:
+                return False
+            manifests.append(manifest)
+        if not Shard.check_manifests(manifests, shard_folders):
+            return False
+
+        output_folder.mkdir(parents=True, exist_ok=True)
+        if manifests[0]["output_mode"] == "document":
+            return Shard._merge_documents(
+                manifests, shard_folders, output_folder
+            )
+
+        for manifest, folder in zip(manifests, shard_folders):
+            for entry in manifest["files"]:
+                if not Shard._copy_file(
+                    source=folder / entry["name"],
+                    target=output_folder / entry["name"],
+                    sha256=entry["sha256"],
+                ):
+                    return False
+        logging.info(f"Merged {len(manifests)} shards into {output_folder}.")
+        return True
+
+    @staticmethod
+    def _merge_documents(
+        manifests: List[Dict[str, Any]],
+        shard_folders: List[Path],
+        output_folder: Path,
+    ) -> bool:
+        """
+        Write the pages of all shards, in the order of the full run, into
+        the documents of the run
+
+        Arguments:
+            manifests -- Manifest of every shard
+            shard_folders -- Output folder of every shard
+            output_folder -- Folder to save the documents to
+
+        Returns:
+            Boolean on whether all pages have been written
+        """
+        for manifest, folder in zip(manifests, shard_folders):
+            pages_path = folder / Shard.PAGES_NAME
+            if not pages_path.is_file() or (
+                Shard.file_digest(pages_path) != manifest["pages_sha256"]
+            ):
+                logging.error(
+                    f"Pages file {pages_path} is missing or does not match "
+                    "the shard manifest."
+                )
+                return False
+
+        first = manifests[0]
+        drawer_config = dict(first["drawer_config"])
+        drawer_config["fig_size"] = tuple(drawer_config["fig_size"])
+        # Every shard lists its pages in increasing sheet ID
+        pages = heapq.merge(
+            *(
+                zip(
+                    manifest["sheets"],
+                    SheetDrawer.read_pages(folder / Shard.PAGES_NAME),
+                )
+                for manifest, folder in zip(manifests, shard_folders)
+            ),
+            key=lambda item: item[0],
+        )
+        num_failed = 0
+        for result in SheetDrawer.assemble_document(
+            pages=(page for _, page in pages),
+            config=SheetDrawer.Config(**drawer_config),
+            export_path=output_folder / first["document_name"],
+            sheets_per_document=first["sheets_per_document"],
+        ):
+            if not result.success:
+                num_failed += 1
+                logging.error(
+                    f"Failed to add a page to {result.export_path}: "
+                    f"{result.error}"
+                )
+        if num_failed > 0:
+            return False
+        logging.info(
+            f"Merged the pages of {len(manifests)} shards into "
+            f"{output_folder}."
+        )
+        return True
+
+    @staticmethod
+    def _copy_file(source: Path, target: Path, sha256: str) -> bool:
+        """
+        Copy a file, checking its digest on the way
+
+        Arguments:
+            source -- File to copy
+            target -- Location of the copy
+            sha256 -- Expected SHA-256 digest of the file
+
+        Returns:
+            Boolean on whether the file has been copied and matches the digest
+        """
+        digest = hashlib.sha256()
+        tmp_path = target.with_name(f".{target.name}.tmp")
+        try:
+            with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+                for block in iter(lambda: src.read(1 << 20), b""):
+                    digest.update(block)
+                    dst.write(block)
+        except OSError as e:
+            logging.error(f"Failed to copy {source} to {target}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        if digest.hexdigest() != sha256:
+            logging.error(f"{source} does not match the shard manifest.")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        os.replace(tmp_path, target)
+        return True
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class Sheet:
+    """
+    Lightweight bingo sheet that stores the fact ID of every cell
+
+    Attributes:
+        fact_ids: Fact ID of every cell in row major order
+        sheet_size: Number of cells in a rol/col the bingo sheet
+        facts: Lookup table to convert a fact ID to the fact itself. Shared
+        with the FactTable the sheet was generated from, not copied
+    """
+
+    fact_ids: Tuple[int, ...]
+    sheet_size: int
+    facts: Sequence[str] = field(repr=False, compare=False)
+
+    @staticmethod
+    def from_cells(cells: Sequence[str], sheet_size: int) -> "Sheet":
+        """
+        Create a sheet from the facts of its cells
+
+        Arguments:
+            cells -- Facts of every cell in row major order
+            sheet_size -- Number of cells in a rol/col the bingo sheet
+
+        Returns:
+            Sheet with its own lookup table
+        """
+        return Sheet(
+            fact_ids=tuple(range(len(cells))),
+            sheet_size=sheet_size,
+            facts=tuple(cells),
+        )
+
+    def compact(self) -> "Sheet":
+        """
+        Copy of the sheet whose lookup table only holds the facts of its
+        cells, e.g. to send it to another process without the lookup table
+        of the whole FactTable
+
+        Returns:
+            Sheet with its own lookup table and the same cells
+        """
+        return Sheet.from_cells(cells=self.cells, sheet_size=self.sheet_size)
+
+    @property
+    def cells(self) -> List[str]:
+        """
+        Facts of every cell in row major order
+
+        Returns:
+            Aforementioned quantity
+        """
+        return [self.facts[fact_id] for fact_id in self.fact_ids]
+
+    @property
+    def rows(self) -> List[List[str]]:
+        """
+        Facts of every cell, one list per row of the sheet
+
+        Returns:
+            Aforementioned quantity
+        """
+        cells = self.cells
+        size = self.sheet_size
+        return [cells[i * size : i * size + size] for i in range(size)]
+
+    @property
+    def header(self) -> List[str]:
+        """
+        Column labels of the sheet
+
+        Returns:
+            Aforementioned quantity
+        """
+        return [str(i) for i in range(self.sheet_size)]
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        Convert the sheet into a Pandas Dataframe. Pandas is only imported
+        when this is called
+
+        Returns:
+            Bingo sheet with sheet_size number rows and sheet_size number cols
+        """
+        import pandas as pd
+
+        return pd.DataFrame(data=self.rows, columns=self.header)
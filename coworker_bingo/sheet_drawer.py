@@ -1,12 +1,33 @@
-import df2img
+import contextlib
+import json
 import os
 import logging
-import pandas as pd
-import sys
+import math
 
-from dataclasses import dataclass
+from .instrumentation import Instrumentation
+from .pdf_renderer import PdfDocumentWriter, PdfRenderer, PdfSheetTemplate
+from .sheet import Sheet
+from .text_layout import TextLayout
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
 
 
 class SheetDrawer:
@@ -15,7 +36,13 @@ class SheetDrawer:
     format
     """
 
-    SUPPORTED_EXPORT_FORMATS: Set[str] = {".png", ".pdf", "jpg"}
+    SUPPORTED_EXPORT_FORMATS: Set[str] = {".png", ".pdf", ".jpg"}
+
+    # Rendering backends and the export formats each of them supports
+    SUPPORTED_BACKENDS: Dict[str, Set[str]] = {
+        "df2img": SUPPORTED_EXPORT_FORMATS,
+        "pdf": {".pdf"},
+    }
 
     @dataclass
     class Config:
@@ -31,6 +58,9 @@ class SheetDrawer:
             overflow out of cell
             fig_size: Size of the entire bingo sheet. Increase accordingly if
             only a portion of the table is rendered in the drawn sheet
+            backend: Rendering backend, one of SUPPORTED_BACKENDS. "df2img"
+            plots the sheet with plotly and exports it with an image engine,
+            "pdf" writes the sheet directly as PDF drawing operators
         """
 
         title_font: str = "Times New Roman"
@@ -39,10 +69,332 @@ class SheetDrawer:
         cell_font_size: int = 14
         cell_height: int = 200
         fig_size: Tuple[int, int] = (1000, 2000)
+        backend: str = "df2img"
+
+    @dataclass
+    class Job:
+        """
+        A bingo sheet that is to be drawn
+
+        Attributes:
+            sheet: Bingo sheet
+            export_path: Location to save file to
+            title: Title that will be shown above the table
+            bookmark: Name the sheet is listed under in the index and
+            bookmarks of a multi-page document. None to use the title
+        """
+
+        sheet: Union[Sheet, "pd.DataFrame"]
+        export_path: Path
+        title: str
+        bookmark: Optional[str] = None
+
+    @dataclass
+    class Result:
+        """
+        Outcome of drawing a single bingo sheet
+
+        Attributes:
+            export_path: Location the bingo sheet was meant to be saved to
+            success: Whether the bingo sheet was saved successfully
+            error: Description of the failure. None if successful
+        """
+
+        export_path: Path
+        success: bool
+        error: Optional[str] = None
+
+    class Session:
+        """
+        Draws many bingo sheets with the same drawer config, setting up the
+        backend once instead of per sheet
+
+        The "pdf" backend keeps the sheet template of every header. The
+        "df2img" backend opens os.devnull once to silence the export engine,
+        plots the first sheet and then only replaces the facts and title of
+        that figure for every following sheet with the same header. Use it
+        as a context manager (or call close) to release its resources.
+        Sessions are not thread safe, use one per thread or process.
+        """
+
+        def __init__(self, config: "SheetDrawer.Config") -> None:
+            """
+            Create a drawing session
+
+            Arguments:
+                config -- Drawer config used for every sheet
+            """
+            self.config = config
+            self._devnull: Optional[TextIO] = None
+            self._templates: Dict[Tuple[str, ...], PdfSheetTemplate] = {}
+            self._figure: Optional["go.Figure"] = None
+            self._figure_header: Optional[List[str]] = None
+            self._closed = False
+
+        def __enter__(self) -> "SheetDrawer.Session":
+            return self
+
+        def __exit__(self, *_) -> None:
+            self.close()
+
+        def start(self) -> None:
+            """
+            Start the export engine of the backend so that it is already
+            running when the first bingo sheet arrives
+            """
+            if self.config.backend != "df2img":
+                return
+
+            import plotly.graph_objects as go
+
+            try:
+                with contextlib.redirect_stdout(self._silent_stdout()):
+                    go.Figure().to_image(format="png", width=10, height=10)
+            except Exception as e:
+                logging.warning(f"Failed to start export engine: {e}")
+
+        def draw(
+            self,
+            sheet: Union[Sheet, "pd.DataFrame"],
+            title: str,
+            path: Path,
+        ) -> bool:
+            """
+            Write a bingo sheet to a file
+
+            Arguments:
+                sheet -- Bingo sheet
+                title -- Title that will be shown above the table
+                path -- Location to save file to (needs to end with an
+                extension supported by the backend in SUPPORTED_BACKENDS)
+
+            Returns:
+                Boolean on whether the bingo sheet has been saved
+                successfully to path
+            """
+            content = self.render(
+                sheet=sheet, title=title, export_format=path.suffix
+            )
+            if content is None:
+                logging.error(f"Failed to draw bingo sheet at {path}.")
+                return False
+
+            with Instrumentation.stage("write"):
+                with open(path, "wb") as file:
+                    file.write(content)
+            return True
+
+        def render(
+            self,
+            sheet: Union[Sheet, "pd.DataFrame"],
+            title: str,
+            export_format: str,
+        ) -> Optional[bytes]:
+            """
+            Render a bingo sheet into the content of a file, without
+            writing it
+
+            Arguments:
+                sheet -- Bingo sheet
+                title -- Title that will be shown above the table
+                export_format -- Extension of the file format, e.g. ".pdf"
+
+            Returns:
+                Content of the file. None if the backend or format is
+                unsupported
+            """
+            if self._closed:
+                raise ValueError("Drawing session is closed")
+            if not SheetDrawer._is_supported(self.config, export_format):
+                return None
+
+            header, rows = SheetDrawer._table(sheet)
+            if self.config.backend == "pdf":
+                with Instrumentation.stage("render_pdf"):
+                    template = self._templates.get(tuple(header))
+                    if template is None:
+                        template = PdfSheetTemplate.get(
+                            config=self.config, header=header
+                        )
+                        self._templates[tuple(header)] = template
+                    return template.render(rows=rows, title=title)
+
+            # Disable prints because the export engine is verbose
+            with contextlib.redirect_stdout(self._silent_stdout()):
+                fig = self._plot(
+                    sheet=sheet, header=header, rows=rows, title=title
+                )
+                with Instrumentation.stage("export"):
+                    return fig.to_image(
+                        format=export_format.lstrip("."), validate=False
+                    )
+
+        def close(self) -> None:
+            """
+            Release the resources of the session. Does nothing if it is
+            already closed
+            """
+            if self._closed:
+                return
+            self._closed = True
+            if self._devnull is not None:
+                self._devnull.close()
+                self._devnull = None
+            self._templates.clear()
+            self._figure = None
+            self._figure_header = None
+
+        def _silent_stdout(self) -> TextIO:
+            """
+            Stream that discards everything written to it, opened once
+
+            Returns:
+                Aforementioned quantity
+            """
+            if self._devnull is None:
+                self._devnull = open(os.devnull, "w")
+            return self._devnull
+
+        def _plot(
+            self,
+            sheet: Union[Sheet, "pd.DataFrame"],
+            header: List[str],
+            rows: List[List[str]],
+            title: str,
+        ) -> "go.Figure":
+            """
+            Figure of a bingo sheet. The figure of the previous sheet is
+            reused if it has the same header, replacing its facts and title
+
+            Arguments:
+                sheet -- Bingo sheet
+                header -- Header labels of the sheet
+                rows -- Facts of every cell of the sheet, one list per row
+                title -- Title that will be shown above the table
+
+            Returns:
+                Plotly figure of the bingo sheet
+            """
+            if self._figure is None or self._figure_header != header:
+                self._figure = SheetDrawer._plot(
+                    sheet=sheet, config=self.config, title=title
+                )
+                self._figure_header = header
+                return self._figure
+
+            with Instrumentation.stage("plot"):
+                self._figure.data[0].cells.values = [
+                    list(column) for column in zip(*rows)
+                ]
+                self._figure.layout.title.text = title
+            return self._figure
+
+    # Session of a drawing process of a pool, created by _init_worker
+    _worker_session: Optional[Session] = None
+
+    # Number of jobs queued per worker when drawing with a process pool
+    _JOBS_IN_FLIGHT_PER_WORKER: int = 4
+
+    # Smallest cell font size fit_config shrinks the facts to
+    MIN_FIT_FONT_SIZE: int = 6
+
+    @staticmethod
+    def fit_config(
+        config: Config, facts: Iterable[str], sheet_size: int
+    ) -> Config:
+        """
+        Adjust the cell font size, cell height and figure height so that
+        every fact fits into its cell, before any sheet is drawn
+
+        Every unique fact is wrapped once per font size (memoized by
+        TextLayout.num_lines). The cells are made tall enough for the fact
+        with the most lines. If the table would not fit onto the page, the
+        largest font size that fits is used instead, down to
+        MIN_FIT_FONT_SIZE. If not even that fits, the figure is made taller.
+
+        The facts are measured with the font metrics and layout of the "pdf"
+        backend, so only configs of that backend are fitted. Other backends
+        lay out the table with their own engine and are left unchanged.
+
+        Arguments:
+            config -- Drawer config to adjust
+            facts -- Facts that can appear in a cell
+            sheet_size -- Number of cells in a rol/col the bingo sheet
+
+        Returns:
+            Copy of the drawer config where no fact overflows its cell. The
+            config itself if its backend is not "pdf"
+        """
+        if config.backend != "pdf":
+            logging.warning(
+                "Fitting the layout to the facts is only supported by the "
+                f"'pdf' backend, not '{config.backend}'. The layout is left "
+                "unchanged."
+            )
+            return config
+
+        unique_facts = {str(fact) for fact in facts}
+        text_width = (
+            PdfRenderer.column_width(num_cols=sheet_size, config=config)
+            - 2 * PdfRenderer.CELL_PADDING
+        )
+        fig_width, fig_height = config.fig_size
+        table_offset = (
+            PdfRenderer.TITLE_MARGIN
+            + PdfRenderer.HEADER_HEIGHT
+            + PdfRenderer.MARGIN
+        )
+        max_cell_height = (fig_height - table_offset) / sheet_size
+
+        def required_cell_height(font_size: int) -> float:
+            max_lines = max(
+                [
+                    TextLayout.num_lines(
+                        fact, config.cell_font, font_size, text_width
+                    )
+                    for fact in unique_facts
+                ]
+                + [0]
+            )
+            return (
+                2 * PdfRenderer.CELL_PADDING
+                + max_lines * font_size * PdfRenderer.LINE_SPACING
+            )
+
+        min_font_size = min(
+            SheetDrawer.MIN_FIT_FONT_SIZE, config.cell_font_size
+        )
+        for font_size in range(config.cell_font_size, min_font_size - 1, -1):
+            cell_height = required_cell_height(font_size)
+            if cell_height <= max_cell_height:
+                break
+
+        cell_height = math.ceil(
+            max(cell_height, min(config.cell_height, max_cell_height))
+        )
+        fig_height = max(
+            fig_height, math.ceil(table_offset + sheet_size * cell_height)
+        )
+        fitted = replace(
+            config,
+            cell_font_size=font_size,
+            cell_height=cell_height,
+            fig_size=(fig_width, fig_height),
+        )
+        if fitted != config:
+            logging.info(
+                f"Fitted sheet layout to the facts: cell_font_size "
+                f"{fitted.cell_font_size}, cell_height {fitted.cell_height}, "
+                f"fig_size {fitted.fig_size}"
+            )
+        return fitted
 
     @staticmethod
     def draw_table(
-        sheet: pd.DataFrame, config: Config, export_path: Path, title: str
+        sheet: Union[Sheet, "pd.DataFrame"],
+        config: Config,
+        export_path: Path,
+        title: str,
     ) -> bool:
         """
         Write a bingo sheet to a file
@@ -51,8 +403,8 @@ class SheetDrawer:
             sheet: Bingo sheet
             config: Drawer config
             export_path: Location to save file to (end of the path needs to
-            end with and extension specified in class variable
-            SUPPORTED_EXPORT_FORMATS)
+            end with and extension supported by the backend in class variable
+            SUPPORTED_BACKENDS)
             title: Title that will be shown above the table
 
         Returns:
@@ -60,44 +412,461 @@ class SheetDrawer:
             to the specified export_path
         """
 
-        if export_path.suffix not in SheetDrawer.SUPPORTED_EXPORT_FORMATS:
+        with SheetDrawer.Session(config) as session:
+            return session.draw(sheet=sheet, title=title, path=export_path)
+
+    @staticmethod
+    def render(
+        sheet: Union[Sheet, "pd.DataFrame"],
+        config: Config,
+        export_format: str,
+        title: str,
+    ) -> Optional[bytes]:
+        """
+        Render a bingo sheet into the content of a file, without writing it
+
+        Arguments:
+            sheet: Bingo sheet
+            config: Drawer config
+            export_format: Extension of the file format, e.g. ".pdf" (needs to
+            be supported by the backend in class variable SUPPORTED_BACKENDS)
+            title: Title that will be shown above the table
+
+        Returns:
+            Content of the file. None if the backend or format is unsupported
+        """
+
+        with SheetDrawer.Session(config) as session:
+            return session.render(
+                sheet=sheet, title=title, export_format=export_format
+            )
+
+    @staticmethod
+    def _is_supported(config: Config, export_format: str) -> bool:
+        """
+        Check that the backend of a drawer config exists and supports an
+        export format
+
+        Arguments:
+            config: Drawer config
+            export_format: Extension of the file format, e.g. ".pdf"
+
+        Returns:
+            Boolean on whether sheets can be drawn in the export format
+        """
+        if config.backend not in SheetDrawer.SUPPORTED_BACKENDS:
+            logging.error(
+                f"Unknown backend {config.backend}. "
+                f"Supported backends: {set(SheetDrawer.SUPPORTED_BACKENDS)}"
+            )
+            return False
+
+        supported_formats = SheetDrawer.SUPPORTED_BACKENDS[config.backend]
+        if export_format not in supported_formats:
             logging.error(
-                f"Failed to draw bingo sheet at {export_path}. "
-                f"Export path has invalid extension {export_path.suffix}. "
-                f"Supported extentions: {SheetDrawer.SUPPORTED_EXPORT_FORMATS}"
+                f"Invalid export format {export_format}. "
+                f"Supported extentions: {supported_formats}"
             )
             return False
+        return True
+
+    @staticmethod
+    def draw_many(
+        jobs: Iterable[Job], config: Config, workers: int = 1
+    ) -> Iterator[Result]:
+        """
+        Write many bingo sheets to files, optionally in parallel
+
+        With more than one worker the sheets are drawn in a pool of processes.
+        Each process keeps its export engine running for all the sheets it
+        draws. A failure to draw a sheet is reported in its result instead of
+        stopping the remaining sheets.
 
-        # Disable prints because the drawing of the sheet has a lot of verbose
-        sys.stdout = open(os.devnull, "w")
-
-        fig = df2img.plot_dataframe(
-            sheet,
-            print_index=False,
-            tbl_header_visible=True,
-            title=dict(
-                font_color="black",
-                font_family=config.title_font,
-                font_size=config.title_font_size,
-                text=title,
+        Arguments:
+            jobs: Bingo sheets to draw
+            config: Drawer config
+            workers: Number of processes used to draw the sheets
+
+        Returns:
+            Iterator over the result of every job, in order of completion
+        """
+
+        if workers <= 1:
+            with SheetDrawer.Session(config) as session:
+                for job in jobs:
+                    yield SheetDrawer._draw_job(job=job, session=session)
+            return
+
+        max_in_flight = workers * SheetDrawer._JOBS_IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=SheetDrawer._init_worker,
+            initargs=(config,),
+        ) as pool:
+            in_flight = set()
+            for job in jobs:
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(
+                        in_flight, return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield future.result()
+                in_flight.add(
+                    pool.submit(
+                        SheetDrawer._draw_job,
+                        job=SheetDrawer._process_job(job),
+                    )
+                )
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    @staticmethod
+    def draw_document(
+        jobs: Iterable[Job],
+        config: Config,
+        export_path: Path,
+        sheets_per_document: int = 0,
+    ) -> Iterator[Result]:
+        """
+        Write many bingo sheets as the pages of multi-page PDF documents
+
+        The sheets are streamed into the document(s) one at a time so memory
+        use does not grow with the number of sheets. Each document starts
+        with an index of the pages of every bookmark name. The export_path of
+        the jobs is ignored. Always uses the "pdf" backend.
+
+        Arguments:
+            jobs: Bingo sheets to draw
+            config: Drawer config
+            export_path: Location to save the document to. With
+            sheets_per_document the documents are numbered, e.g.
+            sheets_001.pdf, sheets_002.pdf, ...
+            sheets_per_document: Maximum number of sheets per document. 0 to
+            put all sheets into a single document
+
+        Returns:
+            Iterator over the result of every job, in the order of the jobs
+        """
+
+        def render(job: SheetDrawer.Job) -> PdfDocumentWriter.Page:
+            with Instrumentation.stage("render_pdf"):
+                header, rows = SheetDrawer._table(job.sheet)
+                return PdfDocumentWriter.render_page(
+                    config=config, header=header, rows=rows, title=job.title
+                )
+
+        return SheetDrawer._write_documents(
+            pages=(
+                (
+                    job.title if job.bookmark is None else job.bookmark,
+                    lambda job=job: render(job),
+                )
+                for job in jobs
             ),
-            tbl_header=dict(
-                align="center",
-                line_color="black",
+            config=config,
+            export_path=export_path,
+            sheets_per_document=sheets_per_document,
+        )
+
+    @staticmethod
+    def assemble_document(
+        pages: Iterable[Tuple[str, PdfDocumentWriter.Page]],
+        config: Config,
+        export_path: Path,
+        sheets_per_document: int = 0,
+    ) -> Iterator[Result]:
+        """
+        Write rendered pages into multi-page PDF documents, see draw_document
+
+        Arguments:
+            pages: Bookmark name and rendered page of every bingo sheet, e.g.
+            read from the files saved by write_pages
+            config: Drawer config the pages were rendered with
+            export_path: Location to save the document to
+            sheets_per_document: Maximum number of sheets per document. 0 to
+            put all sheets into a single document
+
+        Returns:
+            Iterator over the result of every page, in the order of the pages
+        """
+        return SheetDrawer._write_documents(
+            pages=(
+                (bookmark, lambda page=page: page) for bookmark, page in pages
             ),
-            tbl_cells=dict(
-                font_family=config.cell_font,
-                font_size=config.cell_font_size,
-                height=config.cell_height,
-                align="center",
-                line_color="black",
+            config=config,
+            export_path=export_path,
+            sheets_per_document=sheets_per_document,
+        )
+
+    @staticmethod
+    def _write_documents(
+        pages: Iterable[Tuple[str, Callable[[], PdfDocumentWriter.Page]]],
+        config: Config,
+        export_path: Path,
+        sheets_per_document: int,
+    ) -> Iterator[Result]:
+        """
+        Write pages into multi-page PDF documents, opening a new document
+        whenever the current one is full
+
+        Arguments:
+            pages: Bookmark name of every page and a function returning the
+            page. Errors raised by the function fail only that page
+            config: Drawer config
+            export_path: Location to save the document to
+            sheets_per_document: Maximum number of sheets per document. 0 to
+            put all sheets into a single document
+
+        Returns:
+            Iterator over the result of every page, in the order of the pages.
+            Every page fails if export_path does not end with .pdf
+        """
+
+        if export_path.suffix != ".pdf":
+            for _ in pages:
+                yield SheetDrawer.Result(
+                    export_path=export_path,
+                    success=False,
+                    error="Multi-page documents can only be exported as .pdf",
+                )
+            return
+
+        writer: Optional[PdfDocumentWriter] = None
+        num_documents = 0
+        try:
+            for bookmark, get_page in pages:
+                if writer is None or (
+                    sheets_per_document > 0
+                    and writer.num_sheets >= sheets_per_document
+                ):
+                    if writer is not None:
+                        writer.close()
+                    num_documents += 1
+                    path = export_path
+                    if sheets_per_document > 0:
+                        path = export_path.with_name(
+                            f"{export_path.stem}_{num_documents:03d}.pdf"
+                        )
+                    writer = PdfDocumentWriter(path=path, config=config)
+                try:
+                    writer.add_page(page=get_page(), bookmark=bookmark)
+                except Exception as e:
+                    yield SheetDrawer.Result(
+                        export_path=writer.path,
+                        success=False,
+                        error=f"{type(e).__name__}: {e}",
+                    )
+                    continue
+                yield SheetDrawer.Result(export_path=writer.path, success=True)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @staticmethod
+    def write_pages(
+        jobs: Iterable[Job], config: Config, pages_path: Path
+    ) -> Iterator[Result]:
+        """
+        Render bingo sheets as document pages and save them to a JSON lines
+        file, to be assembled into documents later by assemble_document
+        (e.g. after rendering the pages in several processes or machines).
+        The export_path of the jobs is ignored
+
+        Arguments:
+            jobs: Bingo sheets to draw
+            config: Drawer config
+            pages_path: Location to save the pages to
+
+        Returns:
+            Iterator over the result of every job, in the order of the jobs
+        """
+        with open(pages_path, "w", encoding="utf-8") as file:
+            for job in jobs:
+                try:
+                    with Instrumentation.stage("render_pdf"):
+                        header, rows = SheetDrawer._table(job.sheet)
+                        page = PdfDocumentWriter.render_page(
+                            config=config,
+                            header=header,
+                            rows=rows,
+                            title=job.title,
+                        )
+                    with Instrumentation.stage("write"):
+                        record = {
+                            "bookmark": (
+                                job.title
+                                if job.bookmark is None
+                                else job.bookmark
+                            ),
+                            "header": page.header,
+                            "row_heights": page.row_heights,
+                            "text": page.text.decode("latin-1"),
+                        }
+                        file.write(json.dumps(record) + "\n")
+                except Exception as e:
+                    yield SheetDrawer.Result(
+                        export_path=pages_path,
+                        success=False,
+                        error=f"{type(e).__name__}: {e}",
+                    )
+                    continue
+                yield SheetDrawer.Result(export_path=pages_path, success=True)
+
+    @staticmethod
+    def read_pages(
+        pages_path: Path,
+    ) -> Iterator[Tuple[str, PdfDocumentWriter.Page]]:
+        """
+        Read the pages saved by write_pages, one at a time
+
+        Arguments:
+            pages_path: Location of the pages file
+
+        Returns:
+            Iterator over the bookmark name and page of every bingo sheet
+        """
+        with open(pages_path, "r", encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                yield (
+                    record["bookmark"],
+                    PdfDocumentWriter.Page(
+                        header=tuple(record["header"]),
+                        row_heights=tuple(record["row_heights"]),
+                        text=record["text"].encode("latin-1"),
+                    ),
+                )
+
+    @staticmethod
+    def _process_job(job: Job) -> Job:
+        """
+        Prepare a job to be sent to a drawing process. Sheets are compacted
+        (see Sheet.compact) so that only their own facts are pickled
+
+        Arguments:
+            job: Bingo sheet to draw
+
+        Returns:
+            Job with the same cells, title and export path
+        """
+        if not isinstance(job.sheet, Sheet):
+            return job
+        return replace(job, sheet=job.sheet.compact())
+
+    @staticmethod
+    def _draw_job(job: Job, session: Optional[Session] = None) -> Result:
+        """
+        Draw a single job, catching any error raised while drawing it
+
+        Arguments:
+            job: Bingo sheet to draw
+            session: Drawing session. None to use the session of the
+            drawing process (see _init_worker)
+
+        Returns:
+            Result of drawing the job
+        """
+        if session is None:
+            session = SheetDrawer._worker_session
+        assert session is not None, "Drawing process not initialised"
+        try:
+            success = session.draw(
+                sheet=job.sheet, title=job.title, path=job.export_path
+            )
+        except Exception as e:
+            return SheetDrawer.Result(
+                export_path=job.export_path,
+                success=False,
+                error=f"{type(e).__name__}: {e}",
+            )
+        return SheetDrawer.Result(
+            export_path=job.export_path,
+            success=success,
+            error=(
+                None
+                if success
+                else "Unsupported backend or export path extension"
             ),
-            fig_size=config.fig_size,
         )
 
-        df2img.save_dataframe(fig=fig, filename=str(export_path))
+    @staticmethod
+    def _table(
+        sheet: Union[Sheet, "pd.DataFrame"],
+    ) -> Tuple[List[str], List[List[str]]]:
+        """
+        Header labels and cell facts of a bingo sheet
+
+        Arguments:
+            sheet: Bingo sheet
 
-        # Revert standard output back to normal
-        sys.stdout = sys.__stdout__
+        Returns:
+            A tuple where the first element is the list of header labels and
+            the second element holds the facts of every cell, one list per row
+        """
+        if isinstance(sheet, Sheet):
+            return (sheet.header, sheet.rows)
+        return ([str(col) for col in sheet.columns], sheet.values.tolist())
 
-        return True
+    @staticmethod
+    def _init_worker(config: Config) -> None:
+        """
+        Initialise a drawing process with a session that draws all the
+        bingo sheets of the process, and start its export engine so that it
+        is already running when the first bingo sheet arrives
+
+        Arguments:
+            config: Drawer config
+        """
+        SheetDrawer._worker_session = SheetDrawer.Session(config)
+        SheetDrawer._worker_session.start()
+
+    @staticmethod
+    def _plot(
+        sheet: Union[Sheet, "pd.DataFrame"], config: Config, title: str
+    ) -> "go.Figure":
+        """
+        Plot a bingo sheet with df2img
+
+        Arguments:
+            sheet: Bingo sheet
+            config: Drawer config
+            title: Title that will be shown above the table
+
+        Returns:
+            Plotly figure of the bingo sheet
+        """
+
+        import df2img
+
+        if isinstance(sheet, Sheet):
+            with Instrumentation.stage("dataframe"):
+                sheet = sheet.to_dataframe()
+
+        with Instrumentation.stage("plot"):
+            fig = df2img.plot_dataframe(
+                sheet,
+                print_index=False,
+                show_fig=False,
+                tbl_header_visible=True,
+                title=dict(
+                    font_color="black",
+                    font_family=config.title_font,
+                    font_size=config.title_font_size,
+                    text=title,
+                ),
+                tbl_header=dict(
+                    align="center",
+                    line_color="black",
+                ),
+                tbl_cells=dict(
+                    font_family=config.cell_font,
+                    font_size=config.cell_font_size,
+                    height=config.cell_height,
+                    align="center",
+                    line_color="black",
+                ),
+                fig_size=config.fig_size,
+            )
+        return fig
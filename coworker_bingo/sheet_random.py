@@ -0,0 +1,140 @@
+import hashlib
+import numpy as np
+
+from typing import List, Union
+
+
+class SheetRandom:
+    """
+    Counter-based pseudorandom numbers for bingo sheets
+
+    Every sheet has its own random streams, one per random decision, keyed by
+    the random seed, the name of the participant and the set index only. The
+    n-th number of a stream is a hash (SplitMix64) of the stream key and n, so
+    any number of any sheet can be computed directly, in any order and in any
+    process, without drawing the numbers that come before it. All methods are
+    vectorised over sheets.
+    """
+
+    # Streams of a sheet
+    GENERIC_FACTS: int = 0
+    OWNERS: int = 1
+    OWNER_FACTS: int = 2
+    OWNER_ORDER: int = 3
+    # Streams shared by all sheets, keyed by the names of the owners
+    OWNER_CYCLE: int = 4
+    NON_OWNER_CYCLE: int = 5
+    FIRST_OWNER_FACT: int = 6
+
+    _GAMMA = np.uint64(0x9E3779B97F4A7C15)
+    _MULTIPLIER_1 = np.uint64(0xBF58476D1CE4E5B9)
+    _MULTIPLIER_2 = np.uint64(0x94D049BB133111EB)
+
+    @staticmethod
+    def name_key(name: str) -> int:
+        """
+        Stable 64 bit key of a participant name, identical across processes
+        and machines (unlike hash)
+
+        Arguments:
+            name -- Name of the participant
+
+        Returns:
+            Aforementioned quantity
+        """
+        digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    @staticmethod
+    def name_keys(names: List[str]) -> np.ndarray:
+        """
+        Stable 64 bit keys of participant names
+
+        Arguments:
+            names -- Names of the participants
+
+        Returns:
+            Array of the key of every name
+        """
+        return np.array(
+            [SheetRandom.name_key(name) for name in names], dtype=np.uint64
+        )
+
+    @staticmethod
+    def mix(values: np.ndarray) -> np.ndarray:
+        """
+        SplitMix64 finaliser, a bijection of 64 bit integers that spreads
+        every input bit over all output bits
+
+        Arguments:
+            values -- Array of 64 bit integers
+
+        Returns:
+            Mixed copy of values
+        """
+        z = values.astype(np.uint64)
+        with np.errstate(over="ignore"):
+            z ^= z >> np.uint64(30)
+            z *= SheetRandom._MULTIPLIER_1
+            z ^= z >> np.uint64(27)
+            z *= SheetRandom._MULTIPLIER_2
+            z ^= z >> np.uint64(31)
+        return z
+
+    @staticmethod
+    def stream_keys(
+        seed: int,
+        name_keys: np.ndarray,
+        set_idx: Union[int, np.ndarray],
+        stream: int,
+    ) -> np.ndarray:
+        """
+        Keys of a random stream of every sheet
+
+        Arguments:
+            seed -- Random seed
+            name_keys -- Name key of the participant of every sheet
+            set_idx -- Set index of every sheet, or of all sheets
+            stream -- Random decision the stream is used for
+
+        Returns:
+            Array with the stream key of every sheet
+        """
+        seed_key = SheetRandom.mix(np.array(seed % (1 << 64), np.uint64))
+        keys = SheetRandom.mix(name_keys ^ seed_key)
+        keys = SheetRandom.mix(keys ^ np.asarray(set_idx, dtype=np.uint64))
+        return SheetRandom.mix(keys ^ np.uint64(stream))
+
+    @staticmethod
+    def uniform(keys: np.ndarray, n: int) -> np.ndarray:
+        """
+        First n numbers of every stream, uniform in [0, 1)
+
+        Arguments:
+            keys -- Stream keys
+            n -- Number of numbers per stream
+
+        Returns:
+            Array of shape (len(keys), n)
+        """
+        counters = np.arange(1, n + 1, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            z = keys[:, None] + counters * SheetRandom._GAMMA
+        return (SheetRandom.mix(z) >> np.uint64(11)) * (1.0 / (1 << 53))
+
+    @staticmethod
+    def integers(
+        keys: np.ndarray, n: int, high: Union[int, np.ndarray]
+    ) -> np.ndarray:
+        """
+        First n numbers of every stream, as integers in [0, high)
+
+        Arguments:
+            keys -- Stream keys
+            n -- Number of numbers per stream
+            high -- Exclusive upper bound, broadcast against the output
+
+        Returns:
+            Array of shape (len(keys), n)
+        """
+        return (SheetRandom.uniform(keys, n) * high).astype(np.int64)
@@ -0,0 +1,399 @@
+import logging
+import math
+import numpy as np
+
+from .bingo_sheet_generator import BingoSheetGenerator
+from .fact_table import FactTable
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+
+class GameSimulator:
+    """
+    Methods and dataclasses to simulate many games of bingo with the
+    generated sheets, e.g. to choose the sheet size, the specific fact cells
+    or the length of the game for a number of participants
+
+    In every game, every player talks to one random participant after
+    another. A generic fact applies to the participant with some
+    probability, a specific fact only if the participant is its owner, so
+    the number of conversations until a cell can be marked is geometrically
+    distributed. Specific facts of participants who miss the game cannot be
+    found by anyone. A line is complete after the conversation its last cell
+    is marked in, so the marks of all players in all games follow from the
+    number of conversations of every cell, without stepping through the
+    games. Games are simulated in chunks of (cells, games, players) arrays
+    of conversation counts, drawn by looking random 16-bit integers up in
+    the inverse distribution function of every kind of cell.
+    """
+
+    @dataclass
+    class Config:
+        """
+        Configuration of the simulation
+
+        Attributes:
+            num_games: Number of simulated games. Game i is played with the
+            sheets of set i % number of sets
+            game_minutes: Length of a game, lines completed later do not
+            count
+            conversation_minutes: Time a player talks to every participant
+            generic_match: Probability that a generic fact applies to a
+            participant
+            specific_match: Probability that a player talks to the owner of
+            a specific fact in a conversation. None for a random participant
+            out of all others
+            absent_fraction: Probability that the owner of a specific fact
+            misses a game, the same for all players of the game
+            seed: Random seed
+        """
+
+        num_games: int = 10_000
+        game_minutes: float = 30.0
+        conversation_minutes: float = 2.0
+        generic_match: float = 0.2
+        specific_match: Optional[float] = None
+        absent_fraction: float = 0.05
+        seed: int = 0
+
+        @property
+        def game_conversations(self) -> int:
+            """
+            Number of conversations of a player in a game
+
+            Returns:
+                Aforementioned quantity
+            """
+            return int(self.game_minutes // self.conversation_minutes)
+
+        def is_valid(self) -> bool:
+            """
+            Check the configuration
+
+            Returns:
+                Boolean on whether the configuration is valid
+            """
+            if self.num_games < 1:
+                logging.error("Number of games must be at least 1.")
+                return False
+            if self.conversation_minutes <= 0 or self.game_minutes <= 0:
+                logging.error(
+                    "Game and conversation minutes must be positive."
+                )
+                return False
+            if self.game_conversations >= GameSimulator.NEVER:
+                logging.error(
+                    "A game can have at most "
+                    f"{GameSimulator.NEVER - 1} conversations."
+                )
+                return False
+            probabilities = [self.generic_match, self.absent_fraction]
+            if self.specific_match is not None:
+                probabilities.append(self.specific_match)
+            if not all(0 <= p <= 1 for p in probabilities):
+                logging.error("Probabilities must be between 0 and 1.")
+                return False
+            return True
+
+    @dataclass
+    class Result:
+        """
+        Outcome of the simulated games
+
+        Attributes:
+            num_players: Number of players in every game
+            game_minutes: Length of every game
+            first_line_minutes: Time the first line of every game was
+            completed, also if after the end of the game. inf if no line is
+            completed after NEVER - 1 conversations
+            winners: Number of players with a completed line at the end of
+            every game
+            lines_histogram: Number of players over all games by the number
+            of lines completed at the end of the game
+            player_first_line_histogram: Number of players over all games by
+            the minute they completed their first line. The last bin counts
+            the players without a line at the end of the game
+        """
+
+        num_players: int
+        game_minutes: float
+        first_line_minutes: np.ndarray
+        winners: np.ndarray
+        lines_histogram: np.ndarray
+        player_first_line_histogram: np.ndarray
+
+        @property
+        def num_games(self) -> int:
+            """
+            Number of simulated games
+
+            Returns:
+                Aforementioned quantity
+            """
+            return len(self.first_line_minutes)
+
+        @property
+        def mean_lines(self) -> float:
+            """
+            Mean number of lines a player completes in a game
+
+            Returns:
+                Aforementioned quantity
+            """
+            lines = np.arange(len(self.lines_histogram))
+            return float(
+                (lines * self.lines_histogram).sum()
+                / self.lines_histogram.sum()
+            )
+
+        @property
+        def no_winner_fraction(self) -> float:
+            """
+            Fraction of the games that end without any completed line
+
+            Returns:
+                Aforementioned quantity
+            """
+            return float((self.winners == 0).mean())
+
+        def summary(self) -> List[str]:
+            """
+            Description of the distributions, one line per distribution
+
+            Returns:
+                Aforementioned quantity
+            """
+            first = np.quantile(
+                self.first_line_minutes, [0.1, 0.5, 0.9], method="inverted_cdf"
+            )
+            winners = np.quantile(
+                self.winners, [0.1, 0.5, 0.9], method="inverted_cdf"
+            )
+            total = self.lines_histogram.sum()
+            lines = ", ".join(
+                f"{count}: {100 * num / total:.1f}%"
+                for count, num in enumerate(self.lines_histogram)
+                if num > 0
+            )
+            with_line = np.cumsum(self.player_first_line_histogram[:-1])
+            half = np.searchsorted(with_line, total / 2)
+            player_first = (
+                f"half of the players have a line after {half + 1} minutes"
+                if half < len(with_line)
+                else "most players have no line at the end of the game"
+            )
+            return [
+                f"Simulated {self.num_games} games of {self.game_minutes:g} "
+                f"minutes with {self.num_players} players",
+                f"First line after {first[1]:.1f} minutes (10%: "
+                f"{first[0]:.1f}, 90%: {first[2]:.1f}), no line in "
+                f"{100 * self.no_winner_fraction:.1f}% of the games",
+                f"Players with a line at the end: {winners[1]:g} (10%: "
+                f"{winners[0]:g}, 90%: {winners[2]:g}), {player_first}",
+                f"Lines per player at the end: {lines} (mean "
+                f"{self.mean_lines:.2f})",
+            ]
+
+    # Number of conversations of cells that are never marked, and of lines
+    # that are never completed
+    NEVER: int = 255
+    # Max number of (cell, game, player) elements simulated at once
+    _CHUNK_ELEMENTS: int = 1 << 22
+
+    @staticmethod
+    def simulate(
+        batch: BingoSheetGenerator.Batch,
+        config: BingoSheetGenerator.Config,
+        simulation_config: Config = Config(),
+    ) -> "GameSimulator.Result":
+        """
+        Simulate games played with a batch of generated sheets
+
+        Arguments:
+            batch -- Generated bingo sheets. Every participant plays
+            config -- Bingo sheet config the batch was generated with
+            simulation_config -- Configuration of the simulation
+
+        Returns:
+            Outcome of the simulated games
+        """
+        num_players, num_sets, num_cells = batch.fact_ids.shape
+        num_games = simulation_config.num_games
+        sheet_size = config.sheet_size
+        num_lines = 2 * sheet_size + 2
+        game_conversations = simulation_config.game_conversations
+        minutes = simulation_config.conversation_minutes
+
+        specific_cells = np.array(
+            sorted(config.specific_fact_indexes), dtype=np.intp
+        )
+        is_specific = np.zeros(num_cells, dtype=bool)
+        is_specific[specific_cells] = True
+        specific_match = simulation_config.specific_match
+        if specific_match is None:
+            specific_match = 1 / max(1, num_players - 1)
+        generic_table = GameSimulator._conversations_table(
+            simulation_config.generic_match
+        )
+        specific_table = GameSimulator._conversations_table(specific_match)
+
+        # Cell and player of every specific fact of every set, and the index
+        # of the fact among the specific facts of the set
+        specific_positions = []
+        for set_idx in range(num_sets):
+            facts = batch.fact_ids[:, set_idx, specific_cells].T
+            unique_facts, fact_index = np.unique(facts, return_inverse=True)
+            cells, players = np.indices(facts.shape)
+            specific_positions.append(
+                (
+                    len(unique_facts),
+                    fact_index.ravel(),
+                    specific_cells[cells.ravel()],
+                    players.ravel(),
+                )
+            )
+
+        diagonals = np.array(
+            [
+                np.arange(sheet_size) * (sheet_size + 1),
+                (np.arange(sheet_size) + 1) * (sheet_size - 1),
+            ]
+        )
+        last_minute = math.ceil(simulation_config.game_minutes)
+        rng = np.random.default_rng(simulation_config.seed)
+        first_line = np.empty(num_games, dtype=np.uint8)
+        winners = np.empty(num_games, dtype=np.int64)
+        lines_histogram = np.zeros(num_lines + 1, dtype=np.int64)
+        player_first_line_histogram = np.zeros(last_minute + 1, dtype=np.int64)
+
+        chunk = max(
+            1, GameSimulator._CHUNK_ELEMENTS // max(1, num_players * num_cells)
+        )
+        for start in range(0, num_games, chunk):
+            games = np.arange(start, min(start + chunk, num_games))
+            # Conversations until every cell is marked, of shape (cells,
+            # games, players) so that the cells of a line are contiguous
+            shape = (num_cells, len(games), num_players)
+            random = np.frombuffer(
+                rng.bytes(2 * math.prod(shape)), dtype=np.uint16
+            ).reshape(shape)
+            conversations = np.empty(shape, dtype=np.uint8)
+            for cell in range(num_cells):
+                table = specific_table if is_specific[cell] else generic_table
+                np.take(table, random[cell], out=conversations[cell])
+
+            if simulation_config.absent_fraction > 0:
+                for game_idx, game in enumerate(games):
+                    num_facts, fact_index, cells, players = specific_positions[
+                        game % num_sets
+                    ]
+                    absent = (
+                        rng.random(num_facts)
+                        < simulation_config.absent_fraction
+                    )
+                    missed = absent[fact_index]
+                    conversations[cells[missed], game_idx, players[missed]] = (
+                        GameSimulator.NEVER
+                    )
+
+            # Conversation the rows, columns and diagonals are completed
+            # after, in the order of Scoreboard.line_masks
+            grid = conversations.reshape(
+                sheet_size, sheet_size, len(games), num_players
+            )
+            line_conversations = np.concatenate(
+                [
+                    grid.max(axis=1),
+                    grid.max(axis=0),
+                    conversations[diagonals].max(axis=1),
+                ]
+            )
+            player_first = line_conversations.min(axis=0)
+            first_line[games] = player_first.min(axis=1)
+            lines = (line_conversations <= game_conversations).sum(axis=0)
+            winners[games] = (lines > 0).sum(axis=1)
+            lines_histogram += np.bincount(
+                lines.ravel(), minlength=num_lines + 1
+            )
+            minute = np.minimum(
+                (np.arange(GameSimulator.NEVER + 1) * minutes).astype(
+                    np.int64
+                ),
+                last_minute - 1,
+            )
+            minute[game_conversations + 1 :] = last_minute
+            player_first_line_histogram += np.bincount(
+                minute[player_first.ravel()], minlength=last_minute + 1
+            )
+
+        first_line_minutes = first_line * np.float32(minutes)
+        first_line_minutes[first_line == GameSimulator.NEVER] = np.inf
+        return GameSimulator.Result(
+            num_players=num_players,
+            game_minutes=simulation_config.game_minutes,
+            first_line_minutes=first_line_minutes,
+            winners=winners,
+            lines_histogram=lines_histogram,
+            player_first_line_histogram=player_first_line_histogram,
+        )
+
+    @staticmethod
+    def _conversations_table(probability: float) -> np.ndarray:
+        """
+        Inverse distribution function of the number of conversations until
+        a cell is marked, evaluated at every 16-bit random integer
+
+        Arguments:
+            probability -- Probability that a cell is marked after a
+            conversation
+
+        Returns:
+            Number of conversations for every 16-bit random integer, NEVER
+            for counts that do not fit
+        """
+        uniform = (np.arange(2**16) + 0.5) / 2**16
+        if probability >= 1:
+            return np.ones(2**16, dtype=np.uint8)
+        if probability <= 0:
+            return np.full(2**16, GameSimulator.NEVER, dtype=np.uint8)
+        conversations = np.ceil(np.log1p(-uniform) / np.log1p(-probability))
+        return np.clip(conversations, 1, GameSimulator.NEVER).astype(np.uint8)
+
+    @staticmethod
+    def simulate_data(
+        config: BingoSheetGenerator.Config,
+        data: Union[BingoSheetGenerator.Data, FactTable],
+        simulation_config: Config = Config(),
+        num_sets: int = 1,
+    ) -> Optional["GameSimulator.Result"]:
+        """
+        Generate the sheets of all participants and simulate games played
+        with them
+
+        Arguments:
+            config -- Bingo sheet config
+            data -- Bingo sheet data, or the same data already interned in a
+            FactTable
+            simulation_config -- Configuration of the simulation
+            num_sets -- Number of sheets generated per participant
+
+        Returns:
+            Outcome of the simulated games. None if the sheets could not be
+            generated
+        """
+        if isinstance(data, FactTable):
+            participants = sorted(data.owners)
+        else:
+            participants = sorted(data.specific_facts)
+        batch = BingoSheetGenerator.generate_batch(
+            participants=participants,
+            config=config,
+            data=data,
+            num_sets=num_sets,
+        )
+        if batch is None:
+            logging.error("Failed to generate bingo sheets to simulate.")
+            return None
+        return GameSimulator.simulate(
+            batch=batch, config=config, simulation_config=simulation_config
+        )
@@ -0,0 +1,155 @@
+import functools
+
+from typing import Dict, List
+
+
+# Glyph widths (in 1/1000 of the font size) of the printable ASCII characters
+# (space to tilde) of the standard PDF fonts, taken from the Adobe font
+# metrics files
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333,
+    278, 278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278,
+    584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778, 722, 278,
+    500, 667, 556, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944,
+    667, 667, 611, 278, 278, 278, 469, 556, 333, 556, 556, 500, 556, 556,
+    278, 556, 556, 222, 222, 500, 222, 833, 556, 556, 556, 556, 333, 500,
+    278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]  # fmt: skip
+_TIMES_ROMAN_WIDTHS = [
+    250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333,
+    250, 278, 500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278,
+    564, 564, 564, 444, 921, 722, 667, 667, 722, 611, 556, 722, 722, 333,
+    389, 722, 611, 889, 722, 722, 556, 722, 667, 556, 611, 722, 722, 944,
+    722, 722, 611, 333, 278, 333, 469, 500, 333, 444, 500, 444, 500, 444,
+    333, 500, 500, 278, 278, 500, 278, 778, 500, 500, 500, 500, 333, 389,
+    278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,
+]  # fmt: skip
+_COURIER_WIDTHS = [600] * len(_HELVETICA_WIDTHS)
+
+
+class TextLayout:
+    """
+    Methods to measure and wrap text using the metrics of the standard PDF
+    fonts
+    """
+
+    DEFAULT_FONT: str = "Helvetica"
+
+    # Lower case font family names and the standard PDF font used for them
+    FONT_ALIASES: Dict[str, str] = {
+        "arial": "Helvetica",
+        "helvetica": "Helvetica",
+        "sans-serif": "Helvetica",
+        "times": "Times-Roman",
+        "times new roman": "Times-Roman",
+        "times-roman": "Times-Roman",
+        "serif": "Times-Roman",
+        "courier": "Courier",
+        "courier new": "Courier",
+        "monospace": "Courier",
+    }
+
+    _FONT_WIDTHS: Dict[str, List[int]] = {
+        "Helvetica": _HELVETICA_WIDTHS,
+        "Times-Roman": _TIMES_ROMAN_WIDTHS,
+        "Courier": _COURIER_WIDTHS,
+    }
+
+    @staticmethod
+    def resolve_font(font: str) -> str:
+        """
+        Get the standard PDF font that is used to render a font family
+
+        Arguments:
+            font -- Name of the font family (e.g. Arial)
+
+        Returns:
+            Name of the standard PDF font. DEFAULT_FONT if the font family is
+            unknown
+        """
+        return TextLayout.FONT_ALIASES.get(
+            font.strip().lower(), TextLayout.DEFAULT_FONT
+        )
+
+    @staticmethod
+    def text_width(text: str, font: str, font_size: float) -> float:
+        """
+        Width of a single line of text
+
+        Arguments:
+            text -- Line of text
+            font -- Name of the font family
+            font_size -- Font size
+
+        Returns:
+            Width of the text in the same unit as the font size
+        """
+        widths = TextLayout._FONT_WIDTHS[TextLayout.resolve_font(font)]
+        # Characters outside of printable ASCII are measured as a digit
+        fallback = widths[ord("0") - 32]
+        total = 0
+        for char in text:
+            code = ord(char) - 32
+            total += widths[code] if 0 <= code < len(widths) else fallback
+        return total * font_size / 1000
+
+    @staticmethod
+    def wrap(
+        text: str, font: str, font_size: float, max_width: float
+    ) -> List[str]:
+        """
+        Break text into lines that fit into a given width
+
+        Lines are broken between words. Words that are wider than max_width
+        on their own are broken between characters.
+
+        Arguments:
+            text -- Text to wrap
+            font -- Name of the font family
+            font_size -- Font size
+            max_width -- Maximum width of a line
+
+        Returns:
+            Lines of text
+        """
+        lines: List[str] = []
+        line = ""
+        for word in text.split():
+            candidate = f"{line} {word}" if line else word
+            if TextLayout.text_width(candidate, font, font_size) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = ""
+            for char in word:
+                if line and (
+                    TextLayout.text_width(line + char, font, font_size)
+                    > max_width
+                ):
+                    lines.append(line)
+                    line = ""
+                line += char
+        if line:
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
+    def num_lines(
+        text: str, font: str, font_size: float, max_width: float
+    ) -> int:
+        """
+        Number of lines text is wrapped into. Memoized, so every unique text
+        is only measured once per font, font size and width
+
+        Arguments:
+            text -- Text to wrap
+            font -- Name of the font family
+            font_size -- Font size
+            max_width -- Maximum width of a line
+
+        Returns:
+            Number of lines returned by wrap
+        """
+        return len(TextLayout.wrap(text, font, font_size, max_width))
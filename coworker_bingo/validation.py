@@ -0,0 +1,492 @@
+import logging
+import numpy as np
+import os
+
+from .fact_table import FactTable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .bingo_sheet_generator import BingoSheetGenerator
+
+
+class Validator:
+    """
+    Checks of the config, the input data and the generated bingo sheets
+
+    Every check runs over whole arrays of the interned data (see FactTable)
+    instead of looping over participants, facts or sheets in Python, and
+    all checks always run, so that a report lists every violation at once
+    instead of only the first one.
+    """
+
+    # Number of offending items quoted per violation
+    MAX_EXAMPLES: int = 5
+
+    # Violations that fail the validation, and ones that are only reported
+    ERROR: str = "error"
+    WARNING: str = "warning"
+
+    @dataclass
+    class Violation:
+        """
+        A constraint that does not hold
+
+        Attributes:
+            check: Name of the violated constraint
+            message: Description of the violation
+            count: Number of offending items (facts, participants, sheets,
+            cells, ...)
+            examples: Up to MAX_EXAMPLES of the offending items
+            severity: ERROR if the violation fails the validation, WARNING
+            if it is only reported
+        """
+
+        check: str
+        message: str
+        count: int = 1
+        examples: List[str] = field(default_factory=list)
+        severity: str = "error"
+
+    @dataclass
+    class Report:
+        """
+        Outcome of a validation
+
+        Attributes:
+            violations: Every violated constraint
+        """
+
+        violations: List["Validator.Violation"] = field(default_factory=list)
+
+        @property
+        def is_valid(self) -> bool:
+            """
+            Boolean whether no constraint is violated, apart from warnings
+
+            Returns:
+                Aforementioned quantity
+            """
+            return all(
+                violation.severity != Validator.ERROR
+                for violation in self.violations
+            )
+
+        def add(
+            self,
+            check: str,
+            message: str,
+            count: int = 1,
+            examples: Iterable[object] = (),
+            severity: str = "error",
+        ) -> None:
+            """
+            Record a violated constraint
+
+            Arguments:
+                check -- Name of the violated constraint
+                message -- Description of the violation
+                count -- Number of offending items
+                examples -- Offending items, only the first MAX_EXAMPLES are
+                kept
+                severity -- ERROR or WARNING
+            """
+            quoted = []
+            for example in examples:
+                if len(quoted) >= Validator.MAX_EXAMPLES:
+                    break
+                quoted.append(repr(example))
+            self.violations.append(
+                Validator.Violation(
+                    check=check,
+                    message=message,
+                    count=count,
+                    examples=quoted,
+                    severity=severity,
+                )
+            )
+
+        def log(self) -> None:
+            """
+            Log every violation as an error or warning
+            """
+            for violation in self.violations:
+                examples = ""
+                if violation.examples:
+                    more = violation.count - len(violation.examples)
+                    examples = " e.g. " + ", ".join(violation.examples)
+                    if more > 0:
+                        examples += f" and {more} more"
+                log = (
+                    logging.error
+                    if violation.severity == Validator.ERROR
+                    else logging.warning
+                )
+                log(f"[{violation.check}] {violation.message}{examples}")
+
+    @staticmethod
+    def check_config(
+        config: "BingoSheetGenerator.Config",
+        report: Optional[Report] = None,
+    ) -> Report:
+        """
+        Check a bingo sheet config on its own
+
+        Arguments:
+            config -- Bingo sheet config
+            report -- Report to add the violations to. None for a new one
+
+        Returns:
+            Report with every violation
+        """
+        report = Validator.Report() if report is None else report
+        if config.sheet_size < 1:
+            report.add(
+                "sheet_size",
+                f"Sheet size must be at least 1, got {config.sheet_size}.",
+            )
+
+        indexes = np.fromiter(
+            config.specific_fact_indexes,
+            dtype=np.int64,
+            count=len(config.specific_fact_indexes),
+        )
+        invalid = indexes[(indexes < 0) | (indexes >= config.num_cells)]
+        if len(invalid) > 0:
+            report.add(
+                "specific_fact_indexes",
+                "Invalid specific fact indexes - Values should be >= 0 and < "
+                f"total number of bingo cells ({config.num_cells}).",
+                count=len(invalid),
+                examples=np.sort(invalid).tolist(),
+            )
+
+        if config.assignment not in config.SUPPORTED_ASSIGNMENTS:
+            report.add(
+                "assignment",
+                f"Invalid assignment {config.assignment} - Supported "
+                f"assignments: {config.SUPPORTED_ASSIGNMENTS}.",
+            )
+        return report
+
+    @staticmethod
+    def check_input(
+        config: "BingoSheetGenerator.Config",
+        data: "BingoSheetGenerator.Data",
+        participants: Optional[Iterable[str]] = None,
+        fact_table: Optional[FactTable] = None,
+    ) -> Report:
+        """
+        Check that the config and data can fill every sheet: valid config,
+        no blank or duplicated facts, no fact that could appear twice on a
+        sheet, and enough unique generic facts and owners of specific facts
+        for every participant once their own facts are excluded
+
+        Arguments:
+            config -- Bingo sheet config
+            data -- Bingo sheet data as read from the input files
+            participants -- Names of all participants. None for only the
+            participants that provided specific facts
+            fact_table -- The data already interned, None to intern it
+
+        Returns:
+            Report with every violation
+        """
+        report = Validator.check_config(config)
+        if fact_table is None:
+            fact_table = FactTable.from_input_files(
+                generic_facts=data.generic_facts,
+                specific_facts=data.specific_facts,
+            )
+        num_facts = len(fact_table.facts)
+        is_blank = Validator._is_blank(fact_table.facts)
+        num_specific_fact_cells = len(config.specific_fact_indexes)
+        num_generic_fact_cells = config.num_cells - num_specific_fact_cells
+
+        # Generic facts: blank lines and duplicates
+        generic_ids = fact_table.generic_fact_ids
+        blank_generic = generic_ids[is_blank[generic_ids]]
+        if len(blank_generic) > 0:
+            num_blank = int(Validator._is_blank(data.generic_facts).sum())
+            report.add(
+                "blank_generic_facts",
+                f"The generic facts contain {num_blank} blank lines. Remove "
+                "them from the generic facts file.",
+                count=num_blank,
+            )
+        if len(data.generic_facts) > len(generic_ids):
+            values, counts = np.unique(
+                np.array([str(fact) for fact in data.generic_facts]),
+                return_counts=True,
+            )
+            duplicated = values[
+                (counts > 1) & ~Validator._is_blank(values.tolist())
+            ]
+            if len(duplicated) > 0:
+                report.add(
+                    "duplicate_generic_facts",
+                    "Generic facts are listed more than once.",
+                    count=len(duplicated),
+                    examples=duplicated.tolist(),
+                    severity=Validator.WARNING,
+                )
+
+        # Generic facts that are also specific facts are left out of the
+        # sheets that hold them in a specific cell
+        num_usable_generic = (
+            len(generic_ids)
+            - len(blank_generic)
+            - min(
+                len(fact_table.shared_generic_index), num_specific_fact_cells
+            )
+        )
+        if num_usable_generic < num_generic_fact_cells:
+            report.add(
+                "not_enough_generic_facts",
+                "Number of unique non-blank generic facts that can be placed "
+                f"on every sheet ({num_usable_generic}) is less than the "
+                "required number of generic facts per bingo sheet "
+                f"({num_generic_fact_cells}).",
+            )
+
+        # Specific facts: blank facts and participants without facts
+        owner_ids = fact_table.owner_fact_ids
+        owner_of_fact = np.repeat(
+            np.arange(fact_table.num_owners), fact_table.owner_counts
+        )
+        blank_specific = is_blank[owner_ids]
+        if blank_specific.any():
+            report.add(
+                "blank_specific_facts",
+                "Participants provided blank specific facts.",
+                count=int(blank_specific.sum()),
+                examples=[
+                    fact_table.owners[owner]
+                    for owner in np.unique(owner_of_fact[blank_specific])
+                ],
+            )
+        no_facts = [
+            name for name, facts in data.specific_facts.items() if not facts
+        ]
+        if no_facts:
+            report.add(
+                "empty_specific_facts",
+                "The list of specific facts of a participant is empty. "
+                "Remove the entry or populate the list with at least one "
+                "fact.",
+                count=len(no_facts),
+                examples=no_facts,
+            )
+
+        # Facts used by several owners, or by an owner and the generic
+        # facts, could appear twice on the same sheet
+        usage = np.bincount(owner_ids, minlength=num_facts) + np.bincount(
+            generic_ids, minlength=num_facts
+        )
+        shared = np.nonzero((usage > 1) & ~is_blank)[0]
+        if len(shared) > 0:
+            report.add(
+                "shared_facts",
+                "Facts are provided by several participants or are also "
+                "generic facts. They are never placed twice on a sheet, but "
+                "fewer participants and generic facts are left for the "
+                "sheets that hold them. Reword or remove them.",
+                count=len(shared),
+                examples=fact_table.to_strings(shared),
+                severity=Validator.WARNING,
+            )
+
+        # Owners left once a participant and the owners sharing one of the
+        # participant's facts are excluded
+        names = list(
+            data.specific_facts if participants is None else participants
+        )
+        num_owners = fact_table.num_owners
+        num_excluded = max(
+            (
+                1 + len(fact_table.shared_owners.get(owner, ()))
+                for owner in (
+                    fact_table.owner_index.get(name, -1) for name in names
+                )
+                if owner >= 0
+            ),
+            default=0,
+        )
+        available = num_owners - num_excluded
+        if available < num_specific_fact_cells:
+            report.add(
+                "not_enough_owners",
+                "Number of participants that provided specific facts "
+                f"({num_owners}) is too small to fill "
+                f"{num_specific_fact_cells} specific fact cells without "
+                "using a participant's own facts.",
+            )
+
+        # Participant names are part of the file names of the sheets
+        invalid_names = [
+            name
+            for name in names
+            if not str(name).strip()
+            or os.sep in str(name)
+            or (os.altsep is not None and os.altsep in str(name))
+        ]
+        if invalid_names:
+            report.add(
+                "invalid_names",
+                "Participant names must not be blank or contain path "
+                "separators.",
+                count=len(invalid_names),
+                examples=invalid_names,
+            )
+        return report
+
+    @staticmethod
+    def verify_batch(
+        batch: "BingoSheetGenerator.Batch",
+        config: "BingoSheetGenerator.Config",
+        fact_table: FactTable,
+    ) -> Report:
+        """
+        Check every generated sheet in one pass over the fact IDs of the
+        batch: no duplicate or blank fact on a sheet, generic facts in the
+        generic cells and specific facts in the specific cells, and never a
+        participant's own facts on their sheet
+
+        Arguments:
+            batch -- Generated bingo sheets
+            config -- Bingo sheet config the batch was generated with
+            fact_table -- Interned data the batch was generated from
+
+        Returns:
+            Report with every violation
+        """
+        report = Validator.Report()
+        num_facts = len(fact_table.facts)
+        fact_ids = batch.fact_ids.astype(np.int64)
+        num_participants, num_sets, num_cells = fact_ids.shape
+
+        def sheet_names(mask: np.ndarray) -> List[str]:
+            participant_idx, set_idx = np.nonzero(mask)
+            return [
+                f"{batch.participants[p]} set {s + 1}"
+                for p, s in zip(
+                    participant_idx[: Validator.MAX_EXAMPLES],
+                    set_idx[: Validator.MAX_EXAMPLES],
+                )
+            ]
+
+        if num_cells != config.num_cells:
+            report.add(
+                "sheet_shape",
+                f"Sheets have {num_cells} cells instead of "
+                f"{config.num_cells}.",
+            )
+            return report
+        if fact_ids.size > 0 and (
+            fact_ids.min() < 0 or fact_ids.max() >= num_facts
+        ):
+            report.add("fact_ids", "Sheets refer to unknown fact IDs.")
+            return report
+
+        # Facts shared by several owners or by an owner and the generic
+        # facts (reported as a warning by check_input) must not repeat on a
+        # sheet either
+        sorted_ids = np.sort(fact_ids, axis=2)
+        duplicates = (sorted_ids[:, :, 1:] == sorted_ids[:, :, :-1]).any(
+            axis=2
+        )
+        if duplicates.any():
+            report.add(
+                "duplicate_cells",
+                "Sheets contain the same fact more than once.",
+                count=int(duplicates.sum()),
+                examples=sheet_names(duplicates),
+            )
+
+        blank = Validator._is_blank(fact_table.facts)[fact_ids].any(axis=2)
+        if blank.any():
+            report.add(
+                "blank_cells",
+                "Sheets contain blank cells.",
+                count=int(blank.sum()),
+                examples=sheet_names(blank),
+            )
+
+        specific_cells = np.array(
+            sorted(config.specific_fact_indexes), dtype=np.int64
+        )
+        generic_cells = np.setdiff1d(np.arange(num_cells), specific_cells)
+        is_generic = np.zeros(num_facts, dtype=bool)
+        is_generic[fact_table.generic_fact_ids] = True
+        is_specific = np.zeros(num_facts, dtype=bool)
+        is_specific[fact_table.owner_fact_ids] = True
+        misplaced = (~is_generic[fact_ids[:, :, generic_cells]]).any(
+            axis=2
+        ) | (~is_specific[fact_ids[:, :, specific_cells]]).any(axis=2)
+        if misplaced.any():
+            report.add(
+                "misplaced_facts",
+                "Sheets have specific facts in generic cells or generic facts "
+                "in specific cells.",
+                count=int(misplaced.sum()),
+                examples=sheet_names(misplaced),
+            )
+
+        # Own facts: look up (owner, fact) pairs of the specific cells among
+        # the sorted (owner, fact) pairs of all specific facts
+        participant_owner = np.array(
+            [
+                fact_table.owner_index.get(name, -1)
+                for name in batch.participants
+            ],
+            dtype=np.int64,
+        )
+        own_pairs = (
+            np.repeat(
+                np.arange(fact_table.num_owners), fact_table.owner_counts
+            )
+            * num_facts
+            + fact_table.owner_fact_ids
+        )
+        own_pairs.sort()
+        sheet_pairs = (
+            participant_owner[:, None, None] * num_facts
+            + fact_ids[:, :, specific_cells]
+        )
+        positions = np.minimum(
+            np.searchsorted(own_pairs, sheet_pairs), max(len(own_pairs) - 1, 0)
+        )
+        own = (
+            (participant_owner[:, None, None] >= 0)
+            & (len(own_pairs) > 0)
+            & (own_pairs[positions] == sheet_pairs)
+        ).any(axis=2)
+        if own.any():
+            report.add(
+                "own_facts",
+                "Sheets contain facts of their own participant.",
+                count=int(own.sum()),
+                examples=sheet_names(own),
+            )
+
+        if num_participants * num_sets > 0 and report.is_valid:
+            logging.info(
+                f"Verified {num_participants * num_sets} bingo sheets."
+            )
+        return report
+
+    @staticmethod
+    def _is_blank(facts: Sequence[object]) -> np.ndarray:
+        """
+        Boolean of every fact whether it is empty or only whitespace
+
+        Arguments:
+            facts -- Facts
+
+        Returns:
+            Aforementioned quantity
+        """
+        if len(facts) == 0:
+            return np.zeros(0, dtype=bool)
+        text = np.array([str(fact) for fact in facts], dtype=np.str_)
+        return np.char.str_len(np.char.strip(text)) == 0
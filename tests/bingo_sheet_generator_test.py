@@ -0,0 +1,309 @@
+import numpy as np
+import pickle
+
+from coworker_bingo import BingoSheetGenerator, FactTable
+from coworker_bingo.diversity import DiversityOptimizer
+from coworker_bingo.validation import Validator
+
+
+CONFIG = BingoSheetGenerator.Config(
+    sheet_size=3, specific_fact_indexes={0, 4, 8}, random_seed=1
+)
+DATA = BingoSheetGenerator.Data(
+    generic_facts=[f"Generic {i}" for i in range(10)],
+    specific_facts={
+        f"Person {i}": [f"Person {i} fact {j}" for j in range(i % 3 + 1)]
+        for i in range(6)
+    },
+)
+
+
+def test_generate_batch() -> None:
+    """
+    Check that generate_batch produces well formed sheets that never contain
+    a participant's own facts
+    """
+    participants = sorted(DATA.specific_facts.keys()) + ["No facts"]
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants, config=CONFIG, data=DATA, num_sets=4
+    )
+    assert batch is not None
+    assert batch.fact_ids.shape == (len(participants), 4, CONFIG.num_cells)
+
+    for participant_idx, name in enumerate(participants):
+        for set_idx in range(4):
+            sheet = batch.sheet(
+                participant_idx=participant_idx, set_idx=set_idx
+            )
+            assert sheet.sheet_size == CONFIG.sheet_size
+            cells = sheet.cells
+            assert len(set(cells)) == CONFIG.num_cells
+            assert not set(cells) & set(DATA.specific_facts.get(name, []))
+            for idx, fact in enumerate(cells):
+                assert (idx in CONFIG.specific_fact_indexes) == (
+                    fact not in DATA.generic_facts
+                )
+
+    # Same seed gives the same batch
+    again = BingoSheetGenerator.generate_batch(
+        participants=participants, config=CONFIG, data=DATA, num_sets=4
+    )
+    assert again is not None
+    assert np.array_equal(batch.fact_ids, again.fact_ids)
+
+
+def test_generate_batch_not_enough_owners() -> None:
+    """
+    Check that generate_batch fails if a participant's own facts would be
+    needed to fill the sheet
+    """
+    data = BingoSheetGenerator.Data(
+        generic_facts=DATA.generic_facts,
+        specific_facts={f"Person {i}": ["Fact"] for i in range(3)},
+    )
+    assert (
+        BingoSheetGenerator.generate_batch(
+            participants=["Person 0"], config=CONFIG, data=data, num_sets=1
+        )
+        is None
+    )
+
+
+def test_generate_batch_shared_fact() -> None:
+    """
+    Check that a fact provided by several participants never ends up on the
+    sheet of one of them, and that no fact shared by participants or also
+    generic is placed twice on a sheet, for both assignments and both ways
+    of sampling the owners (few and many owners per specific fact cell)
+    """
+    for num_owners in (6, 40):
+        specific_facts = {
+            f"Person {i}": [f"Person {i} fact {j}" for j in range(2)]
+            for i in range(num_owners)
+        }
+        for name in ("Person 1", "Person 2", "Person 4"):
+            specific_facts[name].append("Shared fact")
+        specific_facts["Person 3"].append(DATA.generic_facts[0])
+        specific_facts["Person 5"].append(DATA.generic_facts[1])
+        if num_owners > 6:
+            # Only has the shared fact, so another owner replaces it on the
+            # sheets that already hold it
+            specific_facts["Person 10"] = ["Shared fact"]
+        data = BingoSheetGenerator.Data(
+            generic_facts=DATA.generic_facts, specific_facts=specific_facts
+        )
+        fact_table = FactTable.from_input_files(
+            generic_facts=data.generic_facts,
+            specific_facts=data.specific_facts,
+        )
+        participants = sorted(specific_facts) + ["No facts"]
+        for assignment in BingoSheetGenerator.Config.SUPPORTED_ASSIGNMENTS:
+            for seed in range(6):
+                config = BingoSheetGenerator.Config(
+                    sheet_size=3,
+                    specific_fact_indexes={0, 4, 8},
+                    random_seed=seed,
+                    assignment=assignment,
+                )
+                assert Validator.check_input(config, data).is_valid
+                for num_sets in (1, 3):
+                    batch = BingoSheetGenerator.generate_batch(
+                        participants=participants,
+                        config=config,
+                        data=fact_table,
+                        num_sets=num_sets,
+                    )
+                    assert batch is not None
+                    name = "Person 2"
+                    sheet = BingoSheetGenerator.generate_sheet(
+                        participant_name=name,
+                        set_idx=num_sets - 1,
+                        config=config,
+                        data=fact_table,
+                        participants=participants,
+                    )
+                    assert sheet is not None
+                    assert (
+                        sheet.fact_ids
+                        == batch.sheet(
+                            participants.index(name), num_sets - 1
+                        ).fact_ids
+                    )
+                    assert "Shared fact" not in sheet.cells
+                    DiversityOptimizer.optimize(
+                        batch=batch, config=config, fact_table=fact_table
+                    )
+                    report = Validator.verify_batch(
+                        batch=batch, config=config, fact_table=fact_table
+                    )
+                    assert report.is_valid, report.violations
+                    sorted_ids = np.sort(batch.fact_ids, axis=2)
+                    assert not (
+                        sorted_ids[:, :, 1:] == sorted_ids[:, :, :-1]
+                    ).any()
+
+    # A shared fact placed twice on a sheet is an error
+    batch.fact_ids[0, 0, [0, 4]] = fact_table.specific_fact_ids("Person 10")[0]
+    report = Validator.verify_batch(
+        batch=batch, config=config, fact_table=fact_table
+    )
+    assert [violation.check for violation in report.violations] == [
+        "duplicate_cells"
+    ]
+
+    # Only Person 0 and 5 are left for the sheets of Person 1 to 4
+    data = BingoSheetGenerator.Data(
+        generic_facts=DATA.generic_facts,
+        specific_facts={
+            f"Person {i}": ["Shared fact"] if 1 <= i <= 4 else [f"{i}"]
+            for i in range(6)
+        },
+    )
+    assert not Validator.check_input(CONFIG, data).is_valid
+    assert (
+        BingoSheetGenerator.generate_batch(
+            participants=["Person 0", "Person 1"],
+            config=CONFIG,
+            data=data,
+            num_sets=1,
+        )
+        is None
+    )
+
+
+def test_generate_batch_balanced() -> None:
+    """
+    Check that the balanced assignment spreads the participants evenly over
+    the sheets without using a participant's own facts
+    """
+    config = BingoSheetGenerator.Config(
+        sheet_size=3,
+        specific_fact_indexes={0, 4, 8},
+        random_seed=1,
+        assignment="balanced",
+    )
+    participants = sorted(DATA.specific_facts.keys()) + ["X", "Y"]
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants, config=config, data=DATA, num_sets=5
+    )
+    assert batch is not None
+
+    stats = batch.appearance_stats()
+    assert stats.max - stats.min <= 1
+    for participant_idx, name in enumerate(participants):
+        own_facts = set(DATA.specific_facts.get(name, []))
+        for set_idx in range(5):
+            cells = batch.sheet(participant_idx, set_idx).cells
+            assert len(set(cells)) == config.num_cells
+            assert not set(cells) & own_facts
+
+
+def test_generate_sheet_out_of_order() -> None:
+    """
+    Check that every sheet only depends on the seed, the participant and the
+    set index, so single sheets and subsets match the full batch
+    """
+    participants = sorted(DATA.specific_facts.keys()) + ["X", "Y"]
+    for assignment in BingoSheetGenerator.Config.SUPPORTED_ASSIGNMENTS:
+        config = BingoSheetGenerator.Config(
+            sheet_size=3,
+            specific_fact_indexes={0, 4, 8},
+            random_seed=1,
+            assignment=assignment,
+        )
+        batch = BingoSheetGenerator.generate_batch(
+            participants=participants, config=config, data=DATA, num_sets=3
+        )
+        assert batch is not None
+        fact_table = FactTable.from_input_files(
+            generic_facts=DATA.generic_facts,
+            specific_facts=DATA.specific_facts,
+        )
+        prepared = BingoSheetGenerator.Participants.from_names(
+            names=participants, fact_table=fact_table
+        )
+        for participant_idx, name in reversed(list(enumerate(participants))):
+            for set_idx in (2, 0):
+                expected = batch.sheet(participant_idx, set_idx).fact_ids
+                sheet = BingoSheetGenerator.generate_sheet(
+                    participant_name=name,
+                    set_idx=set_idx,
+                    config=config,
+                    data=DATA,
+                    participants=participants,
+                )
+                assert sheet is not None
+                assert sheet.fact_ids == expected
+                sheet = BingoSheetGenerator.generate_sheet(
+                    participant_name=name,
+                    set_idx=set_idx,
+                    config=config,
+                    data=fact_table,
+                    participants=prepared,
+                )
+                assert sheet is not None
+                assert sheet.fact_ids == expected
+
+        # Names that are not participants of the batch
+        for names in (participants, prepared):
+            assert (
+                BingoSheetGenerator.generate_sheet(
+                    participant_name="Z",
+                    set_idx=0,
+                    config=config,
+                    data=fact_table,
+                    participants=names,
+                )
+                is None
+            )
+
+    subset = participants[::-2]
+    sub_batch = BingoSheetGenerator.generate_batch(
+        participants=subset, config=CONFIG, data=DATA, num_sets=2
+    )
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants, config=CONFIG, data=DATA, num_sets=2
+    )
+    assert sub_batch is not None and batch is not None
+    assert np.array_equal(
+        sub_batch.fact_ids,
+        batch.fact_ids[[participants.index(name) for name in subset]],
+    )
+    # Participants and sets get different draws from the same seed
+    assert len({batch.sheet(i, 0).fact_ids for i in range(4)}) == 4
+    assert batch.sheet(0, 0).fact_ids != batch.sheet(0, 1).fact_ids
+
+
+def test_sheet_to_dataframe() -> None:
+    """
+    Check that a sheet can be converted into a Pandas Dataframe
+    """
+    batch = BingoSheetGenerator.generate_batch(
+        participants=["Person 0"], config=CONFIG, data=DATA, num_sets=1
+    )
+    assert batch is not None
+    sheet = batch.sheet(participant_idx=0, set_idx=0)
+    df = sheet.to_dataframe()
+
+    assert df.shape == (CONFIG.sheet_size, CONFIG.sheet_size)
+    assert df.to_numpy().flatten().tolist() == sheet.cells
+
+
+def test_sheet_pickle() -> None:
+    """
+    Check that a sheet is pickled as it is, and that a compact copy keeps
+    its cells with only its own facts
+    """
+    batch = BingoSheetGenerator.generate_batch(
+        participants=["Person 0"], config=CONFIG, data=DATA, num_sets=1
+    )
+    assert batch is not None
+    sheet = batch.sheet(participant_idx=0, set_idx=0)
+    copy = pickle.loads(pickle.dumps(sheet))
+    assert copy == sheet
+    assert copy.cells == sheet.cells
+
+    compact = sheet.compact()
+    assert compact.cells == sheet.cells
+    assert len(compact.facts) == CONFIG.num_cells
+    assert pickle.loads(pickle.dumps(compact)) == compact
@@ -0,0 +1,82 @@
+import numpy as np
+
+from coworker_bingo import BingoSheetGenerator, FactTable
+from coworker_bingo.diversity import DiversityOptimizer
+from coworker_bingo.validation import Validator
+
+
+CONFIG = BingoSheetGenerator.Config(
+    sheet_size=4, specific_fact_indexes={0, 5, 10, 15}, random_seed=3
+)
+# "Person 0 fact 0" is both a generic fact and a specific fact, so it must
+# never be swapped onto the sheet of Person 0
+DATA = BingoSheetGenerator.Data(
+    generic_facts=[f"Generic {i}" for i in range(30)] + ["Person 0 fact 0"],
+    specific_facts={
+        f"Person {i}": [f"Person {i} fact {j}" for j in range(2)]
+        for i in range(40)
+    },
+)
+
+
+def brute_force_histogram(fact_ids: np.ndarray) -> np.ndarray:
+    """
+    Number of pairs of sheets of the same set by the number of facts they
+    share, comparing every pair
+    """
+    histogram = np.zeros(fact_ids.shape[2] + 1, dtype=np.int64)
+    for set_idx in range(fact_ids.shape[1]):
+        sheets = [set(sheet) for sheet in fact_ids[:, set_idx].tolist()]
+        for i in range(len(sheets)):
+            for j in range(i + 1, len(sheets)):
+                histogram[len(sheets[i] & sheets[j])] += 1
+    return histogram
+
+
+def test_optimize() -> None:
+    """
+    Check that the optimizer spreads the facts over the sheets without
+    breaking them, and that the overlap is counted correctly
+    """
+    fact_table = FactTable.from_input_files(
+        generic_facts=DATA.generic_facts, specific_facts=DATA.specific_facts
+    )
+    batch = BingoSheetGenerator.generate_batch(
+        participants=sorted(DATA.specific_facts),
+        config=CONFIG,
+        data=fact_table,
+        num_sets=2,
+    )
+    assert batch is not None
+    specific_cells = batch.fact_ids[:, :, sorted(CONFIG.specific_fact_indexes)]
+    specific_cells = specific_cells.copy()
+
+    before = DiversityOptimizer.overlap_stats(batch.fact_ids)
+    assert np.array_equal(
+        before.histogram, brute_force_histogram(batch.fact_ids)
+    )
+    assert before.num_pairs == 2 * 40 * 39 // 2
+
+    result = DiversityOptimizer.optimize(
+        batch=batch, config=CONFIG, fact_table=fact_table
+    )
+    assert np.array_equal(result.before.histogram, before.histogram)
+    assert np.array_equal(
+        result.after.histogram, brute_force_histogram(batch.fact_ids)
+    )
+    assert result.num_swaps > 0
+    assert result.after.max <= result.before.max
+    squares = np.arange(len(before.histogram)) ** 2
+    assert (squares * result.after.histogram).sum() < (
+        squares * result.before.histogram
+    ).sum()
+
+    # Only generic cells change, and the sheets are still valid
+    assert np.array_equal(
+        batch.fact_ids[:, :, sorted(CONFIG.specific_fact_indexes)],
+        specific_cells,
+    )
+    report = Validator.verify_batch(
+        batch=batch, config=CONFIG, fact_table=fact_table
+    )
+    assert report.is_valid
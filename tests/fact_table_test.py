@@ -0,0 +1,40 @@
+from coworker_bingo import FactTable
+
+
+def test_from_input_files() -> None:
+    """
+    Check that every unique fact is stored once and can be looked up again
+    """
+    fact_table = FactTable.from_input_files(
+        generic_facts=["Likes tea", "Likes coffee", "Likes tea"],
+        specific_facts={
+            "A": ["Can juggle", "Likes tea"],
+            "B": [],
+            "C": ["Can juggle"],
+        },
+    )
+
+    assert sorted(fact_table.facts) == [
+        "Can juggle",
+        "Likes coffee",
+        "Likes tea",
+    ]
+    assert fact_table.to_strings(fact_table.generic_fact_ids) == [
+        "Likes tea",
+        "Likes coffee",
+    ]
+    assert fact_table.owners == ["A", "C"]
+    assert fact_table.to_strings(fact_table.specific_fact_ids("A")) == [
+        "Can juggle",
+        "Likes tea",
+    ]
+    assert fact_table.to_strings(fact_table.specific_fact_ids("C")) == [
+        "Can juggle"
+    ]
+    assert len(fact_table.specific_fact_ids("B")) == 0
+    assert fact_table.owner_counts.tolist() == [2, 1]
+    # "Can juggle" is provided by both A and C
+    assert {
+        owner: others.tolist()
+        for owner, others in fact_table.shared_owners.items()
+    } == {0: [1], 1: [0]}
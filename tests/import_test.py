@@ -0,0 +1,132 @@
+import pytest
+import subprocess
+import sys
+
+from pathlib import Path
+from typing import List, Tuple
+
+# Maximum time it may take to run each statement in a fresh interpreter, as
+# a multiple of the time it takes to import NumPy in the same interpreter,
+# about 3 times the ratio on a development machine (0, 0.3 and 1). Importing
+# Pandas takes about 3 times as long as NumPy. The modules that are imported
+# are checked exactly, the time is only a generous check for slow imports
+IMPORT_TIME_BUDGETS: List[Tuple[str, float]] = [
+    ("import coworker_bingo", 1.0),
+    ("from coworker_bingo import BingoSheetGenerator", 1.0),
+    ("import coworker_bingo.scripts.generate_sheets", 3.0),
+]
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    """
+    Run Python code in a fresh interpreter and ensure it succeeds
+
+    Arguments:
+        code -- Python code to run
+        options -- Additional interpreter options
+
+    Returns:
+        The completed process
+    """
+    result = subprocess.run(
+        [sys.executable, *options, "-c", code], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def slowest_imports(importtime_output: str, count: int = 10) -> List[str]:
+    """
+    Get the slowest imports from the output of python -X importtime
+
+    Arguments:
+        importtime_output -- Standard error of python -X importtime
+        count -- Number of imports to return
+
+    Returns:
+        Lines of the slowest imports by cumulative time
+    """
+    entries = []
+    for line in importtime_output.splitlines():
+        fields = line.split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        entries.append((int(fields[1]), line))
+    entries.sort(reverse=True)
+    return [line for _, line in entries[:count]]
+
+
+@pytest.mark.parametrize("statement, budget", IMPORT_TIME_BUDGETS)
+def test_import_time(statement: str, budget: float) -> None:
+    """
+    Check that importing the package does not import Pandas, plotly or the
+    modules of the subcommands and stays within its startup time budget,
+    relative to importing NumPy
+    """
+    result = run_python(
+        f"""
+import sys
+import time
+start = time.perf_counter()
+import numpy
+print(time.perf_counter() - start)
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+for module in (
+    "pandas",
+    "plotly",
+    "df2img",
+    "http.server",
+    "coworker_bingo.diversity",
+    "coworker_bingo.pipeline",
+    "coworker_bingo.server",
+    "coworker_bingo.shard",
+    "coworker_bingo.simulation",
+):
+    assert module not in sys.modules, module
+""",
+        "-X",
+        "importtime",
+    )
+    numpy_time, elapsed = map(float, result.stdout.split())
+    assert elapsed <= budget * numpy_time, (
+        f"'{statement}' took {elapsed:.3f}s (budget {budget} times the "
+        f"{numpy_time:.3f}s to import NumPy). "
+        "Slowest imports:\n" + "\n".join(slowest_imports(result.stderr))
+    )
+
+
+def test_pdf_generation_without_pandas(tmp_path: Path) -> None:
+    """
+    Check that generating and drawing sheets with the pdf backend does not
+    import Pandas or plotly
+    """
+    run_python(
+        f"""
+import sys
+from pathlib import Path
+from coworker_bingo import BingoSheetGenerator, FactTable, SheetDrawer
+
+fact_table = FactTable.from_input_files(
+    generic_facts=[f"Generic {{i}}" for i in range(10)],
+    specific_facts={{f"Person {{i}}": [f"Fact {{i}}"] for i in range(5)}},
+)
+batch = BingoSheetGenerator.generate_batch(
+    participants=["Person 0"],
+    config=BingoSheetGenerator.Config(
+        sheet_size=3, specific_fact_indexes={{0, 4, 8}}, random_seed=1
+    ),
+    data=fact_table,
+    num_sets=1,
+)
+assert SheetDrawer.draw_table(
+    sheet=batch.sheet(participant_idx=0, set_idx=0),
+    config=SheetDrawer.Config(backend="pdf"),
+    export_path=Path({str(tmp_path / "sheet.pdf")!r}),
+    title="Title",
+)
+for module in ("pandas", "plotly", "df2img"):
+    assert module not in sys.modules, module
+"""
+    )
@@ -0,0 +1,49 @@
+from coworker_bingo import InputFilesReader
+from coworker_bingo.scripts import config as cfg
+from pathlib import Path
+
+
+def test_streaming_matches_pandas() -> None:
+    """
+    Check that both ways of reading the example specific facts give the same
+    result
+    """
+    results = [
+        InputFilesReader.read_participant_names_and_specific_facts(
+            csv_file_path=cfg.SPECIFIC_FACTS_FILE_PATH,
+            name_col=cfg.NAME_COL,
+            streaming=streaming,
+        )
+        for streaming in (False, True)
+    ]
+    assert results[0] is not None
+    assert results[0] == results[1]
+
+
+def test_streaming_checks(tmp_path: Path) -> None:
+    """
+    Check that the streaming reader skips empty rows and rejects duplicate
+    or missing names
+    """
+    csv_file_path = tmp_path / "specific_facts.csv"
+
+    csv_file_path.write_text("Name,Fact1,Fact2\nA,x,\n,,\nB,,\nC,y,z\n")
+    assert InputFilesReader.read_participant_names_and_specific_facts(
+        csv_file_path=csv_file_path, name_col="Name", streaming=True
+    ) == ({"A", "B", "C"}, {"A": ["x"], "C": ["y", "z"]})
+
+    csv_file_path.write_text("Name,Fact1\nA,x\nB,y\nA,z\n")
+    assert (
+        InputFilesReader.read_participant_names_and_specific_facts(
+            csv_file_path=csv_file_path, name_col="Name", streaming=True
+        )
+        is None
+    )
+
+    csv_file_path.write_text("Name,Fact1\nA,x\n,y\n")
+    assert (
+        InputFilesReader.read_participant_names_and_specific_facts(
+            csv_file_path=csv_file_path, name_col="Name", streaming=True
+        )
+        is None
+    )
@@ -0,0 +1,62 @@
+import json
+
+from coworker_bingo.instrumentation import Instrumentation
+from coworker_bingo.scripts.generate_sheets import main
+from pathlib import Path
+
+
+def test_stages_are_only_recorded_while_enabled() -> None:
+    """
+    Check that stage timers and snapshots end up in the report, and that
+    nothing is recorded while instrumentation is disabled
+    """
+    with Instrumentation.stage("ignored"):
+        pass
+
+    Instrumentation.start(trace_memory=True)
+    try:
+        for _ in range(3):
+            with Instrumentation.stage("work"):
+                sum(range(1000))
+        Instrumentation.snapshot("after_work")
+    finally:
+        Instrumentation.stop()
+
+    with Instrumentation.stage("ignored"):
+        pass
+
+    report = Instrumentation.report()
+    assert list(report["stages"]) == ["work"]
+    assert report["stages"]["work"]["count"] == 3
+    assert (
+        report["stages"]["work"]["max_s"]
+        <= (report["stages"]["work"]["total_s"])
+    )
+    (snapshot,) = report["snapshots"]
+    assert snapshot["label"] == "after_work"
+    assert snapshot["traced_peak_bytes"] > 0
+    assert len(snapshot["top_allocations"]) > 0
+
+
+def test_profile_flag_writes_report(tmp_path: Path) -> None:
+    """
+    Check that --profile writes a JSON report with the stages of the run
+    """
+    report_path = tmp_path / "profile.json"
+    assert (
+        main(
+            [
+                "--output-dir",
+                str(tmp_path / "output"),
+                "--backend",
+                "pdf",
+                "--profile",
+                str(report_path),
+            ]
+        )
+        == 0
+    )
+    report = json.loads(report_path.read_text())
+    for stage in ["read_specific_facts", "generate_batch", "render_pdf"]:
+        assert report["stages"][stage]["count"] > 0
+    assert not Instrumentation.is_enabled()
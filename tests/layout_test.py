@@ -0,0 +1,73 @@
+import time
+
+from coworker_bingo import BingoSheetGenerator, SpecificLayout
+
+
+def test_search() -> None:
+    """
+    Check that the specific cells are spread evenly over the lines of
+    sheets of every size, and that large sheets are solved quickly
+    """
+    for sheet_size in range(1, 8):
+        for count in range(sheet_size * sheet_size + 1):
+            indexes = SpecificLayout.search(sheet_size, count)
+            assert indexes is not None
+            assert len(indexes) == count
+            assert all(0 <= idx < sheet_size * sheet_size for idx in indexes)
+            lines = SpecificLayout.line_counts(sheet_size, indexes)
+            if (sheet_size, count) != (2, 2):
+                assert max(lines) - min(lines) <= 1
+
+    # Every line of a perfect layout holds the same number of cells
+    start = time.perf_counter()
+    for sheet_size, count in [(8, 32), (10, 40), (10, 50)]:
+        indexes = SpecificLayout.search(sheet_size, count)
+        assert indexes is not None
+        assert SpecificLayout.cost(sheet_size, indexes) == 0
+        config = BingoSheetGenerator.Config(
+            sheet_size=sheet_size,
+            specific_fact_indexes=indexes,
+            random_seed=1,
+        )
+        assert config.num_cells == sheet_size * sheet_size
+    assert time.perf_counter() - start < 1
+
+    assert SpecificLayout.search(4, 17) is None
+    assert SpecificLayout.search(4, -1) is None
+
+
+def test_search_time() -> None:
+    """
+    Check that the search stays fast for every count of a 12x12 sheet
+    (more than half of the cells are searched as the complement), and that
+    these are placed as evenly as the complement
+    """
+    for count in range(144 // 2 + 1):
+        start = time.perf_counter()
+        indexes = SpecificLayout.search(12, count)
+        elapsed = time.perf_counter() - start
+        assert indexes is not None
+        assert len(indexes) == count
+        assert elapsed < 0.5, (count, elapsed)
+
+    for count in (25, 36, 60, 72, 107):
+        indexes = SpecificLayout.search(12, count)
+        complement = SpecificLayout.search(12, 144 - count)
+        assert indexes is not None and complement is not None
+        assert SpecificLayout.cost(12, indexes) == SpecificLayout.cost(
+            12, complement
+        )
+    for count in (36, 60, 72):
+        assert SpecificLayout.cost(12, SpecificLayout.search(12, count)) == 0
+
+
+def test_cost() -> None:
+    """
+    Check the scoring of a layout on the lines of the sheet
+    """
+    diagonal = {0, 4, 8}
+    assert SpecificLayout.line_counts(3, diagonal) == [1] * 6 + [3, 1]
+    assert SpecificLayout.cost(3, diagonal) == (9 - 3) ** 2
+    # No permutation of 3 cells has one cell on both diagonals, the best
+    # layout leaves one of them empty
+    assert SpecificLayout.cost(3, SpecificLayout.search(3, 3)) == 9
@@ -0,0 +1,44 @@
+from coworker_bingo import Sheet, SheetDrawer
+from coworker_bingo.pipeline import SheetPipeline
+from pathlib import Path
+
+
+def test_pipeline_writes_every_sheet(tmp_path: Path) -> None:
+    """
+    Check that the pipeline writes every sheet, even with queues that are
+    much shorter than the number of sheets, and reports failed sheets
+    """
+    drawer_config = SheetDrawer.Config(fig_size=(300, 400), backend="pdf")
+    jobs = [
+        SheetDrawer.Job(
+            sheet=Sheet.from_cells([f"Fact {i}", "a", "b", "c"], 2),
+            export_path=tmp_path / f"sheet_{i}.pdf",
+            title=f"Sheet {i}",
+        )
+        for i in range(20)
+    ]
+    jobs.append(
+        SheetDrawer.Job(
+            sheet=jobs[0].sheet,
+            export_path=tmp_path / "sheet.png",
+            title="Unsupported extension",
+        )
+    )
+    stats = SheetPipeline.Stats()
+
+    results = list(
+        SheetPipeline.run(
+            jobs=jobs,
+            drawer_config=drawer_config,
+            config=SheetPipeline.Config(write_workers=2, queue_depth=2),
+            stats=stats,
+        )
+    )
+
+    assert len(results) == len(jobs)
+    failed = [result for result in results if not result.success]
+    assert [result.export_path.name for result in failed] == ["sheet.png"]
+    assert stats.generated == len(jobs)
+    assert stats.written == len(jobs) - 1
+    for job in jobs[:-1]:
+        assert job.export_path.read_bytes().startswith(b"%PDF-")
@@ -0,0 +1,100 @@
+import pytest
+
+from pathlib import Path
+
+from coworker_bingo.render_cache import RenderCache
+
+
+def test_render_cache_reuses_unchanged_files(tmp_path: Path) -> None:
+    """
+    Test that files are only reported fresh when their sheet hash and the
+    file itself are unchanged since the previous run
+    """
+    input_file = tmp_path / "facts.txt"
+    input_file.write_text("Likes cats\n")
+    input_hash = RenderCache.hash_files([input_file])
+    config_hash = RenderCache.hash_config({"sheet_size": 5}, "pdf")
+
+    cache = RenderCache(tmp_path, input_hash, config_hash, seed=1)
+    assert not cache.is_unchanged()
+    kept = tmp_path / "kept.pdf"
+    changed = tmp_path / "changed.pdf"
+    for path in [kept, changed]:
+        path.write_bytes(b"%PDF")
+        cache.update(path, RenderCache.hash_sheet([path.name], "Title", ""))
+    cache.save()
+
+    cache = RenderCache(tmp_path, input_hash, config_hash, seed=1)
+    assert cache.is_unchanged()
+    assert cache.is_fresh(
+        kept, RenderCache.hash_sheet([kept.name], "Title", "")
+    )
+    assert not cache.is_fresh(
+        changed, RenderCache.hash_sheet([changed.name], "New title", "")
+    )
+
+    changed.unlink()
+    assert not cache.is_unchanged()
+    cache = RenderCache(tmp_path, input_hash, config_hash, seed=2)
+    assert not cache.is_unchanged()
+    input_file.write_text("Likes dogs\n")
+    assert RenderCache.hash_files([input_file]) != input_hash
+
+
+def test_render_cache_renderer_version(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test that the config hashes change with the version of the renderer, so
+    files drawn by an older renderer are not reused
+    """
+    config_hash = RenderCache.hash_config({"sheet_size": 5}, "pdf")
+    assert RenderCache.hash_config({"sheet_size": 5}, "pdf") == config_hash
+    assert RenderCache.renderer_version().startswith(
+        f"{RenderCache.RENDERER_VERSION}/"
+    )
+
+    monkeypatch.setattr(
+        RenderCache, "RENDERER_VERSION", RenderCache.RENDERER_VERSION + 1
+    )
+    RenderCache.renderer_version.cache_clear()
+    try:
+        assert RenderCache.hash_config({"sheet_size": 5}, "pdf") != (
+            config_hash
+        )
+    finally:
+        monkeypatch.undo()
+        RenderCache.renderer_version.cache_clear()
+
+
+def test_render_cache_removes_stale_files(tmp_path: Path) -> None:
+    """
+    Test that files of the previous run that are not part of the next run
+    are deleted, and that no other files are touched
+    """
+    config_hash = RenderCache.hash_config("Name", ["Alice", "Bob"])
+    assert RenderCache.hash_config("Name", ["Alice"]) != config_hash
+    assert RenderCache.hash_config("Email", ["Alice", "Bob"]) != config_hash
+
+    cache = RenderCache(tmp_path, "", config_hash, seed=1)
+    alice = tmp_path / "alice.pdf"
+    bob = tmp_path / "bob.pdf"
+    other = tmp_path / "notes.txt"
+    for path in [alice, bob, other]:
+        path.write_bytes(b"%PDF")
+    for path in [alice, bob]:
+        cache.update(path, RenderCache.hash_sheet([path.name], "Title", ""))
+    cache.save()
+
+    cache = RenderCache(
+        tmp_path, "", RenderCache.hash_config("Name", ["Alice"]), seed=1
+    )
+    assert not cache.is_unchanged()
+    assert cache.is_fresh(
+        alice, RenderCache.hash_sheet([alice.name], "Title", "")
+    )
+    assert cache.remove_stale() == 1
+    cache.save()
+    assert alice.is_file() and other.is_file()
+    assert not bob.exists()
+    assert cache.remove_stale() == 0
@@ -0,0 +1,138 @@
+import pytest
+
+from pathlib import Path
+
+from coworker_bingo import SpecificLayout
+from coworker_bingo.scripts import config as cfg
+from coworker_bingo.scripts.generate_sheets import (
+    load_run_config,
+    main,
+    parse_args,
+)
+from coworker_bingo.scripts.run_config import RunConfig
+
+
+CONFIG_FILE = """
+number_puzzle_sets = 2
+output_data_path = "sheets"
+
+[sheet]
+sheet_size = 5
+random_seed = 7
+
+[drawer]
+backend = "pdf"
+fig_size = [600, 650]
+"""
+
+
+def test_config_file_and_flags(tmp_path: Path) -> None:
+    """
+    Check that the config file replaces the defaults of scripts/config.py
+    and that command line flags replace both
+    """
+    config_path = tmp_path / "event.toml"
+    config_path.write_text(CONFIG_FILE)
+
+    run = load_run_config(
+        parse_args(["--config", str(config_path), "--seed", "3"])
+    )
+
+    assert run is not None
+    assert run.number_puzzle_sets == 2
+    assert run.output_data_path == tmp_path / "sheets"
+    assert run.bingo_sheet_config.sheet_size == 5
+    assert run.bingo_sheet_config.random_seed == 3
+    assert run.bingo_sheet_config.specific_fact_indexes == (
+        RunConfig.checkerboard_indexes(5)
+    )
+    assert run.sheet_drawer_config.fig_size == (600, 650)
+    assert run.sheet_drawer_config.cell_font == (
+        cfg.SHEET_DRAWER_CONFIG.cell_font
+    )
+    assert run.is_valid()
+
+    run = load_run_config(parse_args(["--workers", "3", "--no-pipeline"]))
+    assert run is not None
+    assert run.number_workers == 3
+    assert not run.use_pipeline
+
+    run = load_run_config(
+        parse_args(["--sheet-size", "8", "--specific-count", "32"])
+    )
+    assert run is not None
+    assert run.bingo_sheet_config.specific_fact_indexes == (
+        SpecificLayout.search(8, 32)
+    )
+    config_path.write_text(
+        "[sheet]\nsheet_size = 5\nspecific_fact_count = 9\n"
+    )
+    run = load_run_config(parse_args(["--config", str(config_path)]))
+    assert run is not None
+    assert len(run.bingo_sheet_config.specific_fact_indexes) == 9
+    assert load_run_config(parse_args(["--specific-count", "37"])) is None
+
+    config_path.write_text("unknown_setting = 1\n[sheet]\nsheet_size = 4\n")
+    assert load_run_config(parse_args(["--config", str(config_path)])) is None
+
+
+def test_config_file_types(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """
+    Check that config file values of the wrong type are rejected instead of
+    failing later in the run
+    """
+    config_path = tmp_path / "event.toml"
+    for text in (
+        'number_puzzle_sets = "2"',
+        'number_workers = "3"',
+        "use_cache = 1",
+        "auto_fit_layout = true\nqueue_depth = true",
+        "output_data_path = 5",
+        '[sheet]\nsheet_size = "5"',
+        "[sheet]\nspecific_fact_indexes = [0, 1.5]",
+        '[sheet]\nspecific_fact_count = "9"',
+        "[drawer]\nfig_size = [600]",
+        '[drawer]\ncell_font_size = "13"',
+    ):
+        config_path.write_text(text + "\n")
+        caplog.clear()
+        run = load_run_config(parse_args(["--config", str(config_path)]))
+        assert run is None, text
+        assert "Invalid settings" in caplog.text, text
+
+    config_path.write_text(
+        'output_data_path = "sheets"\nuse_cache = false\n'
+        "[sheet]\nspecific_fact_indexes = [0, 4, 8]\n"
+        '[drawer]\nfig_size = [600, 650]\ncell_font = "Arial"\n'
+    )
+    run = load_run_config(parse_args(["--config", str(config_path)]))
+    assert run is not None
+    assert run.bingo_sheet_config.specific_fact_indexes == {0, 4, 8}
+
+
+def test_generate_into_output_dir(tmp_path: Path) -> None:
+    """
+    Check that a run configured only through flags writes its sheets to its
+    own output folder
+    """
+    output_dir = tmp_path / "output"
+    assert (
+        main(
+            [
+                "--output-dir",
+                str(output_dir),
+                "--sheet-size",
+                "4",
+                "--backend",
+                "pdf",
+                "--sets",
+                "2",
+            ]
+        )
+        == 0
+    )
+    sheets = sorted(output_dir.glob("bingo_sheet_*_4x4_*.pdf"))
+    assert len(sheets) > 0
+    assert len(sheets) % 2 == 0
@@ -0,0 +1,57 @@
+from coworker_bingo import BingoSheetGenerator, Scoreboard
+
+
+CONFIG = BingoSheetGenerator.Config(
+    sheet_size=3, specific_fact_indexes={0, 4, 8}, random_seed=1
+)
+
+
+def test_line_masks() -> None:
+    """
+    Check the cells of the rows, columns and diagonals of a 3x3 sheet
+    """
+    cells = [
+        [cell for cell in range(9) if mask >> cell & 1]
+        for mask in Scoreboard.line_masks(3)
+    ]
+    assert cells == [
+        [0, 1, 2],
+        [3, 4, 5],
+        [6, 7, 8],
+        [0, 3, 6],
+        [1, 4, 7],
+        [2, 5, 8],
+        [0, 4, 8],
+        [2, 4, 6],
+    ]
+
+
+def test_scoreboard() -> None:
+    """
+    Check that marks update the scores and the leaderboard incrementally
+    """
+    scoreboard = Scoreboard(CONFIG)
+    for player in ["a", "b", "c"]:
+        scoreboard.add_player(player)
+
+    assert [scoreboard.mark("a", cell) for cell in [0, 1, 2]] == [0, 0, 1]
+    assert scoreboard.mark("a", 2) == 1
+    assert [scoreboard.mark("b", cell) for cell in [4, 0, 8]] == [0, 0, 1]
+    # Cell 4 completes the middle row, the middle column and a diagonal,
+    # but not the other diagonal
+    for cell in [3, 5, 1, 7, 2, 6]:
+        scoreboard.mark("c", cell)
+    assert scoreboard.mark("c", 4) == 3
+    assert scoreboard.leaderboard(top=2) == [("c", 3), ("a", 1)]
+    assert list(scoreboard.ranking())[-1] == ("b", 1)
+
+    assert scoreboard.unmark("c", 4) == 0
+    assert scoreboard.unmark("c", 4) == 0
+    assert scoreboard.leaderboard() == [("a", 1), ("b", 1), ("c", 0)]
+    assert scoreboard.completed_lines("b") == [Scoreboard.line_masks(3)[6]]
+
+    scoreboard.add_player("c", marks=scoreboard.marks("c") | 1 << 4)
+    assert scoreboard.score("c") == 3
+    assert scoreboard.num_players == 3
+    assert scoreboard.mark("d", 0) is None
+    assert scoreboard.mark("a", 9) is None
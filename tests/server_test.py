@@ -0,0 +1,92 @@
+import threading
+import urllib.error
+import urllib.request
+
+from coworker_bingo.scripts.generate_sheets import (
+    create_server,
+    main,
+    parse_serve_args,
+)
+from coworker_bingo.server import SheetServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+FLAGS = ["--backend", "pdf", "--sets", "2", "--sheet-size", "4"]
+
+
+def fetch(
+    url: str, headers: Optional[Dict[str, str]] = None
+) -> Tuple[int, str, bytes]:
+    """
+    Send a GET request
+
+    Arguments:
+        url -- URL to request
+        headers -- Request headers
+
+    Returns:
+        Status code, ETag and body of the response
+    """
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return (response.status, response.headers["ETag"], response.read())
+    except urllib.error.HTTPError as e:
+        return (e.code, e.headers["ETag"], e.read())
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """
+    Check that the cache stays within its size, evicting the sheets that
+    were used the longest time ago
+    """
+    cache = SheetServer.Cache(max_bytes=10)
+    cache.put("a", '"1"', b"1234")
+    cache.put("b", '"2"', b"1234")
+    assert cache.get("a") == ('"1"', b"1234")
+    cache.put("c", '"3"', b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("d", '"4"', b"12345678901")
+    assert cache.get("d") is None
+    assert len(cache) == 2 and cache.num_bytes == 8
+
+
+def test_serve_sheets(tmp_path: Path) -> None:
+    """
+    Check that served sheets are identical to the files of a generation run,
+    that unchanged sheets are answered with 304 and that concurrent requests
+    for the same sheet draw it only once
+    """
+    assert main(FLAGS + ["--output-dir", str(tmp_path)]) == 0
+    server = create_server(parse_serve_args(FLAGS + ["--port", "0"]))
+    assert server is not None
+
+    with server:
+        participant = server.participants[1]
+        url = f"{server.url}/sheets/{quote(participant)}/2"
+        results = []
+
+        def request() -> None:
+            results.append(fetch(url))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = (
+            tmp_path / f"bingo_sheet_{participant}_4x4_2.pdf"
+        ).read_bytes()
+        assert [status for status, _, _ in results] == [200] * 8
+        assert all(body == expected for _, _, body in results)
+        assert server.stats.renders == 1
+        assert server.stats.hits + server.stats.coalesced == 7
+
+        etag = results[0][1]
+        assert fetch(url, {"If-None-Match": etag})[0] == 304
+        assert server.stats.not_modified == 1
+        assert fetch(f"{server.url}/sheets/{quote(participant)}/3")[0] == 404
+        assert fetch(f"{server.url}/sheets/Nobody/1")[0] == 404
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from coworker_bingo.scripts.generate_sheets import main
+from coworker_bingo.shard import Shard
+from pathlib import Path
+
+FLAGS = ["--backend", "pdf", "--sets", "2", "--sheet-size", "4"]
+
+
+def test_shard_parse() -> None:
+    """
+    Check that shards are parsed from K/N and split the participants
+    """
+    shard = Shard.parse("2/3")
+    assert shard == Shard(index=2, count=3)
+    assert list(shard.participant_indexes(8)) == [1, 4, 7]
+    for text in ["0/3", "4/3", "2", "a/b"]:
+        assert Shard.parse(text) is None
+
+
+def test_sharded_run_matches_full_run(tmp_path: Path) -> None:
+    """
+    Check that shards run as separate processes and merged give the same
+    files and documents as a single run, and that merge refuses incomplete
+    shards
+    """
+    for mode in ["files", "document"]:
+        flags = FLAGS + ["--output-mode", mode, "--sheets-per-document", "7"]
+        full_dir = tmp_path / f"full_{mode}"
+        shard_dir = tmp_path / f"sharded_{mode}"
+        assert main(flags + ["--output-dir", str(full_dir)]) == 0
+
+        processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "coworker_bingo.scripts.generate_sheets",
+                ]
+                + flags
+                + ["--output-dir", str(shard_dir), "--shard", f"{k}/3"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            for k in range(1, 4)
+        ]
+        assert all(process.wait() == 0 for process in processes)
+        assert main(["merge", "--output-dir", str(shard_dir)]) == 0
+
+        full_files = sorted(full_dir.glob("bingo_sheet*.pdf"))
+        assert len(full_files) > 0
+        for path in full_files:
+            assert (shard_dir / path.name).read_bytes() == path.read_bytes()
+
+    shards = Shard.find_folders(shard_dir)
+    assert len(shards) == 3
+    assert main(["merge", str(shards[0]), str(shards[2])]) == 1
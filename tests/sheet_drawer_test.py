@@ -0,0 +1,214 @@
+import dataclasses
+import pandas as pd
+import pytest
+
+from coworker_bingo import SheetDrawer
+from coworker_bingo.pdf_renderer import PdfRenderer, PdfSheetTemplate
+from pathlib import Path
+
+
+SHEET = pd.DataFrame(
+    data=[["Fact (a)", "Fact b"], ["A fact that needs to be wrapped", "d"]],
+    columns=["0", "1"],
+)
+
+
+def test_pdf_backend(tmp_path: Path) -> None:
+    """
+    Check that the pdf backend writes a PDF file with the facts of the sheet
+    """
+    config = SheetDrawer.Config(fig_size=(300, 400), backend="pdf")
+    export_path = tmp_path / "sheet.pdf"
+
+    assert SheetDrawer.draw_table(
+        sheet=SHEET, config=config, export_path=export_path, title="Title"
+    )
+
+    content = export_path.read_bytes()
+    assert content.startswith(b"%PDF-")
+    assert content.rstrip().endswith(b"%%EOF")
+    assert b"/BaseFont /Times-Roman" in content
+
+
+def test_pdf_backend_unsupported_extension(tmp_path: Path) -> None:
+    """
+    Check that the pdf backend refuses to write image files
+    """
+    config = SheetDrawer.Config(backend="pdf")
+    export_path = tmp_path / "sheet.png"
+
+    assert not SheetDrawer.draw_table(
+        sheet=SHEET, config=config, export_path=export_path, title="Title"
+    )
+    assert not export_path.exists()
+
+
+def test_draw_document(tmp_path: Path) -> None:
+    """
+    Check that draw_document splits the sheets into documents of at most
+    sheets_per_document pages plus an index page
+    """
+    config = SheetDrawer.Config(fig_size=(300, 400), backend="pdf")
+    jobs = [
+        SheetDrawer.Job(
+            sheet=SHEET,
+            export_path=tmp_path / "unused.pdf",
+            title=f"Sheet {i}",
+            bookmark=f"Person {i % 3}",
+        )
+        for i in range(5)
+    ]
+
+    results = list(
+        SheetDrawer.draw_document(
+            jobs=jobs,
+            config=config,
+            export_path=tmp_path / "sheets.pdf",
+            sheets_per_document=3,
+        )
+    )
+
+    assert len(results) == len(jobs)
+    assert all(result.success for result in results)
+    documents = sorted(tmp_path.iterdir())
+    assert [d.name for d in documents] == ["sheets_001.pdf", "sheets_002.pdf"]
+    for document, num_sheets in zip(documents, [3, 2]):
+        content = document.read_bytes()
+        assert content.count(b"/Type /Page ") == num_sheets + 1
+        assert content.count(b"/Subtype /Form") == 1
+        assert b"/Type /Outlines" in content
+
+
+def test_draw_document_unsupported_extension(tmp_path: Path) -> None:
+    """
+    Check that every page fails when the document is not a PDF
+    """
+    config = SheetDrawer.Config(fig_size=(300, 400), backend="pdf")
+    jobs = [
+        SheetDrawer.Job(
+            sheet=SHEET, export_path=tmp_path / "unused.pdf", title="Sheet"
+        )
+        for _ in range(3)
+    ]
+
+    results = list(
+        SheetDrawer.draw_document(
+            jobs=jobs,
+            config=config,
+            export_path=tmp_path / "sheets.png",
+            sheets_per_document=0,
+        )
+    )
+
+    assert len(results) == len(jobs)
+    assert not any(result.success for result in results)
+    assert results[0].error is not None and ".pdf" in results[0].error
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pdf_template_matches_renderer() -> None:
+    """
+    Check that stamping the facts into a template gives the same document as
+    rendering the sheet from scratch, also when the cached facts are reused
+    """
+    config = SheetDrawer.Config(fig_size=(300, 400), backend="pdf")
+    header = list(SHEET.columns)
+    template = PdfSheetTemplate.get(config=config, header=header)
+    for rows in [SHEET.values.tolist(), SHEET.values.tolist()[::-1]]:
+        for title in ["Title", "Other (title)"]:
+            assert template.render(rows=rows, title=title) == (
+                PdfRenderer.render(
+                    header=header, rows=rows, config=config, title=title
+                )
+            )
+    assert PdfSheetTemplate.get(config=config, header=header) is template
+
+
+def test_fit_config() -> None:
+    """
+    Check that fit_config grows the cells to fit long facts, shrinks the
+    font when the cells would not fit onto the page, and only fits the pdf
+    backend
+    """
+    config = SheetDrawer.Config(
+        cell_font_size=14, cell_height=40, fig_size=(300, 400), backend="pdf"
+    )
+    short_facts = ["a", "b"]
+    assert SheetDrawer.fit_config(config, short_facts, sheet_size=2) == config
+
+    long_fact = "A fact with many words that needs several lines " * 2
+    fitted = SheetDrawer.fit_config(config, [long_fact], sheet_size=2)
+    _, row_heights = PdfRenderer.layout(
+        rows=[[long_fact] * 2] * 2, num_cols=2, config=fitted
+    )
+    assert fitted.cell_font_size == 14
+    assert fitted.cell_height > config.cell_height
+    assert row_heights == [fitted.cell_height] * 2
+
+    fitted = SheetDrawer.fit_config(config, [long_fact * 4], sheet_size=2)
+    assert fitted.cell_font_size < 14
+    assert fitted.fig_size == config.fig_size
+
+    # The facts are measured for the pdf backend only
+    config = dataclasses.replace(config, backend="df2img")
+    assert SheetDrawer.fit_config(config, [long_fact], sheet_size=2) == config
+
+
+def test_session(tmp_path: Path) -> None:
+    """
+    Check that a session draws the same files as draw_table for every
+    backend while reusing its figure, and refuses to draw once closed
+    """
+    sheets = [SHEET, SHEET.iloc[::-1], SHEET.rename(columns={"1": "2"})]
+    for backend, extension in [("pdf", ".pdf"), ("df2img", ".png")]:
+        config = SheetDrawer.Config(fig_size=(300, 400), backend=backend)
+        with SheetDrawer.Session(config) as session:
+            for i, sheet in enumerate(sheets):
+                path = tmp_path / f"{backend}_{i}{extension}"
+                assert session.draw(sheet=sheet, title=f"Sheet {i}", path=path)
+                assert SheetDrawer.draw_table(
+                    sheet=sheet,
+                    config=config,
+                    export_path=tmp_path / f"single{extension}",
+                    title=f"Sheet {i}",
+                )
+                single = (tmp_path / f"single{extension}").read_bytes()
+                assert path.read_bytes() == single
+            assert not session.draw(
+                sheet=SHEET, title="Title", path=tmp_path / "sheet.txt"
+            )
+
+        with pytest.raises(ValueError):
+            session.draw(sheet=SHEET, title="Title", path=path)
+
+
+def test_pdf_backend_unsupported_characters(tmp_path: Path) -> None:
+    """
+    Check that the pdf backend fails sheets with characters it cannot draw
+    instead of replacing them
+    """
+    config = SheetDrawer.Config(fig_size=(300, 400), backend="pdf")
+    sheets = [
+        SHEET,
+        SHEET.replace("d", "Likes café"),
+        SHEET.replace("d", "猫"),
+    ]
+    jobs = [
+        SheetDrawer.Job(
+            sheet=sheet, export_path=tmp_path / f"{i}.pdf", title=f"Sheet {i}"
+        )
+        for i, sheet in enumerate(sheets)
+    ]
+
+    results = list(SheetDrawer.draw_many(jobs=jobs, config=config, workers=1))
+
+    assert [result.success for result in results] == [True, True, False]
+    assert "'猫'" in str(results[2].error)
+    assert not (tmp_path / "2.pdf").exists()
+    with pytest.raises(ValueError):
+        SheetDrawer.draw_table(
+            sheet=sheets[2],
+            config=config,
+            export_path=tmp_path / "2.pdf",
+            title="Sheet",
+        )
@@ -0,0 +1,74 @@
+import numpy as np
+
+from coworker_bingo import BingoSheetGenerator, FactTable
+from coworker_bingo.simulation import GameSimulator
+
+
+CONFIG = BingoSheetGenerator.Config(
+    sheet_size=3, specific_fact_indexes={0, 4, 8}, random_seed=1
+)
+DATA = BingoSheetGenerator.Data(
+    generic_facts=[f"Generic {i}" for i in range(10)],
+    specific_facts={
+        f"Person {i}": [f"Person {i} fact {j}" for j in range(2)]
+        for i in range(6)
+    },
+)
+
+
+def test_conversations_table() -> None:
+    """
+    Check that the number of conversations until a cell is marked is
+    geometrically distributed
+    """
+    assert (GameSimulator._conversations_table(1.0) == 1).all()
+    assert (GameSimulator._conversations_table(0.0) == 255).all()
+    table = GameSimulator._conversations_table(0.25)
+    assert table.min() == 1
+    assert abs(table.astype(float).mean() - 4) < 0.05
+    assert abs((table == 1).mean() - 0.25) < 0.001
+
+
+def test_simulate() -> None:
+    """
+    Check the outcome of games that are decided in advance, and that the
+    simulation is reproducible
+    """
+    fact_table = FactTable.from_input_files(
+        generic_facts=DATA.generic_facts, specific_facts=DATA.specific_facts
+    )
+    batch = BingoSheetGenerator.generate_batch(
+        participants=sorted(DATA.specific_facts),
+        config=CONFIG,
+        data=fact_table,
+        num_sets=2,
+    )
+    assert batch is not None
+
+    # Every fact is found in the first conversation
+    certain = GameSimulator.Config(
+        num_games=50, generic_match=1, specific_match=1, absent_fraction=0
+    )
+    result = GameSimulator.simulate(batch, CONFIG, certain)
+    assert result.num_games == 50
+    assert (result.first_line_minutes == certain.conversation_minutes).all()
+    assert (result.winners == 6).all()
+    assert result.lines_histogram.tolist() == [0] * 8 + [50 * 6]
+    assert result.player_first_line_histogram[2] == 50 * 6
+
+    # Every line has a specific fact cell, and all specific facts are absent
+    absent = GameSimulator.Config(num_games=50, absent_fraction=1)
+    result = GameSimulator.simulate(batch, CONFIG, absent)
+    assert np.isinf(result.first_line_minutes).all()
+    assert result.no_winner_fraction == 1
+    assert result.lines_histogram[0] == 50 * 6
+
+    default = GameSimulator.Config(num_games=200)
+    result = GameSimulator.simulate_data(CONFIG, DATA, default)
+    assert result is not None
+    assert result.lines_histogram.sum() == 200 * 6
+    assert result.player_first_line_histogram.sum() == 200 * 6
+    again = GameSimulator.simulate_data(CONFIG, fact_table, default)
+    assert again is not None
+    assert np.array_equal(result.winners, again.winners)
+    assert len(result.summary()) == 4
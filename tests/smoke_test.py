@@ -54,7 +54,7 @@ def test_generate_sheets_script() -> None:
     clear_output_folder(folder=output_folder)
 
     # Call main generate sheet function
-    assert main() == 0
+    assert main([]) == 0
 
     # Load participant names
     specific_facts_read_result = (
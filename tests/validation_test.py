@@ -0,0 +1,76 @@
+from coworker_bingo import BingoSheetGenerator, FactTable
+from coworker_bingo.validation import Validator
+
+
+CONFIG = BingoSheetGenerator.Config(
+    sheet_size=3, specific_fact_indexes={0, 4, 8}, random_seed=1
+)
+DATA = BingoSheetGenerator.Data(
+    generic_facts=[f"Generic {i}" for i in range(10)],
+    specific_facts={
+        f"Person {i}": [f"Person {i} fact {j}" for j in range(2)]
+        for i in range(6)
+    },
+)
+
+
+def test_check_input_reports_all_violations() -> None:
+    """
+    Check that every violation of the input is reported at once, and that
+    warnings do not fail the validation
+    """
+    assert Validator.check_input(CONFIG, DATA).violations == []
+
+    config = BingoSheetGenerator.Config(
+        sheet_size=3, specific_fact_indexes={-1, 4, 9}, random_seed=1
+    )
+    data = BingoSheetGenerator.Data(
+        generic_facts=["Generic 0", "", "Generic 0", "Person 1 fact 0"],
+        specific_facts={"Person 0": ["Person 1 fact 0", " "], "Person 1": []},
+    )
+    report = Validator.check_input(config, data)
+    assert not report.is_valid
+    assert {violation.check for violation in report.violations} == {
+        "specific_fact_indexes",
+        "blank_generic_facts",
+        "duplicate_generic_facts",
+        "not_enough_generic_facts",
+        "blank_specific_facts",
+        "empty_specific_facts",
+        "shared_facts",
+        "not_enough_owners",
+    }
+
+    shared = BingoSheetGenerator.Data(
+        generic_facts=DATA.generic_facts + ["Person 0 fact 0"],
+        specific_facts=DATA.specific_facts,
+    )
+    report = Validator.check_input(CONFIG, shared)
+    assert report.is_valid
+    assert [violation.severity for violation in report.violations] == [
+        Validator.WARNING
+    ]
+
+
+def test_verify_batch() -> None:
+    """
+    Check that the verifier accepts generated sheets and finds broken ones
+    """
+    fact_table = FactTable.from_input_files(
+        generic_facts=DATA.generic_facts, specific_facts=DATA.specific_facts
+    )
+    participants = sorted(DATA.specific_facts) + ["No facts"]
+    batch = BingoSheetGenerator.generate_batch(
+        participants=participants, config=CONFIG, data=fact_table, num_sets=3
+    )
+    assert batch is not None
+    assert Validator.verify_batch(batch, CONFIG, fact_table).violations == []
+
+    own_fact = fact_table.specific_fact_ids("Person 2")[0]
+    batch.fact_ids[2, 1, 0] = own_fact
+    batch.fact_ids[3, 0, 1] = batch.fact_ids[3, 0, 2]
+    report = Validator.verify_batch(batch, CONFIG, fact_table)
+    checks = {violation.check: violation for violation in report.violations}
+    assert set(checks) == {"own_facts", "duplicate_cells"}
+    assert checks["own_facts"].examples == [repr("Person 2 set 2")]
+    assert checks["duplicate_cells"].count == 1